@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark for fix_json_files.py on synthetically corrupted files.
+
+Usage:
+    python bench_json_repair.py [--sizes 1 2 4] [--seed 0] [--baseline-timeout 30] [--skip-baseline]
+
+For each size (in MB) a niconico_l.json-like document is generated and corrupted
+with the kinds of damage seen in docs/*.json (missing commas, duplicated keys,
+duplicated metadata runs, stray brackets and a truncated tail). It is then
+repaired with:
+
+    - baseline:   the previous regex passes of fix_json_file()
+    - structural: fix_json_files.repair_json_text()
+
+and the time, whether the output is valid JSON, and whether every undamaged item
+survived are printed. The baseline runs in a child process and is stopped after
+--baseline-timeout seconds, since its DOTALL pass backtracks catastrophically
+once a file contains duplicated fields.
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import re
+import time
+
+from fix_json_files import repair_json_text
+
+
+def baseline_fix(content):
+    """The regex passes of the previous fix_json_file() (for comparison)"""
+    content = re.sub(
+        r'(".*?")\n(\s+".*?":)',
+        r'\1,\n\2',
+        content,
+        flags=re.MULTILINE
+    )
+
+    lines = content.split('\n')
+    new_lines = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        new_lines.append(line)
+        if '        "' in line and line.strip().endswith('",'):
+            current_entry = line.strip()
+            j = i + 1
+            array_lines = [current_entry]
+            while j < len(lines) and '        "' in lines[j] and lines[j].strip().endswith(('",', '"')):
+                array_lines.append(lines[j].strip())
+                j += 1
+            k = j
+            duplicate_lines = []
+            while k < len(lines) and len(duplicate_lines) < len(array_lines) and '        "' in lines[k] and lines[k].strip() in array_lines:
+                duplicate_lines.append(lines[k].strip())
+                k += 1
+            if duplicate_lines == array_lines:
+                for _ in range(len(array_lines) - 1):
+                    if j < len(lines):
+                        new_lines.append(lines[j])
+                        j += 1
+                i = k - 1
+            else:
+                for idx in range(j - i - 1):
+                    if i + 1 + idx < len(lines):
+                        new_lines.append(lines[i + 1 + idx])
+                i = j - 1
+        i += 1
+    content = '\n'.join(new_lines)
+
+    content = re.sub(
+        r'(\s+"title": ".*?"),\n(\s+"video_url": ".*?"),\n(\s+"image": ".*?"),\n\s+"title": ".*?",\n\s+"video_url": ".*?",\n\s+"image": ".*?",',
+        r'\1,\n\2,\n\3,',
+        content,
+        flags=re.MULTILINE | re.DOTALL
+    )
+    return content
+
+
+def create_item(index):
+    """A niconico_l.json-like item"""
+    day = 1 + index % 28
+    return {
+        'title': f"ダミー放送 #{index} 【雑談】",
+        'video_url': f"https://live.nicovideo.jp/watch/lv{340000000 + index}",
+        'image': f"https://secure-dcdn.cdn.nimg.jp/nicolive/thumbnail/{index}.jpg",
+        'upload_date': f"2024/{1 + index % 12:02d}/{day:02d}",
+        'metadata': [
+            f"放送開始: 2024/{1 + index % 12:02d}/{day:02d} 21:00",
+            f"タイムシフト視聴期限: 2025/{1 + index % 12:02d}/{day:02d} 23:59",
+            f"来場者数: {1000 + index}",
+        ],
+    }
+
+
+def create_corrupted_document(target_bytes, rng):
+    """
+    Returns:
+        tuple: (corrupted text, titles of items that were left undamaged)
+    """
+    item_size = len(json.dumps(create_item(0), ensure_ascii=False, indent=2).encode('utf-8'))
+    count = max(1, target_bytes // item_size)
+    parts = []
+    intact_titles = []
+    for index in range(count):
+        item = create_item(index)
+        text = json.dumps(item, ensure_ascii=False, indent=2)
+        text = '\n'.join('    ' + line for line in text.split('\n'))
+        damage = rng.random()
+        if damage < 0.02:
+            # Missing comma after a field
+            text = text.replace('",\n      "image"', '"\n      "image"', 1)
+        elif damage < 0.04:
+            # Duplicated metadata run
+            metadata = ',\n'.join(f'        "{entry}"' for entry in item['metadata'])
+            text = text.replace(metadata, metadata + ',\n' + metadata, 1)
+        elif damage < 0.06:
+            # Duplicated title/video_url/image fields
+            head = text.split('\n      "upload_date"')[0]
+            fields = head.split('{\n', 1)[1]
+            text = text.replace(fields, fields + ',\n' + fields, 1)
+        elif damage < 0.07:
+            # Stray ']' followed by a duplicated upload_date
+            upload = f'"upload_date": "{item["upload_date"]}"'
+            text = text.replace('      ]\n    }', f'      ],\n      {upload}\n      ],\n      {upload}\n    }}', 1)
+        intact_titles.append(item['title'])
+        parts.append(text)
+    document = '{\n  "items": [\n' + ',\n'.join(parts) + '\n  ]\n}'
+    # Truncate in the middle of the last item, as an interrupted write would
+    cut = document.rfind('"metadata"')
+    document = document[:cut + 20]
+    intact_titles.pop()
+    return document, intact_titles
+
+
+def _run_baseline(text, queue):
+    start = time.perf_counter()
+    fixed = baseline_fix(text)
+    queue.put((time.perf_counter() - start, check(fixed) is not None))
+
+
+def run_baseline(text, timeout):
+    """
+    Run baseline_fix() in a child process
+
+    Returns:
+        tuple: (seconds, output is valid JSON), or None if it did not finish in time
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_baseline, args=(text, queue), daemon=True)
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return None
+    return queue.get()
+
+
+def check(text):
+    """
+    Returns:
+        dict: parsed document, or None if the text is not valid JSON
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fix_json_files.py on corrupted files")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 2, 4], help="document sizes in MB (default: 1 2 4)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument('--baseline-timeout', type=float, default=30, help="seconds before the baseline is stopped (default: 30)")
+    parser.add_argument('--skip-baseline', action='store_true', help="do not run the previous regex passes")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        text, intact_titles = create_corrupted_document(int(size * 1024 * 1024), rng)
+        print(f"{size:g}MB ({len(text.encode('utf-8')) / 1024 / 1024:.1f}MB, {len(intact_titles) + 1} items)")
+
+        if not args.skip_baseline:
+            baseline = run_baseline(text, args.baseline_timeout)
+            if baseline is None:
+                print(f"  baseline   did not finish within {args.baseline_timeout:g}s")
+            else:
+                elapsed, valid = baseline
+                print(f"  baseline   {elapsed:8.3f}s  {'valid JSON' if valid else 'still invalid'}")
+
+        start = time.perf_counter()
+        value, changes = repair_json_text(text)
+        fixed = json.dumps(value, ensure_ascii=False, indent=2)
+        elapsed = time.perf_counter() - start
+        document = check(fixed)
+        if document is None:
+            result = "still invalid"
+        else:
+            titles = [item.get('title') for item in document['items']]
+            result = "valid JSON, all items intact" if titles[:len(intact_titles)] == intact_titles else "valid JSON, items differ"
+        print(f"  structural {elapsed:8.3f}s  {result} ({len(changes)} changes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,13 +27,15 @@ def load_json_file():
             # video_urlの形式はhttps://live.nicovideo.jp/watch/{video_id}なので、video_idを抽出
             video_id = video_url.split('/')[-1]
             
-            # items[].metadataの配列から"放送開始: YYYY/MM/DD (?) HH:mm:SS"の文字列を取得し、"YYYYMMDD"に整形して取得
-            metadata = item.get('metadata', [])
-            date_str = ''
-            for meta in metadata:
-                if '放送開始' in meta:
-                    date_str = meta.split(': ')[1].split(' ')[0].replace('/', '')
-                    break
+            # items[].broadcast_day(配信日 "YYYY-MM-DD")を"YYYYMMDD"に整形して取得
+            date_str = (item.get('broadcast_day') or '').replace('-', '')
+            if not date_str:
+                # broadcast_dayがない古いデータは、items[].metadataの配列から"放送開始: YYYY/MM/DD (?) HH:mm:SS"の文字列を取得
+                metadata = item.get('metadata', [])
+                for meta in metadata:
+                    if '放送開始' in meta:
+                        date_str = meta.split(': ')[1].split(' ')[0].replace('/', '')
+                        break
             result.append({
                 'title': title,
                 'video_id': video_id,
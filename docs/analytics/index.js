@@ -1,9 +1,25 @@
 let globalData = null;
 let chart = null;
 
+// 間引き版（各系列を最大200点程度に間引いたもの）を優先し、ない場合は全履歴を読み込む
+const DATA_URLS = ['../youtube_analyzed_downsampled.json', '../youtube_analyzed.json'];
+
+async function loadAnalyzedData() {
+    for (const url of DATA_URLS) {
+        try {
+            const response = await fetch(`${url}?v=${Date.now()}`); // キャッシュバスティングのためにタイムスタンプを追加
+            if (response.ok) {
+                return await response.json();
+            }
+        } catch (error) {
+            console.warn(`${url} の読み込みに失敗しました`, error);
+        }
+    }
+    throw new Error('分析データを読み込めませんでした');
+}
+
 document.addEventListener('DOMContentLoaded', async () => {
-    const response = await fetch(`../youtube_analyzed.json?v=${Date.now()}`); // キャッシュバスティングのためにタイムスタンプを追加
-    globalData = await response.json();
+    globalData = await loadAnalyzedData();
 
     // 初期表示
     renderChart();
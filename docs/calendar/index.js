@@ -1,3 +1,87 @@
+// Dateのローカル日付を"YYYY-MM-DD"に整形
+function formatDateKey(date) {
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${date.getFullYear()}-${month}-${day}`;
+}
+
+// build_calendar_index.py で作成した配信日ごとの索引
+const CALENDAR_INDEX_URL = '../calendar_index.json';
+
+// 日付("YYYY-MM-DD")ごとのイベントに索引の days（{"YYYY-MM-DD": [イベント, ...]}）を追加
+// 索引のイベントは並べ替え済みのため、APIの予定より前に置く
+function addIndexDays(eventsByDay, days) {
+    Object.entries(days).forEach(([day, events]) => {
+        eventsByDay.set(day, [...events, ...(eventsByDay.get(day) || [])]);
+    });
+}
+
+// 日付("YYYY-MM-DD")ごとのイベントにAPIの予定を追加（予定はdateから日付を求める）
+function addApiEvents(eventsByDay, events) {
+    events.forEach(event => {
+        const eventDate = new Date(event.date);
+        if (isNaN(eventDate.getTime())) {
+            console.warn('Invalid date for event:', event);
+            return; // 無効な日付はスキップ
+        }
+        const day = formatDateKey(eventDate);
+        if (!eventsByDay.has(day)) {
+            eventsByDay.set(day, []);
+        }
+        eventsByDay.get(day).push(event);
+    });
+}
+
+// calendar_index.json がない場合は従来どおり各出力ファイルから索引を作成
+function loadLegacyIndex() {
+    return Promise.all([
+        fetch(`../youtube.json?v=${Date.now()}`).then(res => res.json()),
+        fetch(`../niconico_l.json?v=${Date.now()}`).then(res => res.json()),
+        fetch(`../fciu.json?v=${Date.now()}`).then(res => res.json())
+    ])
+    .then(([youtubeData, niconicoData, fciuData]) => {
+        const days = {};
+        [['youtube', youtubeData], ['niconico', niconicoData], ['fciu', fciuData]].forEach(([type, data]) => {
+            data.items.forEach(item => {
+                // broadcast_dayがない古いデータはupload_dateから日付を求める
+                let day = item.broadcast_day;
+                if (!day) {
+                    const eventDate = new Date(item.upload_date);
+                    if (isNaN(eventDate.getTime())) {
+                        console.warn('Invalid date for event:', item);
+                        return; // 無効な日付はスキップ
+                    }
+                    day = formatDateKey(eventDate);
+                }
+                (days[day] = days[day] || []).push({
+                    type: type,
+                    title: item.title,
+                    url: item.video_url,
+                    thumbnail: item.image,
+                    date: item.upload_date,
+                    description: type === 'youtube' ? item.description : undefined
+                });
+            });
+        });
+        return { split: false, days: days };
+    });
+}
+
+// 配信日ごとの索引を読み込む
+function loadCalendarIndex() {
+    return fetch(`${CALENDAR_INDEX_URL}?v=${Date.now()}`)
+        .then(res => {
+            if (!res.ok) {
+                throw new Error(`HTTP ${res.status}`);
+            }
+            return res.json();
+        })
+        .catch(error => {
+            console.warn('calendar_index.json could not be loaded, falling back to source files:', error);
+            return loadLegacyIndex();
+        });
+}
+
 document.addEventListener('DOMContentLoaded', () => {
     const calendar = document.getElementById('calendar');
     const yearMonth = document.getElementById('year-month');
@@ -19,41 +103,43 @@ document.addEventListener('DOMContentLoaded', () => {
 
     const apiUrl = 'https://script.google.com/macros/s/AKfycbyzR2KODZn0JbfJ0084RTDgHLsbV-hE9ZKd1IyBW9s4ob2bkKGSIqFYDmeYmVN-FEQp/exec';
 
-    // Fetch data from local JSON files and API
+    // 配信日ごとの索引（配信日はスクリプト側で計算・並べ替え・重複除去済み）とAPIの予定を取得
     Promise.all([
-        fetch(`../youtube.json?v=${Date.now()}`).then(res => res.json()),
-        fetch(`../niconico_l.json?v=${Date.now()}`).then(res => res.json()),
-        fetch(`../fciu.json?v=${Date.now()}`).then(res => res.json()),
+        loadCalendarIndex(),
         fetch(`${apiUrl}?v=${Date.now()}`).then(res => res.json())
     ])
-    .then(([youtubeData, niconicoData, fciuData, apiData]) => {
-        const allEvents = [
-            ...youtubeData.items.map(item => ({
-                type: 'youtube',
-                date: item.upload_date,
-                title: item.title,
-                description: item.description,
-                thumbnail: item.image
-            })),
-            ...niconicoData.items.map(item => ({
-                type: 'niconico',
-                date: item.upload_date,
-                title: item.title,
-                thumbnail: item.image
-            })),
-            ...fciuData.items.map(item => ({
-                type: 'fciu',
-                date: item.upload_date,
-                title: item.title,
-                thumbnail: item.image,
-            })),
-            ...apiData.data
-        ];
+    .then(([calendarIndex, apiData]) => {
+        // 日付("YYYY-MM-DD")ごとのイベント
+        const eventsByDay = new Map();
+        addApiEvents(eventsByDay, apiData.data);
+
+        // 月ごとに分けた索引は表示する月のファイルのみ読み込む（読み込み中・読み込み済みの月はPromiseを保持）
+        const loadedMonths = new Map();
+        if (!calendarIndex.split) {
+            addIndexDays(eventsByDay, calendarIndex.days);
+        }
+
+        function loadMonth(monthKey) {
+            const monthFile = calendarIndex.split && calendarIndex.month_files && calendarIndex.month_files[monthKey];
+            if (!monthFile) {
+                return Promise.resolve();
+            }
+            if (!loadedMonths.has(monthKey)) {
+                // 索引が更新されるまではブラウザのキャッシュを使用する
+                const monthPromise = fetch(`../${monthFile}?v=${encodeURIComponent(calendarIndex.last_updated)}`)
+                    .then(res => res.json())
+                    .then(monthData => addIndexDays(eventsByDay, monthData.days))
+                    .catch(error => {
+                        console.error(`Error fetching ${monthFile}:`, error);
+                        loadedMonths.delete(monthKey); // 次に表示したときに再取得
+                    });
+                loadedMonths.set(monthKey, monthPromise);
+            }
+            return loadedMonths.get(monthKey);
+        }
 
         // デバッグ用: 取得したデータをログに出力
-        console.log('YouTube Data:', youtubeData);
-        console.log('Niconico Data:', niconicoData);
-        console.log('FCIU Data:', fciuData);
+        console.log('Calendar Index:', calendarIndex);
         console.log('API Data:', apiData);
 
         // モーダルウィンドウ関連の処理
@@ -79,32 +165,20 @@ document.addEventListener('DOMContentLoaded', () => {
             document.querySelectorAll('.event-dot').forEach(dot => dot.remove());
 
             // イベントがある日付にイベントドットを追加
-            allEvents.forEach(event => {
-            const eventDate = new Date(event.date);
-            if (isNaN(eventDate.getTime())) {
-                console.warn('Invalid date for event:', event);
-                return; // 無効な日付はスキップ
-            }
-            const dateCell = document.querySelector(`[data-date="${eventDate.toISOString().split('T')[0]}"]`);
-            if (dateCell) {
-                const dot = document.createElement('span');
-                dot.classList.add('event-dot');
-                dateCell.appendChild(dot);
-            }
+            document.querySelectorAll('.day[data-date]').forEach(dateCell => {
+                const events = eventsByDay.get(dateCell.getAttribute('data-date')) || [];
+                events.forEach(() => {
+                    const dot = document.createElement('span');
+                    dot.classList.add('event-dot');
+                    dateCell.appendChild(dot);
+                });
             });
 
             // カレンダーの日付にクリックイベントを追加
             document.querySelectorAll('.day[data-date]').forEach(day => {
                 day.addEventListener('click', () => {
                     const date = day.getAttribute('data-date');
-                    const eventsForDate = allEvents.filter(event => {
-                        const eventDate = new Date(event.date);
-                        if (isNaN(eventDate.getTime())) {
-                            console.warn('Invalid date for event in modal:', event);
-                            return false; // 無効な日付はスキップ
-                        }
-                        return eventDate.toISOString().split('T')[0] === date;
-                    });
+                    const eventsForDate = eventsByDay.get(date) || [];
 
                     modalEvents.innerHTML = '';
                     if (eventsForDate.length > 0) {
@@ -149,8 +223,11 @@ document.addEventListener('DOMContentLoaded', () => {
 
         let currentYear = year;
         let currentMonth = month;
+        // 月の読み込み中に表示する月が変わった場合、古い月のハンドラは追加しない
+        let renderCount = 0;
 
         function renderCalendar(year, month) {
+            const renderId = ++renderCount;
             calendar.innerHTML = '';
             yearMonth.textContent = `${year}年 ${month + 1}月`;
 
@@ -168,15 +245,20 @@ document.addEventListener('DOMContentLoaded', () => {
                 day.className = 'day';
                 day.textContent = i;
                 const fullDate = new Date(year, month, i);
-                day.setAttribute('data-date', fullDate.toISOString().split('T')[0]);
+                day.setAttribute('data-date', formatDateKey(fullDate));
                 if (i === date && year === today.getFullYear() && month === today.getMonth()) {
                     day.classList.add('current-day');
                 }
                 calendar.appendChild(day);
             }
 
-            // Add event handlers after calendar is rendered
-            addEventHandlers();
+            // Add event handlers after calendar is rendered (and the month's events are loaded)
+            const monthKey = `${year}-${String(month + 1).padStart(2, '0')}`;
+            loadMonth(monthKey).then(() => {
+                if (renderId === renderCount) {
+                    addEventHandlers();
+                }
+            });
         }
 
         const prevButton = document.createElement('button');
@@ -348,9 +348,12 @@ document.addEventListener('DOMContentLoaded', function() {
                     const videoId = this.dataset.videoId;
                     const title = this.dataset.title;
                     const timestamps = this.dataset.timestamps;
+                    // 構造化済みのタイムスタンプ（{seconds, label}）があれば使用
+                    const itemData = filteredItems && filteredItems[index];
+                    const timestampEntries = itemData && Array.isArray(itemData.timestamp_entries) ? itemData.timestamp_entries : null;
                     
                     if (videoId && title) {
-                        openVideoModal(videoId, title, timestamps);
+                        openVideoModal(videoId, title, timestamps, timestampEntries);
                     }
                 });
             }
@@ -635,8 +638,33 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 });
 
+// タイムスタンプ文字列（カンマ区切り）を {seconds, label} の配列に変換
+// timestamp_entries がない古いデータ用
+function parseTimestampEntries(timestamps) {
+    return timestamps.split(',').map(timestamp => {
+        // タイムスタンプ文字列から最初に現れる時間部分（例: 1:23, 12:34:56など）を抽出
+        const match = timestamp.match(/([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?)/);
+        const timeStr = match ? match[1] : timestamp.trim();
+        const timeParts = timeStr.split(':').map(part => parseInt(part, 10));
+        let seconds = 0;
+        if (timeParts.length === 3) {
+            // HH:MM:SS 形式
+            seconds = timeParts[0] * 3600 + timeParts[1] * 60 + timeParts[2];
+        }
+        else if (timeParts.length === 2) {
+            // MM:SS 形式
+            seconds = timeParts[0] * 60 + timeParts[1];
+        }
+        else if (timeParts.length === 1) {
+            // SS 形式
+            seconds = timeParts[0];
+        }
+        return { seconds: seconds, label: timestamp.trim() };
+    });
+}
+
 // YouTube動画モーダル関数
-function openVideoModal(videoId, title, timestamps) {
+function openVideoModal(videoId, title, timestamps, timestampEntries) {
     const modal = document.getElementById('videoModal');
     const iframe = document.getElementById('videoIframe');
     const titleElement = document.getElementById('videoTitle');
@@ -653,35 +681,21 @@ function openVideoModal(videoId, title, timestamps) {
     // スクロールを無効化
     document.body.style.overflow = 'hidden';
 
+    // 構造化済みのタイムスタンプがなければ文字列から秒数を求める
+    const entries = timestampEntries && timestampEntries.length > 0
+        ? timestampEntries
+        : (timestamps && timestamps.length > 0 ? parseTimestampEntries(timestamps) : []);
+
     // タイムスタンプがある場合は表示
-    if (timestamps && timestamps.length > 0) {
+    if (entries.length > 0) {
         const timestampList = document.getElementById('videoTimestamps');
         timestampList.innerHTML = ''; // 既存のリストをクリア
-        timestamps.split(',').forEach(timestamp => {
+        entries.forEach(entry => {
             const listItem = document.createElement('li');
-            listItem.textContent = timestamp.trim();
+            listItem.textContent = entry.label;
             listItem.addEventListener('click', function() {
                 // タイムスタンプクリック時の処理: 特定の時間にジャンプ
-                // タイムスタンプ文字列から最初に現れる時間部分（例: 1:23, 12:34:56など）を抽出
-                const match = timestamp.match(/([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?)/);
-                const timeStr = match ? match[1] : timestamp.trim();
-                const timeParts = timeStr.split(':').map(part => parseInt(part, 10));
-                let seconds = 0;
-                if (timeParts.length === 3) {
-                    // HH:MM:SS 形式
-                    seconds = timeParts[0] * 3600 + timeParts[1] * 60 + timeParts[2];
-                }
-                else if (timeParts.length === 2) {
-                    // MM:SS 形式
-                    seconds = timeParts[0] * 60 + timeParts[1];
-                }
-                else if (timeParts.length === 1) {
-                    // SS 形式
-                    seconds = timeParts[0];
-                }
-                
-                // 新しいジャンプ関数を使用
-                jumpToTime(iframe, seconds);
+                jumpToTime(iframe, entry.seconds);
                 
                 // 視覚的フィードバック
                 listItem.style.backgroundColor = '#4a9eff';
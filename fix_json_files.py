@@ -1,85 +1,435 @@
 #!/usr/bin/env python3
+"""
+Repair broken JSON output files (docs/*.json) in a single linear pass.
+
+The repairer tokenizes the file once and rebuilds the document with a tolerant
+recursive-descent parser instead of running regex passes over the whole text.
+It recovers from:
+
+    - missing commas between object members / array elements
+    - missing colons, extra and trailing commas
+    - duplicated keys in an object (the first value is kept)
+    - duplicated runs of metadata strings, e.g. "metadata": ["a", "b", "a", "b"] -> ["a", "b"]
+      (only runs of MIN_RUN_LENGTH or more strings in DEDUPE_ARRAY_KEYS arrays, the shape
+      left by interrupted writes; other repeated values are real data and are kept)
+    - stray or missing closing brackets and truncated files
+
+Every file is run through the repairer, including files that already parse
+(duplicated keys and metadata runs are still valid JSON); a file is only
+rewritten when something was repaired.
+
+Every change is reported in a diff-like format ("+" inserted, "-" removed) with
+the line number and JSON path, and the result is validated before it is written.
+
+Usage:
+    python fix_json_files.py [files ...] [--check] [--no-dedupe-arrays]
+"""
+import argparse
+import bisect
 import json
+import os
 import re
+import tempfile
+from collections import deque
+
+DEFAULT_FILES = ['docs/niconico_l.json', 'docs/fciu.json']
+# Arrays (by key) in which duplicated runs of strings are removed
+DEDUPE_ARRAY_KEYS = ('metadata',)
+# Shortest and longest run of array elements that is checked for an immediate duplicate
+MIN_RUN_LENGTH = 2
+MAX_RUN_LENGTH = 16
+# Number of report lines printed per file
+MAX_REPORT_LINES = 50
+
+TOKEN_PATTERN = re.compile(r'''
+    [ \t\r\n]*
+    (?:
+        (?P<string>"(?:[^"\\\n]|\\.)*"?)
+      | (?P<punct>[{}\[\]:,])
+      | (?P<number>-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?(?![\w.]))
+      | (?P<literal>(?:true|false|null)\b)
+      | (?P<garbage>[^\s{}\[\]:,"]+)
+    )
+''', re.VERBOSE)
+
+LITERALS = {'true': True, 'false': False, 'null': None}
+# Python-style literals that sometimes end up in hand-edited files
+LOOSE_LITERALS = {'True': True, 'False': False, 'None': None}
+CLOSERS = {'{': '}', '[': ']'}
+VALUE_START = ('string', 'number', 'literal', 'garbage')
+
+_MISSING = object()
+# Decoder for string tokens (control characters inside strings are tolerated)
+_STRING_DECODER = json.JSONDecoder(strict=False)
+
+
+class Change:
+    """A single repair made to the document"""
+
+    def __init__(self, line, sign, message, path):
+        self.line = line
+        self.sign = sign
+        self.message = message
+        self.path = path
+
+    def __str__(self):
+        return f"L{self.line:>6} {self.sign} {self.message} at {self.path}"
+
+
+def format_path(path):
+    """Format a list of keys/indices as a JSON path ($.items[3].metadata)"""
+    parts = ['$']
+    for part in path:
+        parts.append(f"[{part}]" if isinstance(part, int) else f".{part}")
+    return ''.join(parts)
+
+
+class JsonRepairer:
+    """Tolerant single-pass JSON parser that records every repair it makes"""
+
+    def __init__(self, text, dedupe_arrays=True, max_run_length=MAX_RUN_LENGTH):
+        self.text = text
+        self.dedupe_arrays = dedupe_arrays
+        self.max_run_length = max_run_length
+        self.changes = []
+        self._tokens = self._tokenize()
+        self._buffer = deque()
+        self._closers = []
+        self._newlines = None
+
+    def _tokenize(self):
+        """Yield (kind, text, offset) tokens; unknown characters become garbage tokens"""
+        text = self.text
+        end = len(text)
+        pos = 0
+        match = TOKEN_PATTERN.match
+        while pos < end:
+            m = match(text, pos)
+            if m is None:
+                # Only trailing whitespace is left
+                break
+            kind = m.lastgroup
+            yield kind, m.group(kind), m.start(kind)
+            pos = m.end()
+
+    def _peek(self, n=0):
+        while len(self._buffer) <= n:
+            token = next(self._tokens, None)
+            if token is None:
+                return None
+            self._buffer.append(token)
+        return self._buffer[n]
+
+    def _next(self):
+        token = self._peek()
+        if token is not None:
+            self._buffer.popleft()
+        return token
+
+    def _line(self, offset):
+        if self._newlines is None:
+            self._newlines = [m.start() for m in re.finditer('\n', self.text)]
+        return bisect.bisect_right(self._newlines, offset) + 1
+
+    def _report(self, offset, sign, message, path):
+        self.changes.append(Change(self._line(offset), sign, message, format_path(path)))
+
+    def _end_offset(self):
+        return len(self.text.rstrip())
+
+    def _is_key(self, n=0):
+        """True if tokens at n look like an object member ("key": ...)"""
+        token = self._peek(n)
+        following = self._peek(n + 1)
+        return (token is not None and token[0] in ('string', 'garbage')
+                and following is not None and following[1] == ':')
+
+    def _continues(self, closer):
+        """True if the tokens after a stray closer continue the current container"""
+        following = self._peek(1)
+        if following is None or following[1] != ',':
+            return self._is_key(1) if closer == '}' else False
+        if closer == '}':
+            return self._is_key(2)
+        token = self._peek(2)
+        return token is not None and (token[0] in VALUE_START or token[1] in CLOSERS) and not self._is_key(2)
+
+    def _handle_wrong_closer(self, token, path):
+        """
+        Handle a closing bracket that does not match the current container.
+
+        Returns:
+            bool: True if the current container should be closed
+        """
+        current = self._closers[-1]
+        if not self._continues(current) and token[1] in self._closers[:-1]:
+            self._report(token[2], '+', f"inserted missing '{current}'", path)
+            return True
+        self._next()
+        self._report(token[2], '-', f"removed stray '{token[1]}'", path)
+        return False
+
+    def _give_back_comma(self, offset):
+        """Return the comma before an implicitly closed container to the enclosing container"""
+        if offset is not None:
+            self._buffer.appendleft(('punct', ',', offset))
+
+    def _decode_string(self, token, path):
+        text = token[1]
+        # The closing quote must not be escaped (an even number of backslashes before it)
+        backslashes = len(text) - 1 - len(text[:-1].rstrip('\\'))
+        if len(text) < 2 or not text.endswith('"') or backslashes % 2:
+            self._report(token[2], '+', "closed unterminated string", path)
+            text = text + '"'
+        if '\\' not in text:
+            return text[1:-1]
+        try:
+            return _STRING_DECODER.decode(text)
+        except json.JSONDecodeError:
+            self._report(token[2], '~', "replaced invalid escape sequence", path)
+            return text[1:-1].replace('\\"', '"')
+
+    def _parse_value(self, path):
+        token = self._peek()
+        if token is None:
+            return _MISSING
+        kind, text, offset = token
+        if text == '{':
+            return self._parse_object(path)
+        if text == '[':
+            return self._parse_array(path)
+        if kind == 'punct':
+            return _MISSING
+        self._next()
+        if kind == 'string':
+            return self._decode_string(token, path)
+        if kind == 'number':
+            return json.loads(text)
+        if kind == 'literal':
+            return LITERALS[text]
+        if text in LOOSE_LITERALS:
+            self._report(offset, '~', f"replaced {text} with {json.dumps(LOOSE_LITERALS[text])}", path)
+            return LOOSE_LITERALS[text]
+        self._report(offset, '~', f"quoted bare word {text[:40]!r}", path)
+        return text
+
+    def _parse_object(self, path):
+        self._next()
+        self._closers.append('}')
+        result = {}
+        expect_member = True
+        last_comma = None
+        while True:
+            token = self._peek()
+            if token is None:
+                self._report(self._end_offset(), '+', "closed unterminated object", path)
+                break
+            kind, text, offset = token
+            if text == '}':
+                self._next()
+                if last_comma is not None and expect_member:
+                    self._report(last_comma, '-', "removed trailing comma", path)
+                break
+            if text == ']':
+                if self._handle_wrong_closer(token, path):
+                    self._give_back_comma(last_comma if expect_member else None)
+                    break
+                continue
+            if text == ',':
+                self._next()
+                if expect_member:
+                    self._report(offset, '-', "removed extra comma", path)
+                expect_member = True
+                last_comma = offset
+                continue
+            if kind not in ('string', 'garbage'):
+                # A value or ':' where a key was expected
+                self._skip(path)
+                continue
+            if not expect_member:
+                self._report(offset, '+', "inserted missing comma", path)
+            self._next()
+            key = self._decode_string(token, path) if kind == 'string' else text
+            member_path = path + [key]
+            following = self._peek()
+            if following is not None and following[1] == ':':
+                self._next()
+            elif following is not None and (following[0] in VALUE_START or following[1] in CLOSERS):
+                self._report(offset, '+', "inserted missing colon", member_path)
+            value = self._parse_value(member_path)
+            expect_member = False
+            last_comma = None
+            if value is _MISSING:
+                self._report(offset, '-', f"removed key {key!r} without a value", path)
+                continue
+            if key in result:
+                kept = "same value" if result[key] == value else "kept the first value"
+                self._report(offset, '-', f"removed duplicated key {key!r} ({kept})", path)
+                continue
+            result[key] = value
+        self._closers.pop()
+        return result
+
+    def _parse_array(self, path):
+        self._next()
+        self._closers.append(']')
+        result = []
+        keys = []
+        dedupe = self.dedupe_arrays and bool(path) and path[-1] in DEDUPE_ARRAY_KEYS
+        expect_value = True
+        last_comma = None
+        while True:
+            token = self._peek()
+            if token is None:
+                self._report(self._end_offset(), '+', "closed unterminated array", path)
+                break
+            kind, text, offset = token
+            if text == ']':
+                self._next()
+                if last_comma is not None and expect_value:
+                    self._report(last_comma, '-', "removed trailing comma", path)
+                break
+            if text == '}':
+                if self._handle_wrong_closer(token, path):
+                    self._give_back_comma(last_comma if expect_value else None)
+                    break
+                continue
+            if text == ',':
+                self._next()
+                if expect_value:
+                    self._report(offset, '-', "removed extra comma", path)
+                expect_value = True
+                last_comma = offset
+                continue
+            if text == ':':
+                self._skip(path)
+                continue
+            if '}' in self._closers[:-1] and self._is_key():
+                # A member of the enclosing object: this array was never closed
+                self._report(offset, '+', "inserted missing ']'", path)
+                self._give_back_comma(last_comma if expect_value else None)
+                break
+            if not expect_value:
+                self._report(offset, '+', "inserted missing comma", path)
+            value = self._parse_value(path + [len(result)])
+            expect_value = False
+            last_comma = None
+            result.append(value)
+            if dedupe:
+                # Only strings can be part of a duplicated run
+                keys.append(value if isinstance(value, str) else object())
+                self._drop_duplicated_run(result, keys, offset, path)
+        self._closers.pop()
+        return result
+
+    def _drop_duplicated_run(self, result, keys, offset, path):
+        """Remove the last k elements if they repeat the k elements right before them"""
+        size = len(keys)
+        for run in range(MIN_RUN_LENGTH, min(self.max_run_length, size // 2) + 1):
+            if keys[size - run:] == keys[size - 2 * run:size - run]:
+                del result[size - run:]
+                del keys[size - run:]
+                self._report(offset, '-', f"removed duplicated run of {run} elements", path)
+                return
+
+    def _skip(self, path):
+        """Drop a token (or a whole value) that cannot appear at this position"""
+        token = self._peek()
+        if token[1] in CLOSERS:
+            self._parse_value(path)
+            self._report(token[2], '-', f"removed unexpected {'object' if token[1] == '{' else 'array'}", path)
+            return
+        self._next()
+        self._report(token[2], '-', f"removed unexpected {token[1][:40]!r}", path)
+
+    def repair(self):
+        """
+        Parse the whole text and return the repaired document
+
+        Returns:
+            The repaired JSON value (None for an empty file)
+        """
+        value = self._parse_value([])
+        while value is _MISSING and self._peek() is not None:
+            self._skip([])
+            value = self._parse_value([])
+        if value is _MISSING:
+            value = None
+        token = self._peek()
+        if token is not None:
+            self._report(token[2], '-', "removed trailing data after the document", [])
+        return value
+
+
+def repair_json_text(text, dedupe_arrays=True):
+    """
+    Repair JSON text
+
+    Returns:
+        tuple: (repaired value, list of Change)
+    """
+    repairer = JsonRepairer(text, dedupe_arrays=dedupe_arrays)
+    value = repairer.repair()
+    return value, repairer.changes
+
+
+def detect_indent(text):
+    """Detect the indentation width used by the original file (default 2)"""
+    match = re.search(r'\n( +)\S', text[:4096])
+    return len(match.group(1)) if match else 2
 
-def fix_json_file(file_path):
-    """Fix duplicate entries and missing commas in JSON file"""
-    
+
+def write_text_atomic(file_path, content):
+    """Write to a temp file in the same directory, then replace the original"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, os.stat(file_path).st_mode & 0o777)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def fix_json_file(file_path, dry_run=False, dedupe_arrays=True, max_report_lines=MAX_REPORT_LINES):
+    """
+    Repair a JSON file in place and print a report of the changes
+
+    Returns:
+        list: Change objects (empty if the file needed no repair)
+    """
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
-    
+
     print(f"Fixing {file_path}...")
-    
-    # 1. Fix missing commas after quoted strings (general pattern)
-    content = re.sub(
-        r'(".*?")\n(\s+".*?":)',
-        r'\1,\n\2',
-        content,
-        flags=re.MULTILINE
-    )
-    
-    # 2. Remove duplicate consecutive metadata entries
-    # Pattern: "line1", "line2" followed by duplicate "line1", "line2"
-    lines = content.split('\n')
-    new_lines = []
-    i = 0
-    
-    while i < len(lines):
-        line = lines[i]
-        new_lines.append(line)
-        
-        # Check for duplicate pattern in arrays
-        if '        "' in line and line.strip().endswith('",'):
-            # Look for potential duplicate sequence
-            current_entry = line.strip()
-            j = i + 1
-            
-            # Collect next few lines in the array
-            array_lines = [current_entry]
-            while j < len(lines) and '        "' in lines[j] and lines[j].strip().endswith(('",', '"')):
-                array_lines.append(lines[j].strip())
-                j += 1
-            
-            # Check if the next sequence is identical
-            k = j
-            duplicate_lines = []
-            while k < len(lines) and len(duplicate_lines) < len(array_lines) and '        "' in lines[k] and lines[k].strip() in array_lines:
-                duplicate_lines.append(lines[k].strip())
-                k += 1
-            
-            # If we found a complete duplicate sequence, skip it
-            if duplicate_lines == array_lines:
-                # Skip the duplicate lines
-                for _ in range(len(array_lines) - 1):  # -1 because we already added the first line
-                    if j < len(lines):
-                        new_lines.append(lines[j])
-                        j += 1
-                i = k - 1  # Skip the duplicate sequence
-            else:
-                # Add the rest of the array lines normally
-                for idx in range(j - i - 1):  # Skip the line we already added
-                    if i + 1 + idx < len(lines):
-                        new_lines.append(lines[i + 1 + idx])
-                i = j - 1
-        
-        i += 1
-    
-    content = '\n'.join(new_lines)
-    
-    # 3. Remove duplicate field entries (title, video_url, image, etc.)
-    # Pattern: same field appearing twice in a row
-    content = re.sub(
-        r'(\s+"title": ".*?"),\n(\s+"video_url": ".*?"),\n(\s+"image": ".*?"),\n\s+"title": ".*?",\n\s+"video_url": ".*?",\n\s+"image": ".*?",',
-        r'\1,\n\2,\n\3,',
-        content,
-        flags=re.MULTILINE | re.DOTALL
-    )
-    
-    # Save the fixed content
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    print(f"Fixed {file_path}")
+    value, changes = repair_json_text(content, dedupe_arrays=dedupe_arrays)
+    for change in changes[:max_report_lines]:
+        print(f"  {change}")
+    if len(changes) > max_report_lines:
+        print(f"  ... and {len(changes) - max_report_lines} more")
+
+    if not changes:
+        print(f"No changes needed for {file_path}")
+        return changes
+
+    fixed = json.dumps(value, ensure_ascii=False, indent=detect_indent(content))
+    # The repaired document must round-trip before it replaces the original
+    json.loads(fixed)
+    inserted = sum(1 for change in changes if change.sign == '+')
+    removed = sum(1 for change in changes if change.sign == '-')
+    summary = f"{len(changes)} changes ({inserted} inserted, {removed} removed, {len(changes) - inserted - removed} modified)"
+    if dry_run:
+        print(f"Would fix {file_path}: {summary}")
+        return changes
+    write_text_atomic(file_path, fixed)
+    print(f"Fixed {file_path}: {summary}")
+    return changes
+
 
 def validate_json(file_path):
     """Validate JSON syntax"""
@@ -90,7 +440,7 @@ def validate_json(file_path):
         return True
     except json.JSONDecodeError as e:
         print(f"✗ {file_path} still has errors: {e}")
-        
+
         # Show specific error location
         with open(file_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
@@ -103,9 +453,14 @@ def validate_json(file_path):
                     print(f"Next line: {lines[error_line+1].strip()}")
         return False
 
+
 if __name__ == "__main__":
-    files_to_fix = ['docs/niconico_l.json', 'docs/fciu.json']
-    
-    for file_path in files_to_fix:
-        fix_json_file(file_path)
-        validate_json(file_path)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Repair broken JSON output files")
+    parser.add_argument('files', nargs='*', default=DEFAULT_FILES, help=f"files to repair (default: {' '.join(DEFAULT_FILES)})")
+    parser.add_argument('--check', action='store_true', help="only report what would change")
+    parser.add_argument('--no-dedupe-arrays', action='store_true', help="keep duplicated runs of metadata strings")
+    args = parser.parse_args()
+
+    for file_path in args.files:
+        fix_json_file(file_path, dry_run=args.check, dedupe_arrays=not args.no_dedupe_arrays)
+        validate_json(file_path)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+再生回数の推移の集計・間引きファイルを書き出す
+view_history_store.ViewHistory から、グラフ表示用の小さなファイルを作成します。
+
+    - 間引き版(DOWNSAMPLED_FILE): youtube_analyzed.json と同じ形式で、各系列をLTTB
+      (Largest-Triangle-Three-Buckets)で最大 point_budget 点に間引いたもの
+    - 集計版(ROLLUPS_FILE): 日・週ごとの各動画の最終値と増加分、チャンネル全体の総再生回数、
+      直近の日・週で再生回数の増加が大きい動画(top_movers)
+
+日・週の区切りは v_datetime の日付で判定し、週は月曜日始まりです。
+
+通常の実行では、前回書き出したファイルに今回のスキャンの点を追加するだけで更新します(update_analytics_exports)。
+間引き版は上限を超えた系列のみ間引き直すため、全履歴から作り直した場合(write_analytics_exports)と
+間引き方が少し異なりますが、コンパクション時に全履歴から作り直します。
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+from json_writer import write_json_atomic
+from view_history_store import export_analyzed
+
+# 設定
+# 間引き版の出力ファイル
+DOWNSAMPLED_FILE = "../docs/youtube_analyzed_downsampled.json"
+# 集計版の出力ファイル
+ROLLUPS_FILE = "../docs/youtube_rollups.json"
+# 間引き版の1系列あたりの最大点数
+DEFAULT_POINT_BUDGET = 200
+# top_movers に含める動画の数
+TOP_MOVERS_COUNT = 10
+# 集計版に含める直近の期間の数（日ごと: 90日、週ごと: 104週）
+ROLLUP_PERIODS = {'daily': 90, 'weekly': 104}
+
+
+def _to_timestamp(v_datetime):
+    return datetime.fromisoformat(v_datetime).timestamp()
+
+
+def lttb(points, threshold):
+    """
+    Largest-Triangle-Three-Buckets で系列を間引く（最初と最後の点は必ず残す）
+
+    Args:
+        points (list): [(x(float), y), ...]（xの昇順）
+        threshold (int): 間引き後の最大点数
+    Returns:
+        list: 残す点のインデックスのリスト（昇順）
+    """
+    size = len(points)
+    if threshold >= size:
+        return list(range(size))
+    if threshold < 3:
+        return [0, size - 1]
+    selected = [0]
+    # 最初と最後を除いた点を threshold - 2 個のバケットに分ける
+    bucket_size = (size - 2) / (threshold - 2)
+    a = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        # 次のバケットの平均点
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, size)
+        if next_start >= next_end:
+            next_start, next_end = size - 1, size
+        count = next_end - next_start
+        avg_x = sum(points[i][0] for i in range(next_start, next_end)) / count
+        avg_y = sum(points[i][1] for i in range(next_start, next_end)) / count
+        # 前に選んだ点・次のバケットの平均点と作る三角形の面積が最大の点を選ぶ
+        ax, ay = points[a]
+        best_area = -1.0
+        best = start
+        for i in range(start, end):
+            x, y = points[i]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = i
+        selected.append(best)
+        a = best
+    selected.append(size - 1)
+    return selected
+
+
+def downsample_series(views, point_budget):
+    """
+    [(v_datetime, view_count), ...] の系列を間引く
+
+    Returns:
+        list: 間引いた系列
+    """
+    if len(views) <= point_budget:
+        return list(views)
+    points = [(_to_timestamp(v_datetime), view_count) for v_datetime, view_count in views]
+    return [views[i] for i in lttb(points, point_budget)]
+
+
+def build_downsampled(history, point_budget=DEFAULT_POINT_BUDGET):
+    """
+    youtube_analyzed.json と同じ形式で、各系列を間引いたデータを作成
+
+    Args:
+        history (ViewHistory): 再生回数の履歴
+        point_budget (int): 1系列あたりの最大点数
+    Returns:
+        dict: {"each_video": [...], "total_videos": [...], "last_updated": str, "point_budget": int}
+    """
+    data = export_analyzed(history)
+    for exported, video in zip(data['each_video'], history.videos.values()):
+        exported['views'] = [{'v_datetime': v_datetime, 'view_count': view_count}
+                             for v_datetime, view_count in downsample_series(video['views'], point_budget)]
+    data['total_videos'] = [{'v_datetime': v_datetime, 'view_count': view_count}
+                            for v_datetime, view_count in downsample_series(history.total, point_budget)]
+    data['point_budget'] = point_budget
+    return data
+
+
+def _period_key(v_datetime, period):
+    """
+    v_datetime が属する日・週の開始日(YYYY-MM-DD)
+    """
+    day = date.fromisoformat(v_datetime[:10])
+    if period == 'weekly':
+        day -= timedelta(days=day.weekday())
+    return day.isoformat()
+
+
+def _period_start_before(v_datetime, period, count):
+    """
+    v_datetime が属する期間から count - 1 期間前の期間の開始日(YYYY-MM-DD)
+    """
+    day = date.fromisoformat(_period_key(v_datetime, period))
+    step = 7 if period == 'weekly' else 1
+    return (day - timedelta(days=step * (count - 1))).isoformat()
+
+
+def rollup_series(views, period):
+    """
+    系列を日・週ごとに集計
+
+    Args:
+        views (list): [(v_datetime, view_count), ...]（v_datetimeの昇順）
+        period (str): "daily" / "weekly"
+    Returns:
+        list: [[期間の開始日, 期間の最終値, 増加分], ...]
+              増加分は前の期間の最終値との差（最初の期間は期間内の最初の値との差）
+    """
+    rows = []
+    previous_last = None
+    first_in_period = None
+    for v_datetime, view_count in views:
+        key = _period_key(v_datetime, period)
+        if rows and rows[-1][0] == key:
+            rows[-1][1] = view_count
+        else:
+            if rows:
+                previous_last = rows[-1][1]
+            first_in_period = view_count
+            rows.append([key, view_count, 0])
+        base = previous_last if previous_last is not None else first_in_period
+        rows[-1][2] = view_count - base
+    return rows
+
+
+def top_movers(video_rollups, count=TOP_MOVERS_COUNT):
+    """
+    最新の期間で再生回数の増加が大きい動画
+
+    Args:
+        video_rollups (list): [{"id", "title", "rows": rollup_series()の結果}, ...]
+    Returns:
+        list: [{"id", "title", "period", "delta", "last"}, ...]（増加分の降順）
+    """
+    latest = max((video['rows'][-1][0] for video in video_rollups if video['rows']), default=None)
+    if latest is None:
+        return []
+    movers = [
+        {'id': video['id'], 'title': video['title'], 'period': latest,
+         'delta': video['rows'][-1][2], 'last': video['rows'][-1][1]}
+        for video in video_rollups
+        if video['rows'] and video['rows'][-1][0] == latest
+    ]
+    movers.sort(key=lambda mover: mover['delta'], reverse=True)
+    return movers[:count]
+
+
+def build_rollups(history, top_count=TOP_MOVERS_COUNT):
+    """
+    日・週ごとの集計データを作成
+
+    Args:
+        history (ViewHistory): 再生回数の履歴
+        top_count (int): top_movers に含める動画の数
+    Returns:
+        dict: {"daily": {...}, "weekly": {...}, "last_updated": str}
+              daily/weekly: {"columns", "videos": [{"id", "title", "rows"}], "channel": rows, "top_movers": [...]}
+              （rows は直近 ROLLUP_PERIODS 期間分）
+    """
+    data = {}
+    for period, max_periods in ROLLUP_PERIODS.items():
+        videos = [
+            {'id': video_id, 'title': video['title'], 'rows': rollup_series(video['views'], period)}
+            for video_id, video in history.videos.items()
+        ]
+        channel = rollup_series(history.total, period)
+        # ファイルサイズを抑えるため、直近 max_periods 期間のみ出力する（期間内に記録がない動画は含めない）
+        cutoff = _period_start_before(history.last_updated, period, max_periods) if history.last_updated else ''
+        for video in videos:
+            video['rows'] = [row for row in video['rows'] if row[0] >= cutoff]
+        data[period] = {
+            'columns': ['period_start', 'last', 'delta'],
+            'videos': [video for video in videos if video['rows']],
+            'channel': [row for row in channel if row[0] >= cutoff],
+            'top_movers': top_movers(videos, top_count),
+        }
+    data['last_updated'] = history.last_updated
+    return data
+
+
+def _append_rollup_row(rows, key, view_count, previous_last):
+    """
+    rollup_series() の結果に1点を追加した場合と同じになるように、最後の行を更新または行を追加
+
+    Args:
+        rows (list): [[期間の開始日, 期間の最終値, 増加分], ...]
+        key (str): 追加する点の期間の開始日
+        view_count (int): 追加する点の値
+        previous_last (int): 追加する点の直前の値（記録がない場合はNone）
+    """
+    if rows and rows[-1][0] == key:
+        # 増加分の基準(前の期間の最終値・期間内の最初の値)は 最終値 - 増加分 で求められる
+        base = rows[-1][1] - rows[-1][2]
+        rows[-1][1] = view_count
+        rows[-1][2] = view_count - base
+    else:
+        base = previous_last if previous_last is not None else view_count
+        rows.append([key, view_count, view_count - base])
+
+
+def _append_downsampled_point(views, v_datetime, view_count, point_budget):
+    """
+    間引き版の系列に1点を追加し、上限を超えた場合は間引き直す
+
+    Returns:
+        list: 更新した系列
+    """
+    views.append({'v_datetime': v_datetime, 'view_count': view_count})
+    if len(views) <= point_budget:
+        return views
+    points = [(view['v_datetime'], view['view_count']) for view in views]
+    return [{'v_datetime': v_datetime, 'view_count': view_count}
+            for v_datetime, view_count in downsample_series(points, point_budget)]
+
+
+def _load_export(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def update_analytics_exports(scan, previous_scan, point_budget=DEFAULT_POINT_BUDGET, top_count=TOP_MOVERS_COUNT,
+                             downsampled_file=DOWNSAMPLED_FILE, rollups_file=ROLLUPS_FILE):
+    """
+    前回書き出した間引き版・集計版に1回のスキャンを追加して書き出す（ストアの履歴は読み込まない）
+    各系列の直前の値は間引き版の最後の点（間引いても必ず残る）から求める
+
+    Args:
+        scan (dict): {"v_datetime": str, "views": [[動画ID, 再生回数], ...], "titles": {動画ID: タイトル}, "total": int}
+        previous_scan (str): 追記前のストアの最後のスキャン日時（マニフェストの last_scan）
+        point_budget (int): 間引き版の1系列あたりの最大点数
+        top_count (int): top_movers に含める動画の数
+        downsampled_file (str): 間引き版の出力ファイル
+        rollups_file (str): 集計版の出力ファイル
+    Returns:
+        tuple: (間引き版のバイト数, 集計版のバイト数)、前回のファイルが previous_scan 時点のものでない場合はNone
+    """
+    downsampled = _load_export(downsampled_file)
+    rollups = _load_export(rollups_file)
+    if (previous_scan is None or not downsampled or not rollups
+            or downsampled.get('last_updated') != previous_scan or rollups.get('last_updated') != previous_scan
+            or downsampled.get('point_budget') != point_budget or scan['v_datetime'] <= previous_scan):
+        return None
+    v_datetime = scan['v_datetime']
+
+    # 間引き版: 各系列の最後に今回の点を追加（新しい動画は最後に追加する）
+    videos = {video['id']: video for video in downsampled['each_video']}
+    previous_views = {video_id: video['views'][-1]['view_count']
+                      for video_id, video in videos.items() if video['views']}
+    for video_id, view_count in scan['views']:
+        video = videos.get(video_id)
+        if video is None:
+            video = videos[video_id] = {'id': video_id, 'title': scan['titles'].get(video_id, ''), 'views': []}
+            downsampled['each_video'].append(video)
+        video['views'] = _append_downsampled_point(video['views'], v_datetime, view_count, point_budget)
+    total_views = downsampled['total_videos']
+    previous_total = total_views[-1]['view_count'] if total_views else None
+    downsampled['total_videos'] = _append_downsampled_point(total_views, v_datetime, scan['total'], point_budget)
+    downsampled['last_updated'] = v_datetime
+
+    # 集計版: 最新の期間の行を更新または追加し、直近 max_periods 期間より前の行を除く
+    order = {video_id: index for index, video_id in enumerate(videos)}
+    for period, max_periods in ROLLUP_PERIODS.items():
+        section = rollups[period]
+        key = _period_key(v_datetime, period)
+        rows_by_id = {video['id']: video for video in section['videos']}
+        for video_id, view_count in scan['views']:
+            video = rows_by_id.get(video_id)
+            if video is None:
+                video = rows_by_id[video_id] = {'id': video_id, 'title': videos[video_id]['title'], 'rows': []}
+            _append_rollup_row(video['rows'], key, view_count, previous_views.get(video_id))
+        _append_rollup_row(section['channel'], key, scan['total'], previous_total)
+        cutoff = _period_start_before(v_datetime, period, max_periods)
+        for video in rows_by_id.values():
+            video['rows'] = [row for row in video['rows'] if row[0] >= cutoff]
+        section['videos'] = sorted((video for video in rows_by_id.values() if video['rows']),
+                                   key=lambda video: order.get(video['id'], len(order)))
+        section['channel'] = [row for row in section['channel'] if row[0] >= cutoff]
+        section['top_movers'] = top_movers(section['videos'], top_count)
+    rollups['last_updated'] = v_datetime
+
+    downsampled_size = write_json_atomic(downsampled_file, downsampled, compact=True)
+    rollups_size = write_json_atomic(rollups_file, rollups, compact=True)
+    return downsampled_size, rollups_size
+
+
+def write_analytics_exports(history, point_budget=DEFAULT_POINT_BUDGET,
+                            downsampled_file=DOWNSAMPLED_FILE, rollups_file=ROLLUPS_FILE):
+    """
+    間引き版と集計版のファイルを書き出す
+
+    Args:
+        history (ViewHistory): 再生回数の履歴
+        point_budget (int): 間引き版の1系列あたりの最大点数
+        downsampled_file (str): 間引き版の出力ファイル
+        rollups_file (str): 集計版の出力ファイル
+    Returns:
+        tuple: (間引き版のバイト数, 集計版のバイト数)
+    """
+    downsampled_size = write_json_atomic(downsampled_file, build_downsampled(history, point_budget), compact=True)
+    rollups_size = write_json_atomic(rollups_file, build_rollups(history), compact=True)
+    return downsampled_size, rollups_size
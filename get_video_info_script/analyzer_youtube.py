@@ -1,19 +1,27 @@
 # docs/youtube.jsonを読み込み、再生回数などの推移を分析する
+# 再生回数の推移は追記型のストア(view_history_store.py)に保存し、
+# 間引き版・集計版のファイルは前回のファイルに今回のスキャンを追加して更新する
+# 全履歴の youtube_analyzed.json は、コンパクション時と --export-full 指定時のみストアから書き出す
 
 
 import os
 import json
+import argparse
 import datetime
 
+from json_writer import write_json_atomic
+from view_history_store import ViewHistoryStore, export_analyzed, STORE_DIR
+from analytics_export import update_analytics_exports, write_analytics_exports, DEFAULT_POINT_BUDGET
+
 src_json_file_path = '../docs/youtube.json'
 put_json_file_path = '../docs/youtube_analyzed.json'
 
 class YouTubeAnalyzer:
-    def __init__(self):
+    def __init__(self, store_dir=STORE_DIR):
         """
         初期化メソッド
         param:
-            json_file: str, 読み込むJSONファイルのパス
+            store_dir: str, 再生回数の推移のストアの保存先ディレクトリ
         """
         self.src_data = self.load_json_file(src_json_file_path)
         # {
@@ -28,7 +36,19 @@ class YouTubeAnalyzer:
         #     "last_updated": str,
         #     "total_videos": int,
         # }
-        self.analyzed_data = self.load_json_file(put_json_file_path)
+        self.store = ViewHistoryStore(store_dir)
+        # ストアが空で従来の youtube_analyzed.json がある場合は、ストアに取り込む（初回のみ）
+        if self.store.is_empty() and os.path.exists(put_json_file_path) and os.path.getsize(put_json_file_path) > 0:
+            self.migrate_analyzed_file(put_json_file_path)
+
+    def migrate_analyzed_file(self, json_file_path):
+        """
+        従来の youtube_analyzed.json をストアに取り込むメソッド
+        param:
+            json_file_path: str, youtube_analyzed.json のパス
+        """
+        with open(json_file_path, 'r', encoding='utf-8') as file:
+            analyzed_data = json.load(file)
         # {
         #     "each_video": [
         #         {
@@ -49,6 +69,8 @@ class YouTubeAnalyzer:
         #         },...
         #     ]
         # }
+        history = self.store.import_analyzed(analyzed_data)
+        print(f"📦 {json_file_path} をストアに取り込みました（動画 {len(history.videos)}件）")
 
     def load_json_file(self, json_file_path):
         """
@@ -84,88 +106,111 @@ class YouTubeAnalyzer:
         views_data = []
         for item in self.src_data.get('items', []):
             video_id = item.get('videoId', '')  # 'id' を 'videoId' に変更
-            views = item.get('view_count', 0)  # view_countフィールドがない場合は0
+            views = item.get('view_count') or 0  # view_countフィールドがない・nullの場合は0
             title = item.get('title', '')
             views_data.append({'id': video_id, 'views': views, 'title': title})
         return {'scan_datetime': scan_datetime, 'views_data': views_data}
     
     def put_analyzed_data(self):
         """
-        分析結果を整形してanalyzed_data[each_video]とanalyzed_data[total_videos]にアペンドするメソッド
+        分析結果をストアに1スキャン分追記するメソッド（履歴全体は読み書きしない）
+        return:
+            dict, 追記したスキャン {"v_datetime", "views": [[id, views]], "titles": {id: title}, "total"}、
+            追記しなかった場合None
         """
         analysis_result = self.analyze_views()
+        if not analysis_result or not analysis_result['scan_datetime']:
+            return None
+        scan_datetime_str = analysis_result['scan_datetime'].isoformat()
+        # view_countが0より大きい動画のみを対象にして総再生回数を計算
+        recorded = [view for view in analysis_result['views_data'] if view['views'] > 0]
+        total_view_count = sum(view['views'] for view in recorded)
+        # 同じ時間のv_datetimeが記録済みの場合は追加しない
+        if not self.store.append_scan(scan_datetime_str, analysis_result['views_data'], total_view_count):
+            return None
+        return {
+            'v_datetime': scan_datetime_str,
+            'views': [[view['id'], view['views']] for view in recorded],
+            'titles': {view['id']: view['title'] for view in recorded},
+            'total': total_view_count,
+        }
 
-        if 'each_video' not in self.analyzed_data:
-            self.analyzed_data['each_video'] = []                                                                    
-        # 各動画の情報取得日と再生回数を追加
-        if analysis_result and analysis_result['scan_datetime']:
-            scan_datetime_str = analysis_result['scan_datetime'].isoformat()
-            
-            # 各動画の処理
-            for view_data in analysis_result['views_data']:
-                video_id = view_data['id']
-                views = view_data.get('views', 0)  # viewsフィールドがない場合は0
-                # viewsが0の場合はスキップ
-                if views == 0:
-                    continue
-                title = view_data['title']
-                
-                # 既存の動画データを検索
-                existing_video = None
-                for video in self.analyzed_data['each_video']:
-                    if video.get('id') == video_id:
-                        existing_video = video
-                        break
-                
-                if existing_video:
-                    # 既存の動画の場合、同じ時間のv_datetimeが存在しない場合のみ追加
-                    if not any(v['v_datetime'] == scan_datetime_str for v in existing_video['views']):
-                        existing_video['views'].append({
-                            'v_datetime': scan_datetime_str,
-                            'view_count': views
-                        })
-                else:
-                    # 新しい動画の場合は追加
-                    self.analyzed_data['each_video'].append({
-                        'id': video_id,
-                        'title': title,
-                        'views': [{
-                            'v_datetime': scan_datetime_str,
-                            'view_count': views
-                        }]
-                    })
-            
-            # 総再生回数の情報を追加
-            # total_videosが存在しない場合は初期化
-            if 'total_videos' not in self.analyzed_data:
-                self.analyzed_data['total_videos'] = []
-            # 同じ時間のv_datetimeが存在する場合は追加しない
-            if not any(v['v_datetime'] == scan_datetime_str for v in self.analyzed_data['total_videos']):
-                # view_countが0より大きい動画のみを対象にして総再生回数を計算
-                total_view_count = sum(view['views'] for view in analysis_result['views_data'] if view['views'] > 0)
-                self.analyzed_data['total_videos'].append({
-                    'v_datetime': scan_datetime_str,
-                    'view_count': total_view_count
-                })
-            self.analyzed_data['last_updated'] = scan_datetime_str
+    def save_video_info(self, scan=None, previous_scan=None, force_compact=False, point_budget=DEFAULT_POINT_BUDGET,
+                        export_full=False):
+        """
+        間引き版・集計版のファイルを更新するメソッド
+        通常は前回のファイルに今回のスキャンを追加するだけで、ストアの履歴は読み込まない
+        コンパクションする場合・export_full の場合・前回のファイルが直前のスキャン時点のものでない場合は、
+        ストアを読み込んで全履歴から作り直す（全履歴の youtube_analyzed.json はコンパクション時と export_full の場合のみ）
+        param:
+            scan: dict, put_analyzed_data() で追記したスキャン（追記しなかった場合None）
+            previous_scan: str, 追記前のストアの最後のスキャン日時
+            force_compact: bool, セグメントファイルの数に関係なくコンパクションする場合True
+            point_budget: int, 間引き版の1系列あたりの最大点数
+            export_full: bool, 全履歴の youtube_analyzed.json を書き出す場合True
+        """
+        compacting = force_compact or self.store.needs_compaction()
+        if not compacting and not export_full:
+            if scan is None:
+                print("新しいスキャンがないため、間引き版・集計版は前回のままです")
+                return
+            sizes = update_analytics_exports(scan, previous_scan, point_budget)
+            if sizes is not None:
+                print(f"📈 間引き版 {sizes[0] / 1024:.0f}KB・集計版 {sizes[1] / 1024:.0f}KB に今回のスキャンを追加しました")
+                return
+            print("前回の間引き版・集計版が直前のスキャン時点のものではないため、全履歴から作り直します")
 
-    def save_video_info(self):
-        def convert_datetime(obj):
-            if isinstance(obj, datetime.datetime):
-                return obj.isoformat()  # datetime を ISO 8601 形式の文字列に変換
-            raise TypeError(f"Type {type(obj)} not serializable")
-        with open(put_json_file_path, 'w', encoding='utf-8') as file:
-            json.dump(self.analyzed_data, file, ensure_ascii=False, indent=4, default=convert_datetime)
+        history = self.store.load()
+        if compacting:
+            self.store.compact(history)
+            print("🗜 ストアをコンパクションしました")
+        if compacting or export_full:
+            # 一時ファイルに書き込んでから置き換える（書き込みに失敗しても前回のファイルが残る）
+            write_json_atomic(put_json_file_path, export_analyzed(history), compact=True)
+            print(f"📦 全履歴を {put_json_file_path} に書き出しました")
+        downsampled_size, rollups_size = write_analytics_exports(history, point_budget)
+        print(f"📈 間引き版 {downsampled_size / 1024:.0f}KB・集計版 {rollups_size / 1024:.0f}KB を書き出しました")
 
-    def main(self):
+    def main(self, export=True, force_compact=False, point_budget=DEFAULT_POINT_BUDGET, export_full=False):
         """
         メインメソッド
-        1. 再生回数の推移を分析
-        2. 分析結果を保存
+        1. 再生回数の推移を分析してストアに追記
+        2. 間引き版・集計版のファイルを更新する
+        param:
+            export: bool, 間引き版・集計版（と youtube_analyzed.json）を書き出す場合True
+            force_compact: bool, ストアを必ずコンパクションする場合True
+            point_budget: int, 間引き版の1系列あたりの最大点数
+            export_full: bool, 全履歴の youtube_analyzed.json を書き出す場合True
         """
-        self.put_analyzed_data()
-        self.save_video_info()
+        previous_scan = self.store.manifest['last_scan']
+        scan = self.put_analyzed_data()
+        if export:
+            self.save_video_info(scan, previous_scan, force_compact, point_budget, export_full)
+        elif force_compact:
+            self.store.compact()
+
+def parse_args():
+    """
+    コマンドライン引数を解析
+    return:
+        argparse.Namespace, 解析結果
+    """
+    parser = argparse.ArgumentParser(description="YouTube動画の再生回数の推移を分析")
+    parser.add_argument('--store-dir', default=STORE_DIR,
+                        help=f'再生回数の推移のストアの保存先（デフォルト: {STORE_DIR}）')
+    parser.add_argument('--compact', action='store_true',
+                        help='ストアのセグメントファイルをベースファイルにまとめる')
+    parser.add_argument('--no-export', action='store_true',
+                        help=f'{put_json_file_path} と間引き版・集計版を書き出さない')
+    parser.add_argument('--export-full', action='store_true',
+                        help=f'全履歴の {put_json_file_path} を書き出し、間引き版・集計版も全履歴から作り直す'
+                             '（コンパクション時は常に書き出す）')
+    parser.add_argument('--points', type=int, default=DEFAULT_POINT_BUDGET,
+                        help=f'間引き版の1系列あたりの最大点数 3以上（デフォルト: {DEFAULT_POINT_BUDGET}）')
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    analyzer = YouTubeAnalyzer()
-    analyzer.main()
\ No newline at end of file
+    args = parse_args()
+    analyzer = YouTubeAnalyzer(args.store_dir)
+    analyzer.main(export=not args.no_export, force_compact=args.compact, point_budget=max(args.points, 3),
+                  export_full=args.export_full)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+動画1件あたりの抽出オーバーヘッドを計測するマイクロベンチマーク
+python bench_extraction_session.py [--videos 50] [--init-ms 50]
+
+ネットワークに接続しないスタブのエクストラクタを使い、以下の2通りを比較します。
+    - per-video: 動画ごとに yt_dlp.YoutubeDL を作成する（従来の get_detailed_video_info の方式）
+    - session:   YoutubeExtractionSession を1つ作成して使い回す
+スタブの初期化処理(_real_initialize)では、プレイヤーJSの取得・解読に相当する待機を --init-ms で再現します。
+"""
+
+import argparse
+import time
+
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+
+from get_video_info_youtube import YoutubeExtractionSession, get_ydl_options
+
+
+class StubYoutubeIE(InfoExtractor):
+    """
+    ネットワークに接続せずに固定の動画情報を返すスタブのエクストラクタ
+    """
+    _VALID_URL = r'https?://stub\.invalid/watch\?v=(?P<id>[\w-]+)'
+    init_seconds = 0.0
+
+    def _real_initialize(self):
+        # プレイヤーJSの取得・解読などの初期化コストを再現
+        time.sleep(self.init_seconds)
+
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+        return {
+            'id': video_id,
+            'title': f'stub video {video_id}',
+            'url': f'https://stub.invalid/media/{video_id}.mp4',
+            'ext': 'mp4',
+            'duration': 3600,
+            'view_count': 1000,
+        }
+
+
+def bench_per_video(video_ids, ydl_opts):
+    """
+    動画ごとにYoutubeDLを作成して抽出する
+
+    Returns:
+        float: 所要時間(秒)
+    """
+    start = time.perf_counter()
+    for video_id in video_ids:
+        with yt_dlp.YoutubeDL({**ydl_opts, 'extract_flat': False}) as ydl:
+            ydl.add_info_extractor(StubYoutubeIE())
+            ydl.extract_info(f'https://stub.invalid/watch?v={video_id}', download=False, ie_key='StubYoutube')
+    return time.perf_counter() - start
+
+
+def bench_session(video_ids, ydl_opts):
+    """
+    1つのセッションを使い回して抽出する
+
+    Returns:
+        float: 所要時間(秒)
+    """
+    start = time.perf_counter()
+    with YoutubeExtractionSession(ydl_opts, [StubYoutubeIE()]) as session:
+        for video_id in video_ids:
+            session.extract(f'https://stub.invalid/watch?v={video_id}', ie_key='StubYoutube', extract_flat=False)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="抽出セッションの使い回しによるオーバーヘッド削減を計測")
+    parser.add_argument('--videos', type=int, default=50, help='抽出する動画数（デフォルト: 50）')
+    parser.add_argument('--init-ms', type=float, default=50, help='エクストラクタ初期化1回あたりのコスト ミリ秒（デフォルト: 50）')
+    args = parser.parse_args()
+
+    StubYoutubeIE.init_seconds = args.init_ms / 1000
+    ydl_opts = get_ydl_options()
+    video_ids = [f'stub{i:05d}' for i in range(args.videos)]
+
+    # 初回のインポート等のコストを除外するためのウォームアップ
+    bench_session(video_ids[:1], ydl_opts)
+
+    per_video = bench_per_video(video_ids, ydl_opts)
+    session = bench_session(video_ids, ydl_opts)
+
+    print(f"動画数: {args.videos}, 初期化コスト: {args.init_ms:.0f}ms")
+    print(f"per-video: 合計 {per_video:.3f}秒 / 1件あたり {per_video / args.videos * 1000:.2f}ms")
+    print(f"session:   合計 {session:.3f}秒 / 1件あたり {session / args.videos * 1000:.2f}ms")
+    print(f"高速化率: {per_video / session:.1f}倍")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+HTMLパーサーのバックエンドを比較するベンチマーク
+python bench_html_parsing.py [--repeat 50] [--list-html fixtures/niconico_live_list.html] [--timeshift-html fixtures/niconico_timeshift.html]
+
+保存済みのHTML(一覧ページ・番組ページ)を、以下の方式でそれぞれ repeat 回パースして比較します。
+    - baseline: 従来の方式（BeautifulSoup(html.parser)でページ全体をパースし、ラムダ・正規表現で検索）
+    - bs4:      html_parsing.SoupNiconicoParser（SoupStrainerで必要なタグだけをパース）
+    - lxml:     html_parsing.LxmlNiconicoParser（事前にコンパイルしたXPath）
+実際のページで計測する場合は、ブラウザ等で保存したHTMLを --list-html / --timeshift-html に指定してください。
+"""
+
+import argparse
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from html_parsing import PAGE_NUMBER_PATTERN, available_backends, get_parser
+
+# 設定
+LIST_HTML = "./fixtures/niconico_live_list.html"
+TIMESHIFT_HTML = "./fixtures/niconico_timeshift.html"
+
+
+class BaselineParser:
+    """
+    従来の get_video_info_niconico_live.py と同じ方式のパーサー（比較用）
+    """
+    name = "baseline"
+
+    def parse_list_page(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        items = []
+        for section in soup.find_all('section', class_=lambda x: x and 'sub' in x and 'past' in x):
+            for element in section.find_all('div', class_='item'):
+                title_element = element.find('h3') or element.find('h2') or element.find('a', class_=re.compile(r'.*title.*'))
+                link_element = element.find('a', href=re.compile(r'/watch/'))
+                img_element = element.find('img')
+                date_element = element.find('p', class_='date')
+                items.append({
+                    'title': title_element.get_text(strip=True) if title_element else None,
+                    'href': link_element.get('href') if link_element else None,
+                    'image_src': (img_element.get('src') or img_element.get('data-src')) if img_element else None,
+                    'date_text': date_element.get_text(strip=True) if date_element else None,
+                })
+        page_numbers = set()
+        pagination = soup.find('ul', class_='pagination')
+        page_links = pagination.find_all('a') if pagination else []
+        page_links.extend(soup.find_all('a', string=re.compile(r'最後')))
+        for link in page_links:
+            match = PAGE_NUMBER_PATTERN.search(link.get('href', ''))
+            if match:
+                page_numbers.add(int(match.group(1)))
+        return items, page_numbers
+
+    def parse_timeshift_deadline(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        labels = soup.find_all('dt', string=re.compile(r'タイムシフト視聴期限：'))
+        return labels[0].find_next('dd').get_text(strip=True) if labels else None
+
+
+def bench(parse, html, repeat):
+    """
+    パース処理を repeat 回実行
+
+    Returns:
+        tuple: (1回あたりの所要時間(ミリ秒), 最後の結果)
+    """
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = parse(html)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTMLパーサーのバックエンドを比較")
+    parser.add_argument('--repeat', type=int, default=50, help='パースの繰り返し回数（デフォルト: 50）')
+    parser.add_argument('--list-html', default=LIST_HTML, help=f'一覧ページのHTML（デフォルト: {LIST_HTML}）')
+    parser.add_argument('--timeshift-html', default=TIMESHIFT_HTML, help=f'番組ページのHTML（デフォルト: {TIMESHIFT_HTML}）')
+    args = parser.parse_args()
+
+    with open(args.list_html, 'r', encoding='utf-8') as f:
+        list_html = f.read()
+    with open(args.timeshift_html, 'r', encoding='utf-8') as f:
+        timeshift_html = f.read()
+
+    parsers = [BaselineParser()] + [get_parser(name) for name in available_backends()]
+    print(f"一覧ページ: {args.list_html} ({len(list_html.encode('utf-8')) / 1024:.0f}KB)")
+    print(f"番組ページ: {args.timeshift_html} ({len(timeshift_html.encode('utf-8')) / 1024:.0f}KB)")
+    print(f"繰り返し回数: {args.repeat}\n")
+
+    baseline_times = None
+    expected = None
+    for p in parsers:
+        list_ms, list_result = bench(p.parse_list_page, list_html, args.repeat)
+        timeshift_ms, timeshift_result = bench(p.parse_timeshift_deadline, timeshift_html, args.repeat)
+        if expected is None:
+            expected = (list_result, timeshift_result)
+            baseline_times = (list_ms, timeshift_ms)
+        match = "✅" if (list_result, timeshift_result) == expected else "❌ 結果が baseline と異なります"
+        print(f"{p.name:9s} 一覧 {list_ms:7.2f}ms ({baseline_times[0] / list_ms:4.1f}倍)  "
+              f"番組 {timeshift_ms:7.2f}ms ({baseline_times[1] / timeshift_ms:4.1f}倍)  "
+              f"動画アイテム {len(list_result[0])}個 {match}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+詳細情報の取得のスループットをリクエスト間隔の制御方式ごとに比較するベンチマーク（ローカルのHTTPサーバーのみ使用）
+python bench_request_pacing.py [--videos 40] [--requests-per-video 3] [--latency-ms 300] [--workers 4] [--rate 4.0]
+
+応答に --latency-ms かかるローカルのHTTPサーバーを起動し、動画1件につき --requests-per-video 回
+（動画ページ・プレイヤーAPIなどに相当）リクエストするスタブのエクストラクタで、以下を比較します。
+    - baseline:    従来どおり1件ずつ順に取得（download=Falseではsleep_intervalは適用されないため待機なし）
+    - per-video:   ワーカープールで、動画1件ごとに 0.2 回/秒 のレートリミッターを取得（以前の既定値）
+    - per-request: ワーカープールで、HTTPリクエストごとに --rate 回/秒 のレートリミッターを取得（YoutubeExtractionSession）
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from yt_dlp.extractor.common import InfoExtractor
+
+from get_video_info_youtube import MAX_WORKERS, REQUEST_RATE, WorkerSessionPool, get_ydl_options
+from rate_limiter import TokenBucketRateLimiter
+
+# 設定
+# 以前の既定値（動画1件ごとに取得していたレートリミッターの回/秒）
+PER_VIDEO_RATE = 0.2
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """
+    latency 秒待ってから小さなHTMLを返すハンドラ
+    """
+    latency = 0.0
+    count = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        with SlowHandler.lock:
+            SlowHandler.count += 1
+        body = b'<html><body>ok</body></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalPagesIE(InfoExtractor):
+    """
+    動画1件につき requests_per_video 回ローカルのHTTPサーバーにリクエストするスタブのエクストラクタ
+    """
+    _VALID_URL = r'http://127\.0\.0\.1:\d+/watch\?v=(?P<id>[\w-]+)'
+    requests_per_video = 3
+
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+        base = url.split('/watch')[0]
+        for index in range(self.requests_per_video):
+            self._download_webpage(f'{base}/page/{video_id}/{index}', video_id, note=False)
+        return {'id': video_id, 'title': f'local video {video_id}', 'url': f'{base}/media/{video_id}.mp4', 'ext': 'mp4'}
+
+
+def run(video_urls, workers, rate_limiter=None, per_video_limiter=None):
+    """
+    Returns:
+        float: 所要時間(秒)
+    """
+    ydl_opts = {**get_ydl_options(), 'extract_flat': False, 'proxy': ''}
+    session_pool = WorkerSessionPool(ydl_opts, [LocalPagesIE], rate_limiter)
+
+    def extract(url):
+        if per_video_limiter is not None:
+            per_video_limiter.acquire()
+        return session_pool.get().extract(url, ie_key=LocalPagesIE.ie_key())
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(extract, video_urls))
+    finally:
+        session_pool.close()
+    elapsed = time.perf_counter() - start
+    if any(result is None for result in results):
+        raise RuntimeError("スタブのエクストラクタで取得に失敗しました")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="リクエスト間隔の制御方式ごとのスループットを計測")
+    parser.add_argument('--videos', type=int, default=40, help='取得する動画数（デフォルト: 40）')
+    parser.add_argument('--requests-per-video', type=int, default=3, help='動画1件あたりのリクエスト数（デフォルト: 3）')
+    parser.add_argument('--latency-ms', type=float, default=300, help='1リクエストの応答時間 ミリ秒（デフォルト: 300）')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help=f'ワーカー数（デフォルト: {MAX_WORKERS}）')
+    parser.add_argument('--rate', type=float, default=REQUEST_RATE,
+                        help=f'per-request のリクエスト数の上限 回/秒（デフォルト: {REQUEST_RATE}）')
+    args = parser.parse_args()
+
+    SlowHandler.latency = args.latency_ms / 1000
+    LocalPagesIE.requests_per_video = args.requests_per_video
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    video_urls = [f'http://127.0.0.1:{port}/watch?v=v{index}' for index in range(args.videos)]
+    print(f"🎬 動画 {args.videos} 件 × {args.requests_per_video} リクエスト（応答 {args.latency_ms:g}ms）")
+
+    try:
+        cases = [
+            ('baseline', 1, None, None),
+            ('per-video', args.workers, None, TokenBucketRateLimiter(PER_VIDEO_RATE)),
+            ('per-request', args.workers, TokenBucketRateLimiter(args.rate), None),
+        ]
+        for label, workers, rate_limiter, per_video_limiter in cases:
+            SlowHandler.count = 0
+            elapsed = run(video_urls, workers, rate_limiter, per_video_limiter)
+            print(f"  {label:11s} {elapsed:7.2f}秒  {args.videos / elapsed:5.2f} 件/秒  "
+                  f"{SlowHandler.count / elapsed:5.2f} リクエスト/秒（ワーカー {workers}）")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
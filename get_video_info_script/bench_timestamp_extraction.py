@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+コメントからのタイムスタンプ抽出を比較するベンチマーク（ネットワーク不要）
+python bench_timestamp_extraction.py [--comments 50000] [--repeat 5] [--seed 0]
+
+配信のコメントに似た合成コメントを comments 件作成し、以下の方式でそれぞれ repeat 回抽出して比較します。
+    - baseline:  従来の extract_timestamps_from_comments()（投稿者のコメント本文をリスト化し、
+                 行ごとにコンパイルしていない '.*[0-9]{1,2}:[0-9]{2}.*' で照合）
+    - streaming: get_video_info_youtube.iter_timestamp_lines()（コメントを1件ずつ処理し、事前にコンパイルしたパターンで検索）
+    - entries:   get_video_info_youtube.extract_timestamps_from_comments()（streaming に加えて {seconds, label} も作成）
+結果（タイムスタンプの行）が一致するかも確認します。
+"""
+
+import argparse
+import random
+import re
+import time
+
+from get_video_info_youtube import TIMESTAMP_AUTHOR_PREFIX, extract_timestamps_from_comments, iter_timestamp_lines
+
+# 設定
+# 投稿者のコメントのうち、タイムスタンプ（STARTから始まる）を含むコメントの割合
+TIMESTAMP_COMMENT_RATIO = 0.3
+# 1件のタイムスタンプコメントに含める行数
+TIMESTAMP_LINES = 40
+
+
+def baseline_extract(video_info):
+    """
+    従来の extract_timestamps_from_comments()（比較用）
+    """
+    raw_az_texts = [
+        comment['text'] for comment in video_info.get('comments') or []
+        if 'author' in comment and comment['author'].startswith(TIMESTAMP_AUTHOR_PREFIX)
+    ]
+    timestamps = []
+    for raw_az_text in raw_az_texts:
+        rn_az_texts = raw_az_text.splitlines()
+        rn_az_texts = [text for text in rn_az_texts if re.match(r'.*[0-9]{1,2}:[0-9]{2}.*', text)]
+        if not rn_az_texts or not re.match(r'.*[0-9]{1,2}:[0-9]{2}.*START.*', rn_az_texts[0]):
+            continue
+        timestamps.extend(rn_az_texts)
+    return timestamps
+
+
+def streaming_extract(video_info):
+    """
+    タイムスタンプの行のみを抽出（{seconds, label}は作成しない）
+    """
+    return [line for line, _ in iter_timestamp_lines(video_info['comments'])]
+
+
+def create_timestamp_text(rng):
+    """
+    タイムスタンプコメントの本文
+    """
+    lines = ["タイムスタンプです！", "", "0:00:00 START"]
+    seconds = 0
+    for index in range(TIMESTAMP_LINES):
+        seconds += rng.randint(30, 600)
+        hours, rest = divmod(seconds, 3600)
+        time_text = f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60}:{rest % 60:02d}"
+        lines.append(f"{time_text} 話題その{index + 1} {'ｗ' * rng.randint(0, 5)}")
+    lines.append("")
+    lines.append("お疲れさまでした！")
+    return "\n".join(lines)
+
+
+def create_comments(count, rng):
+    """
+    合成コメントを作成
+    投稿者のコメントは約1%で、そのうち TIMESTAMP_COMMENT_RATIO の割合がタイムスタンプコメント、
+    残りは時刻を含むがSTARTで始まらない雑談（スキップされる）
+    """
+    comments = []
+    for index in range(count):
+        roll = rng.random()
+        if roll < 0.01:
+            author = TIMESTAMP_AUTHOR_PREFIX
+            if rng.random() < TIMESTAMP_COMMENT_RATIO:
+                text = create_timestamp_text(rng)
+            else:
+                text = f"{rng.randint(0, 59)}:{rng.randint(0, 59):02d} ここ好き\n{'最高でした' * rng.randint(1, 20)}"
+        else:
+            author = f"@viewer{rng.randint(0, 9999)}"
+            # 視聴者の時刻を含むコメント（投稿者が異なるため本文は見ずに除外される）
+            text = "\n".join(f"{rng.randint(0, 3)}:{rng.randint(0, 59):02d} {'かわいい' * rng.randint(1, 30)}"
+                             for _ in range(rng.randint(1, 6)))
+        comments.append({'id': str(index), 'author': author, 'text': text, 'parent': 'root'})
+    return comments
+
+
+def measure(extract, video_info, repeat):
+    """
+    Returns:
+        tuple: (1回あたりの秒数の最小値, 抽出したタイムスタンプの行のリスト)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract(video_info)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="タイムスタンプ抽出のベンチマーク")
+    parser.add_argument('--comments', type=int, default=50000, help="合成コメントの件数（デフォルト: 50000）")
+    parser.add_argument('--repeat', type=int, default=5, help="計測の繰り返し回数（デフォルト: 5）")
+    parser.add_argument('--seed', type=int, default=0, help="乱数のシード（デフォルト: 0）")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    video_info = {'comments': create_comments(args.comments, rng)}
+    print(f"💬 合成コメント {args.comments} 件")
+
+    baseline_time, baseline_result = measure(baseline_extract, video_info, args.repeat)
+    print(f"  baseline  {baseline_time * 1000:9.2f}ms  {len(baseline_result)} 行")
+
+    streaming_time, streaming_result = measure(streaming_extract, video_info, args.repeat)
+    print(f"  streaming {streaming_time * 1000:9.2f}ms  {len(streaming_result)} 行")
+
+    entries_time, (timestamps, entries) = measure(extract_timestamps_from_comments, video_info, args.repeat)
+    print(f"  entries   {entries_time * 1000:9.2f}ms  {len(timestamps)} 行（{{seconds, label}} {len(entries)} 件）")
+
+    if streaming_result == baseline_result and timestamps == baseline_result:
+        print(f"✅ 結果は一致しました（streaming は baseline の {baseline_time / streaming_time:.1f}倍）")
+    else:
+        print("❌ 結果が一致しません")
+
+
+if __name__ == "__main__":
+    main()
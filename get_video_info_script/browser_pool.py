@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+ヘッドレスブラウザのプール
+Seleniumのヘッドレスブラウザを1回の実行につき最大N個だけ起動し、すべての呼び出しで使い回します。
+
+    - ChromeDriverのパス解決(ChromeDriverManager().install())は1回の実行につき1回のみ
+    - 画像・CSS・フォント・動画などの読み込みをブロックしてページの読み込みを高速化
+    - 終了時(close()またはプロセス終了時)にすべてのブラウザを終了
+"""
+
+import atexit
+import functools
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+# 設定
+# 読み込みをブロックするURLパターン
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.css", "*.woff", "*.woff2", "*.ttf",
+    "*.mp4", "*.webm", "*.m4a", "*.m3u8",
+    "*googlevideo.com*", "*i.ytimg.com*", "*yt3.ggpht.com*",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def get_chromedriver_path():
+    """
+    ChromeDriverのパスを取得（初回のみダウンロード・解決し、以降はキャッシュを返す）
+
+    Returns:
+        str: ChromeDriverのパス
+    """
+    return ChromeDriverManager().install()
+
+
+def create_headless_options():
+    """
+    ヘッドレスブラウザの起動オプションを作成
+
+    Returns:
+        Options: Chromeの起動オプション
+    """
+    options = Options()
+    options.add_argument("--headless")  # ヘッドレスモードを使用
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--mute-audio")
+    options.add_argument("--autoplay-policy=user-gesture-required")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+    })
+    # DOMの構築が完了した時点でページの読み込みを完了とみなす
+    options.page_load_strategy = "eager"
+    return options
+
+
+class HeadlessBrowserPool:
+    """
+    ヘッドレスブラウザのプール（スレッドセーフ）
+
+    acquire() でブラウザを借り、with ブロックを抜けるとプールに返却されます。
+    ブラウザは必要になった時点で最大 size 個まで起動されます。
+    """
+
+    def __init__(self, size=2):
+        """
+        Args:
+            size (int): 同時に起動するブラウザの最大数
+        """
+        self.size = size
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.started_count = 0
+        atexit.register(self.close)
+
+    def _create_driver(self):
+        """
+        ブラウザを起動
+
+        Returns:
+            webdriver.Chrome: 起動したブラウザ
+        """
+        driver = webdriver.Chrome(service=Service(get_chromedriver_path()), options=create_headless_options())
+        # 画像・CSS・動画などのリクエストをブロック
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        return driver
+
+    def _discard(self, driver):
+        """
+        異常が発生したブラウザをプールから取り除いて終了
+        """
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    @contextmanager
+    def acquire(self):
+        """
+        プールからブラウザを借りる（空きがなく上限に達している場合は返却を待つ）
+
+        Yields:
+            webdriver.Chrome: ブラウザ
+        """
+        driver = None
+        while driver is None:
+            if self._closed:
+                raise RuntimeError("ブラウザプールは終了しています")
+            try:
+                driver = self._idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+            with self._lock:
+                can_start = len(self._drivers) < self.size
+                if can_start:
+                    # 起動中の枠を確保（起動に失敗した場合は解放する）
+                    self._drivers.append(None)
+            if can_start:
+                try:
+                    driver = self._create_driver()
+                except BaseException:
+                    with self._lock:
+                        self._drivers.remove(None)
+                    raise
+                with self._lock:
+                    self._drivers[self._drivers.index(None)] = driver
+                    self.started_count += 1
+                break
+            # 上限に達している場合は返却を待つ（破棄されて枠が空いた場合に備えて定期的に再確認）
+            try:
+                driver = self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            # ブラウザがクラッシュしている可能性があるため破棄し、次回は新しく起動する
+            broken = True
+            raise
+        finally:
+            if broken:
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+
+    def close(self):
+        """
+        すべてのブラウザを終了
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            drivers = [driver for driver in self._drivers if driver is not None]
+            self._drivers = []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+python build_calendar_index.py [--split-months]
+カレンダーページ(docs/calendar)用の配信日ごとの索引を作成
+YouTube・ニコニコ生放送・ファンクラブの出力ファイルを読み込み、配信日(broadcast_day)ごとにまとめて
+重複を除き、並べ替えた1つの小さなファイルを書き出します。カレンダーページはこのファイルだけを読み込みます。
+
+    - 配信日は日本時間で、4時より前に始まった配信は前日扱い（typed_fields.BROADCAST_DAY_START_HOUR）
+    - broadcast_day がない古いアイテムは upload_date から求める（start_epoch はYouTubeのみ）
+    - 同じ取得元・同じURLのアイテムは1つにまとめる
+    - 各日のイベントは開始日時の昇順
+    - --split-months を指定すると月ごとのファイル(MONTH_DIR/YYYY-MM.json)に分け、
+      INDEX_FILE には月の一覧のみを書き込む（カレンダーは表示中の月のファイルのみ読み込む）
+
+予定（外部API）は変化が早いため、従来どおりカレンダーページが直接取得します。
+"""
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+
+from json_writer import write_json_atomic
+from typed_fields import build_typed_fields
+from video_item import VideoItem
+
+# 設定
+# 索引に含める取得元（type: カレンダーでの種類, file: 出力ファイル）
+CALENDAR_SOURCES = [
+    {'type': 'youtube', 'file': '../docs/youtube.json'},
+    {'type': 'niconico', 'file': '../docs/niconico_l.json'},
+    {'type': 'fciu', 'file': '../docs/fciu.json'},
+]
+# 索引ファイル
+INDEX_FILE = "../docs/calendar_index.json"
+# 月ごとのファイルの保存先ディレクトリ（--split-months）
+MONTH_DIR = "../docs/calendar_index"
+# 月ごとのファイルに分ける場合True（--split-months で上書き可能）
+SPLIT_BY_MONTH = False
+
+INDEX_VERSION = 1
+
+
+def load_items(path):
+    """
+    出力ファイルのアイテムを読み込む
+
+    Args:
+        path (str): 出力ファイルのパス
+    Returns:
+        list: VideoItem のリスト（ファイルがない・読み込めない場合は空）
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"⚠️ {path} が見つかりません。スキップします")
+        return []
+    except json.JSONDecodeError as e:
+        print(f"⚠️ {path} の読み込みに失敗しました（{e}）。スキップします")
+        return []
+    return [VideoItem.from_dict(item) for item in data.get('items', [])]
+
+
+def get_start(item):
+    """
+    アイテムの開始日時(UNIX時間)と配信日(YYYY-MM-DD)
+
+    Args:
+        item (VideoItem): 動画情報
+    Returns:
+        tuple: (start_epoch, broadcast_day)、求められない値はNone
+    """
+    if item.broadcast_day:
+        return item.start_epoch, item.broadcast_day
+    upload_date = item.upload_date or ''
+    # ニコニコ生放送・ファンクラブの upload_date（YYYY/MM/DD）は4時より前を前日扱いにした日付（時刻なし）
+    if len(upload_date) == 10 and upload_date[4] == '/' and upload_date[7] == '/':
+        return None, upload_date.replace('/', '-')
+    # YouTubeの upload_date は日本時間のISO形式の日時
+    typed = build_typed_fields(upload_date)
+    return typed['start_epoch'], typed['broadcast_day']
+
+
+def to_event(item, event_type, start_epoch):
+    """
+    アイテムをカレンダーのイベントに変換
+
+    Args:
+        item (VideoItem): 動画情報
+        event_type (str): カレンダーでの種類
+        start_epoch (int): 開始日時（get_start() の結果）
+    Returns:
+        dict: {"type", "title", "url", "thumbnail", "date", "start_epoch"(, "description")}
+    """
+    event = {
+        'type': event_type,
+        'title': item.title,
+        'url': item.video_url,
+        'thumbnail': item.image,
+        'date': item.upload_date,
+        'start_epoch': start_epoch,
+    }
+    if item.description:
+        event['description'] = item.description
+    return event
+
+
+def _event_sort_key(event):
+    # 開始日時が不明なイベントはその日の最後
+    start_epoch = event['start_epoch']
+    return (start_epoch is None, start_epoch or 0, event['type'], event['title'] or '')
+
+
+def build_days(sources=CALENDAR_SOURCES):
+    """
+    配信日ごとのイベントを作成
+
+    Args:
+        sources (list): CALENDAR_SOURCES の形式の取得元のリスト
+    Returns:
+        tuple: ({配信日: [イベント, ...]}（配信日の昇順・各日は開始日時の昇順）, 重複で除いた件数, 配信日が不明な件数)
+    """
+    days = {}
+    seen = set()
+    duplicates = 0
+    undated = 0
+    for source in sources:
+        for item in load_items(source['file']):
+            key = (source['type'], item.video_url or item.title)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            start_epoch, day = get_start(item)
+            if day is None:
+                undated += 1
+                continue
+            days.setdefault(day, []).append(to_event(item, source['type'], start_epoch))
+    for events in days.values():
+        events.sort(key=_event_sort_key)
+    return dict(sorted(days.items())), duplicates, undated
+
+
+def split_by_month(days):
+    """
+    配信日ごとのイベントを月ごとに分ける
+
+    Args:
+        days (dict): build_days() の結果
+    Returns:
+        dict: {"YYYY-MM": {配信日: [イベント, ...]}}
+    """
+    months = {}
+    for day, events in days.items():
+        months.setdefault(day[:7], {})[day] = events
+    return months
+
+
+def write_calendar_index(index_file=INDEX_FILE, month_dir=MONTH_DIR, split=SPLIT_BY_MONTH, sources=CALENDAR_SOURCES):
+    """
+    カレンダーの索引を書き出す
+
+    Args:
+        index_file (str): 索引ファイル
+        month_dir (str): 月ごとのファイルの保存先ディレクトリ
+        split (bool): 月ごとのファイルに分ける場合True
+        sources (list): 取得元のリスト
+    Returns:
+        dict: {"days": 配信日の数, "events": イベントの数, "bytes": 書き込んだバイト数の合計}
+    """
+    days, duplicates, undated = build_days(sources)
+    months = split_by_month(days)
+    index = {
+        'version': INDEX_VERSION,
+        'split': split,
+        'months': list(months),
+        'last_updated': datetime.now().isoformat(),
+    }
+    total_bytes = 0
+    month_path = Path(month_dir)
+    if split:
+        # 月ごとのファイルのパスは索引ファイルからの相対パスで記録する
+        relative_dir = Path(month_dir).resolve().relative_to(Path(index_file).resolve().parent).as_posix()
+        index['month_files'] = {month: f"{relative_dir}/{month}.json" for month in months}
+        month_path.mkdir(parents=True, exist_ok=True)
+        for month, month_days in months.items():
+            total_bytes += write_json_atomic(month_path / f"{month}.json", {'month': month, 'days': month_days},
+                                             compact=True)
+    else:
+        index['days'] = days
+    # 今回の索引に含まれない月のファイル（分けない場合はすべて）を削除
+    if month_path.is_dir():
+        for path in month_path.glob('*.json'):
+            if not split or path.stem not in months:
+                path.unlink()
+    total_bytes += write_json_atomic(index_file, index, compact=True)
+
+    events = sum(len(events) for events in days.values())
+    if duplicates:
+        print(f"♻ 重複したアイテム {duplicates} 件を除きました")
+    if undated:
+        print(f"⚠️ 配信日が不明なアイテム {undated} 件は索引に含めません")
+    return {'days': len(days), 'events': events, 'bytes': total_bytes}
+
+
+def parse_args():
+    """
+    コマンドライン引数を解析
+
+    Returns:
+        argparse.Namespace: 解析結果
+    """
+    parser = argparse.ArgumentParser(description="カレンダーページ用の配信日ごとの索引を作成")
+    parser.add_argument('--split-months', action='store_true', default=SPLIT_BY_MONTH,
+                        help=f'月ごとのファイル（{MONTH_DIR}/YYYY-MM.json）に分ける')
+    parser.add_argument('--output', default=INDEX_FILE,
+                        help=f'索引ファイルのパス（デフォルト: {INDEX_FILE}）')
+    parser.add_argument('--month-dir', default=MONTH_DIR,
+                        help=f'月ごとのファイルの保存先（デフォルト: {MONTH_DIR}）')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    result = write_calendar_index(args.output, args.month_dir, args.split_months)
+    print(f"📅 カレンダーの索引を書き出しました: {result['days']} 日・{result['events']} 件（{result['bytes'] / 1024:.1f}KB）")
+
+
+if __name__ == "__main__":
+    main()
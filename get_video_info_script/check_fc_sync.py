@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+ファンクラブ動画情報の取得を偽APIサーバーで確認するスクリプト（ネットワーク不要）
+python check_fc_sync.py [--archive 95] [--max-per-page 50] [--new 5]
+
+fake_fc_api_server.FakeFCApiServer を起動し、FCVideoInfoExtractor.get_api_all_video_info を以下の順に実行して、
+取得件数・順序・リクエスト数・差分同期の状態を確認します。1つでも失敗した場合は終了コード1で終了します。
+    - full:      前回の出力なしで、過去の配信をすべて取得（ページサイズは大きい順に試す）
+    - preferred: 前回受け付けられたページサイズを指定して、ページサイズを試さずにすべて取得
+    - delta:     新しい過去の配信を追加し、前回の出力とハイウォーターマークを指定して差分同期
+"""
+
+import argparse
+import math
+import sys
+
+from fake_fc_api_server import FakeFCApiServer, create_fake_item
+from get_video_info_fc import FC_DELTA_LIVE_TYPE, FC_LIVE_TYPES, FC_PAGE_SIZE_CANDIDATES, FCVideoInfoExtractor
+
+
+def content_codes(videos):
+    """
+    動画情報のリストからcontent_codeのリストを作成
+
+    Args:
+        videos (list): 動画情報(VideoItem)のリスト
+    Returns:
+        list: content_codeのリスト(順序を保持)
+    """
+    return [FCVideoInfoExtractor._get_content_code(video) for video in videos]
+
+
+def expected_codes(server):
+    """
+    偽サーバーのアイテムから、取得結果として期待するcontent_codeのリストを作成
+
+    Args:
+        server (FakeFCApiServer): 偽サーバー
+    Returns:
+        list: content_codeのリスト(live_type順・新しい順)
+    """
+    return [item['content_code'] for live_type in FC_LIVE_TYPES for item in server.items[live_type]]
+
+
+def check(label, condition, detail):
+    """
+    確認結果を表示
+
+    Args:
+        label (str): 確認の名前
+        condition (bool): 確認結果
+        detail (str): 表示する内容
+    Returns:
+        bool: condition
+    """
+    print(f"  {'✅' if condition else '❌'} {label}: {detail}")
+    return condition
+
+
+def run(server, previous_videos=None, high_water_mark=None, preferred_page_size=None):
+    """
+    偽サーバーに対して get_api_all_video_info を実行
+
+    Returns:
+        tuple: (FCVideoInfoExtractor, このときのリクエスト数)
+    """
+    extractor = FCVideoInfoExtractor(api_base_url=server.api_base_url, preferred_page_size=preferred_page_size)
+    before = server.request_count
+    extractor.get_api_all_video_info(previous_videos, high_water_mark)
+    return extractor, server.request_count - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ファンクラブ動画情報の取得を偽APIサーバーで確認")
+    parser.add_argument('--archive', type=int, default=95, help='過去の配信の件数（デフォルト: 95）')
+    parser.add_argument('--max-per-page', type=int, default=50, help='偽サーバーが受け付ける1ページあたりの最大件数（デフォルト: 50）')
+    parser.add_argument('--new', type=int, default=5, help='差分同期の前に追加する過去の配信の件数（デフォルト: 5）')
+    args = parser.parse_args()
+
+    accepted = max(size for size in FC_PAGE_SIZE_CANDIDATES if size <= args.max_per_page)
+    probes = FC_PAGE_SIZE_CANDIDATES.index(accepted)
+    ok = True
+
+    with FakeFCApiServer(archive_count=args.archive, max_per_page=args.max_per_page) as server:
+        pages = sum(max(1, math.ceil(len(server.items[live_type]) / accepted)) for live_type in FC_LIVE_TYPES)
+
+        print("🧪 full")
+        full, requests = run(server)
+        ok &= check("取得結果", content_codes(full.all_videos) == expected_codes(server), f"{len(full.all_videos)} 件")
+        ok &= check("ページサイズ", full.page_size == accepted, f"{full.page_size}（期待値 {accepted}）")
+        ok &= check("リクエスト数", requests == probes + pages, f"{requests}（期待値 {probes + pages}）")
+        ok &= check("フルスイープ", full.full_sweep_done, str(full.full_sweep_done))
+        newest = server.items[FC_DELTA_LIVE_TYPE][0]['content_code']
+        ok &= check("ハイウォーターマーク", full.high_water_mark['content_code'] == newest, full.high_water_mark['content_code'])
+
+        print("🧪 preferred")
+        preferred, requests = run(server, preferred_page_size=full.page_size)
+        ok &= check("取得結果", content_codes(preferred.all_videos) == expected_codes(server), f"{len(preferred.all_videos)} 件")
+        ok &= check("リクエスト数", requests == pages, f"{requests}（期待値 {pages}、ページサイズの試行なし）")
+
+        print("🧪 delta")
+        # 最新の配信より新しい過去の配信を追加（負の番号ほど新しい）
+        new_items = [create_fake_item(FC_DELTA_LIVE_TYPE, -index) for index in range(args.new, 0, -1)]
+        server.items[FC_DELTA_LIVE_TYPE] = new_items + server.items[FC_DELTA_LIVE_TYPE]
+        delta, requests = run(server, full.all_videos, full.high_water_mark, full.page_size)
+        other_pages = sum(max(1, math.ceil(len(server.items[live_type]) / accepted))
+                          for live_type in FC_LIVE_TYPES if live_type != FC_DELTA_LIVE_TYPE)
+        delta_pages = args.new // accepted + 1
+        ok &= check("取得結果", content_codes(delta.all_videos) == expected_codes(server), f"{len(delta.all_videos)} 件")
+        ok &= check("リクエスト数", requests == other_pages + delta_pages,
+                    f"{requests}（期待値 {other_pages + delta_pages}、過去の配信は {delta_pages} ページのみ）")
+        ok &= check("フルスイープ", not delta.full_sweep_done, str(delta.full_sweep_done))
+        ok &= check("ハイウォーターマーク", delta.high_water_mark['content_code'] == new_items[0]['content_code'],
+                    delta.high_water_mark['content_code'])
+
+    if not ok:
+        print("❌ 確認に失敗しました")
+        sys.exit(1)
+    print("🎉 すべての確認に成功しました")
+
+
+if __name__ == "__main__":
+    main()
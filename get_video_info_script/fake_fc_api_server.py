@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+ファンクラブ動画情報APIのローカル偽サーバー（テスト用）
+python fake_fc_api_server.py [--port 8765] [--archive 95] [--max-per-page 50]
+
+本物のAPIと同じ形式({"data": {"video_pages": {"list": [...], "total": N}}})で、
+ダミーの動画アイテムを返します。get_video_info_fc.py の --api-base-url に指定して使用します。
+
+    python get_video_info_fc.py --api-base-url "http://127.0.0.1:8765/live_pages?page=\$2&live_type=\$1&per_page=\$3"
+
+スクリプトから使用する場合は、コンテキストマネージャとして起動できます。
+
+    with FakeFCApiServer(archive_count=95) as server:
+        extractor = FCVideoInfoExtractor(api_base_url=server.api_base_url)
+"""
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 設定
+DEFAULT_PORT = 8765
+# live_typeごとのデフォルトの件数(1: 配信中, 2: 放送予定, 3: 過去の配信)
+DEFAULT_LIVE_COUNT = 1
+DEFAULT_SCHEDULE_COUNT = 3
+DEFAULT_ARCHIVE_COUNT = 95
+# 受け付ける1ページあたりの最大件数(これを超えると400を返す)
+DEFAULT_MAX_PER_PAGE = 50
+
+
+def create_fake_item(live_type, index):
+    """
+    ダミーの動画アイテムを作成
+
+    Args:
+        live_type (int): live_type
+        index (int): live_type内での番号(0が最新)
+    Returns:
+        dict: 動画アイテム
+    """
+    started_at = datetime(2025, 8, 10, 12, 0, 0) - timedelta(days=index)
+    finished_at = started_at + timedelta(hours=1, minutes=index % 60)
+    item = {
+        'content_code': f"fake{live_type}{index:05d}",
+        'title': f"ダミー配信 type{live_type} #{index}",
+        'thumbnail_url': f"https://cdn.invalid/thumbnails/{live_type}/{index}.jpg",
+        'live_scheduled_start_at': started_at.strftime("%Y-%m-%d %H:%M:%S"),
+        'live_started_at': None,
+        'live_finished_at': None,
+        'video_aggregate_info': {'total_views': 1000 + index},
+        'video_delivery_target': {'id': 1 if index % 3 else 2},
+        'video_free_periods': [],
+    }
+    if live_type != 2:
+        item['live_started_at'] = started_at.strftime("%Y-%m-%d %H:%M:%S")
+    if live_type == 3:
+        item['live_finished_at'] = finished_at.strftime("%Y-%m-%d %H:%M:%S")
+        if index % 2:
+            item['video_free_periods'] = [{'elapsed_started_time': 0, 'elapsed_ended_time': 600}]
+    return item
+
+
+class FakeFCApiServer:
+    """
+    ファンクラブ動画情報APIの偽サーバー（別スレッドで起動）
+    """
+
+    def __init__(self, port=0, live_count=DEFAULT_LIVE_COUNT, schedule_count=DEFAULT_SCHEDULE_COUNT,
+                 archive_count=DEFAULT_ARCHIVE_COUNT, max_per_page=DEFAULT_MAX_PER_PAGE, latency=0.0,
+                 include_total=True, truncate_per_page=False):
+        """
+        Args:
+            port (int): 待ち受けるポート(0の場合は空いているポートを使用)
+            live_count (int): 配信中の件数
+            schedule_count (int): 放送予定の件数
+            archive_count (int): 過去の配信の件数
+            max_per_page (int): 受け付ける1ページあたりの最大件数
+            latency (float): 1リクエストあたりの応答遅延(秒)
+            include_total (bool): レスポンスに総件数(total)を含める場合True
+            truncate_per_page (bool): 最大件数を超えるper_pageを400にせず、黙って最大件数に切り詰める場合True
+        """
+        self.items = {
+            1: [create_fake_item(1, i) for i in range(live_count)],
+            2: [create_fake_item(2, i) for i in range(schedule_count)],
+            3: [create_fake_item(3, i) for i in range(archive_count)],
+        }
+        self.max_per_page = max_per_page
+        self.latency = latency
+        self.include_total = include_total
+        self.truncate_per_page = truncate_per_page
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), self._create_handler())
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    @property
+    def api_base_url(self):
+        """
+        get_video_info_fc.py の FC_API_BASE_URL と同じ形式のURLテンプレート
+        """
+        return f"http://127.0.0.1:{self.port}/live_pages?page=$2&live_type=$1&per_page=$3"
+
+    def _create_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                query = parse_qs(urlparse(self.path).query)
+                try:
+                    live_type = int(query['live_type'][0])
+                    page = int(query.get('page', ['1'])[0])
+                    per_page = int(query.get('per_page', ['10'])[0])
+                except (KeyError, ValueError):
+                    self._send(400, {'errors': ['invalid query']})
+                    return
+                if per_page > server.max_per_page:
+                    if not server.truncate_per_page:
+                        self._send(400, {'errors': ['per_page is too large']})
+                        return
+                    per_page = server.max_per_page
+                items = server.items.get(live_type, [])
+                video_pages = {'list': items[(page - 1) * per_page:page * per_page]}
+                if server.include_total:
+                    video_pages['total'] = len(items)
+                self._send(200, {'data': {'video_pages': video_pages}})
+
+            def _send(self, status, body):
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # エラー応答の本文を読まずに切断するクライアントがあるため無視する
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ファンクラブ動画情報APIのローカル偽サーバー")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'待ち受けるポート（デフォルト: {DEFAULT_PORT}）')
+    parser.add_argument('--archive', type=int, default=DEFAULT_ARCHIVE_COUNT, help=f'過去の配信の件数（デフォルト: {DEFAULT_ARCHIVE_COUNT}）')
+    parser.add_argument('--max-per-page', type=int, default=DEFAULT_MAX_PER_PAGE, help=f'受け付ける1ページあたりの最大件数（デフォルト: {DEFAULT_MAX_PER_PAGE}）')
+    parser.add_argument('--latency', type=float, default=0.0, help='1リクエストあたりの応答遅延 秒（デフォルト: 0）')
+    parser.add_argument('--no-total', action='store_true', help='レスポンスに総件数を含めない')
+    parser.add_argument('--truncate', action='store_true', help='最大件数を超えるper_pageを400にせず黙って切り詰める')
+    args = parser.parse_args()
+
+    server = FakeFCApiServer(port=args.port, archive_count=args.archive, max_per_page=args.max_per_page,
+                             latency=args.latency, include_total=not args.no_total,
+                             truncate_per_page=args.truncate)
+    print(f"🧪 偽APIサーバーを起動しました: {server.api_base_url}")
+    try:
+        server.start()
+        server._thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
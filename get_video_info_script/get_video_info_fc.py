@@ -7,33 +7,62 @@ python get_video_info_fc.py
 03. 動画情報のサンプルを表示
 """
 
+import argparse
+import asyncio
 import json
-from bs4 import BeautifulSoup
-import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+import math
+import aiohttp
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import time
 
+from json_writer import write_json_atomic
+from typed_fields import (build_typed_fields, find_metadata_value, has_typed_fields, parse_broadcast_datetime,
+                          parse_clock_seconds)
+from video_item import VideoItem, serialize_items
+
 # 設定
 # 動画ページのURLテンプレート($1は動画ID)
 FC_VIDEO_PAGE_URL: str = "https://uise-official.com/live/$1"
-# 動画情報APIのURLテンプレート($1はlive_type, $2はページ番号)
-FC_API_BASE_URL: str = "https://api.uise-official.com/fc/fanclub_sites/434/live_pages?page=$2&live_type=$1&per_page=10"
+# 動画情報APIのURLテンプレート($1はlive_type, $2はページ番号, $3は1ページあたりの件数)
+FC_API_BASE_URL: str = "https://api.uise-official.com/fc/fanclub_sites/434/live_pages?page=$2&live_type=$1&per_page=$3"
 OUTPUT_FILE: str = "../docs/fciu.json"
+# 取得するlive_type(1: 配信中, 2: 放送予定, 3: 過去の配信)
+FC_LIVE_TYPES: tuple = (1, 2, 3)
+# 試行する1ページあたりの件数(大きい順に試し、APIが受け付けた最大の値を使用)
+FC_PAGE_SIZE_CANDIDATES: tuple = (100, 50, 30, 20, 10)
+# APIへの同時接続数の上限
+FC_MAX_CONNECTIONS: int = 4
+# 差分同期の対象とするlive_type(過去の配信は再生回数以外変化しないため、新しい配信のみ取得する)
+FC_DELTA_LIVE_TYPE: int = 3
+# 差分同期の状態(ハイウォーターマーク・最終フルスイープ日時)の保存先
+SYNC_STATE_FILE: str = "./fc_sync_state.json"
+# 再生回数を更新するため、過去の配信をすべて取得し直す間隔(日)
+FULL_SWEEP_INTERVAL_DAYS: int = 7
 
 class FCVideoInfoExtractor:
-    def __init__(self):
-        # headersの設定
+    def __init__(self, api_base_url: str = FC_API_BASE_URL, preferred_page_size: int = None):
+        """
+        Args:
+            api_base_url: str - 動画情報APIのURLテンプレート
+            preferred_page_size: int - 前回APIが受け付けた1ページあたりの件数(最初に試す、Noneの場合は大きい順に試す)
+        """
+        self.api_base_url: str = api_base_url
+        self.preferred_page_size: int = preferred_page_size
+        # headersの設定(accept-encodingはaiohttpが対応する形式を自動で指定する)
         self.headers: dict = {
             "accept": "application/json, text/plain, */*",
-            "accept-encoding": "gzip, deflate, br, zstd",
             "fc_site_id": "434",
             "fc_use_device": "null",
         }
+        # APIへのリクエスト数
+        self.request_count: int = 0
+        # APIが受け付けた1ページあたりの件数(最初の取得時に決定し、すべてのlive_typeで共有)
+        self.page_size: int = None
+        # 取得した過去の配信のうち最新のもの({"content_code", "live_started_at"})
+        self.high_water_mark: dict = None
+        # 過去の配信をすべて取得した場合True(差分同期で既知の配信に到達した場合False)
+        self.full_sweep_done: bool = False
 
 
     def _date_str_fmt(self, date_str: str) -> tuple:
@@ -69,116 +98,349 @@ class FCVideoInfoExtractor:
             print(f"日付のフォーマットエラー: {e}")
             raise e
 
-    def get_api_all_video_info(self):
+    def get_api_all_video_info(self, previous_videos: list = None, high_water_mark: dict = None):
         """
         APIからすべての動画情報を取得
+        live_typeごとの取得を並行して行い、取得順(live_type順・ページ順)を保持して保存する
+        previous_videos を指定した場合、過去の配信は既知の配信に到達するまでの新しいものだけを取得し、
+        前回の過去の配信と結合する(差分同期)
+
+        Args:
+            previous_videos: list - 前回出力した動画情報(VideoItem)のリスト(Noneの場合はすべて取得)
+            high_water_mark: dict - 前回取得した最新の過去の配信({"content_code", "live_started_at"})
         """
         # 配信中のlive_typeは1
         # 放送予定のlive_typeは2
         # 過去の配信のlive_typeは3
-        # 1から3までのlive_typeを順に取得
+        previous_past_videos: list = []
+        is_known = None
+        if previous_videos is not None:
+            previous_past_videos = [video for video in previous_videos if self._is_past_video(video)]
+            known_codes = {self._get_content_code(video) for video in previous_past_videos}
+            known_codes.discard('')
+            # ハイウォーターマークは前回の出力に含まれている場合のみ使用する
+            # (出力が公開されなかった実行の状態で、未公開の配信を既知とみなさないため)
+            if high_water_mark and high_water_mark.get('content_code') not in known_codes:
+                high_water_mark = None
+
+            def is_known(item: dict) -> bool:
+                if item.get('content_code') in known_codes:
+                    return True
+                if high_water_mark:
+                    started_at = item.get('live_started_at') or ''
+                    hwm_started_at = high_water_mark.get('live_started_at') or ''
+                    return bool(started_at and hwm_started_at and started_at <= hwm_started_at)
+                return False
+
+        items_by_live_type: list = asyncio.run(self._fetch_all_items(is_known))
         video_info_list: list = []
-        for live_type in range(1, 4):
-            page = 1
-            while True:
-                url = FC_API_BASE_URL.replace("$1", str(live_type)).replace("$2", str(page))
-                print(f"取得中: {url}")
-                try:
-                    response = requests.get(url, headers=self.headers)
-                    if response.status_code == 200:
-                        res = response.json()
-                        data = res.get('data', {})
-                        video_pages = data.get('video_pages', {})
-                        items = video_pages.get('list', [])
-                        if len(items) == 0:
-                            print(f"live_type {live_type} はページ {page-1} で終了") 
-                            break
-                        print(f"live_type {live_type} のページ {page} を取得")
-                        for item in items:
-                            # 動画情報を抽出
-                            upload_date: str = ""
-                            upload_time: str = ""
-                            metadata:list = []
-                            # 配信日時情報取得
-                            if live_type == 2: # 配信予定
-                                upload_date, upload_time = self._date_str_fmt(item.get('live_scheduled_start_at', ''))
-                            else: # 配信中 or 過去の配信
-                                upload_date, upload_time = self._date_str_fmt(item.get('live_started_at', ''))
-                            metadata.append("配信日時: " + upload_date + " " + upload_time)
-                            # 配信状態のメタデータを追加
-                            if live_type == 1:
-                                metadata.append("配信中")
-                            elif live_type == 2:
-                                metadata.append("配信予定")
-                            else:
-                                # 過去の配信の場合
-                                # 再生時間を計算し、メタデータに追加
-                                live_started_time_str:str = item.get('live_started_at')
-                                live_started_time:datetime = datetime.strptime(live_started_time_str, "%Y-%m-%d %H:%M:%S")
-                                live_finished_time_str:str = item.get('live_finished_at')
-                                # 2025-08-10 16:00:00
-                                live_finished_time:datetime = datetime.strptime(live_finished_time_str, "%Y-%m-%d %H:%M:%S")
-                                duration:timedelta = live_finished_time - live_started_time
-                                metadata.append(f"再生時間: {duration}")
-                                # 再生回数をメタデータに追加
-                                view_count = item.get('video_aggregate_info', {"total_views": 0}).get('total_views', 0)
-                                metadata.append(f"再生回数: {view_count}回")
-                            # 視聴条件をメタデータに追加
-                            pricing_info: int = item.get('video_delivery_target', {"id": 0}).get('id', 0)
-                            if pricing_info == 1:
-                                if live_type == 1 or live_type == 2: # 配信中 or 配信予定
-                                    # タイトルに「スマホ」が含まれている場合は、会員のみの視聴条件(たぶん)
-                                    if "スマホ" in item.get('title', ''):
-                                        metadata.append("視聴条件: 会員のみ")
-                                    else:
-                                        metadata.append("視聴条件: 一部無料")
-                                    # ↓あとで実装
-                                    # SeleniumのWebDriverで枠ページへブラウジングして視聴条件を取得
-                                    # options = Options()
-                                    # options.add_argument("--headless")  # ヘッドレスモード
-                                    # options.add_argument("--no-sandbox")
-                                    # options.add_argument("--disable-dev-shm-usage")
-                                    # driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-                                else:  # 過去の配信の場合
-                                    video_free_periods = item.get('video_free_periods', [])
-                                    if video_free_periods:
-                                        metadata.append("視聴条件: 一部無料")
-                                        free_periods = []
-                                        for period in video_free_periods:
-                                            free_start:int = period.get('elapsed_started_time', 0)
-                                            free_end:int = period.get('elapsed_ended_time', 0)
-                                            # free_start, free_end が秒数なので、hh:mm:ss形式に変換(hhが0の場合はmm:ss形式)
-                                            if free_start // 3600 == 0:
-                                                free_start = f"{((free_start % 3600) // 60):02}:{free_start % 60:02}"
-                                                free_end = f"{((free_end % 3600) // 60):02}:{free_end % 60:02}"
-                                            else:
-                                                free_start = f"{free_start // 3600}:{((free_start % 3600) // 60):02}:{free_start % 60:02}"
-                                                free_end = f"{free_end // 3600}:{((free_end % 3600) // 60):02}:{free_end % 60:02}"
-                                            free_periods.append(f"{free_start}~{free_end}")
-                                        metadata.append("無料部分 " + ", ".join(free_periods))
-                                    else:
-                                        metadata.append("視聴条件: 会員のみ")
-                            elif pricing_info == 2:
-                                metadata.append("視聴条件: 全編無料")
-                            else:
-                                metadata.append("視聴条件: 不明")
-
-                            # 動画情報を辞書にまとめる
-                            video_info = {
-                                'title': item.get('title', ''),
-                                'video_url': f"https://uise-official.com/live/{item.get('content_code', '')}",
-                                'image': item.get('thumbnail_url', ''),
-                                'upload_date': upload_date,
-                                'metadata': metadata,
-                            }
-                            # 動画情報をリストに追加
-                            video_info_list.append(video_info)
-                    page += 1
-                except Exception as e:
-                    raise e
+        for live_type, items in zip(FC_LIVE_TYPES, items_by_live_type):
+            for item in items:
+                video_info_list.append(self._create_video_info(item, live_type))
+            if live_type == FC_DELTA_LIVE_TYPE and items:
+                self.high_water_mark = {
+                    'content_code': items[0].get('content_code', ''),
+                    'live_started_at': items[0].get('live_started_at', ''),
+                }
+        if self.high_water_mark is None:
+            self.high_water_mark = high_water_mark
+
+        if is_known is not None and not self.full_sweep_done:
+            # 新しい過去の配信の後ろに、前回の過去の配信を結合
+            new_codes = {self._get_content_code(video) for video in video_info_list}
+            carried = [
+                video for video in previous_past_videos
+                if self._get_content_code(video) not in new_codes
+            ]
+            video_info_list.extend(carried)
+            new_count = len(items_by_live_type[FC_LIVE_TYPES.index(FC_DELTA_LIVE_TYPE)])
+            print(f"差分同期: 新しい過去の配信 {new_count} 件, 前回から引き継ぎ {len(carried)} 件")
+        print(f"APIリクエスト数: {self.request_count}")
         # 取得した動画情報をクラス変数に保存
         self.all_videos = video_info_list
 
+    @staticmethod
+    def _get_content_code(video: VideoItem) -> str:
+        """
+        動画情報の動画URLからcontent_codeを取得
+
+        Args:
+            video: VideoItem - 動画情報
+        Returns:
+            str: content_code、取得できない場合は空文字
+        """
+        video_url: str = video.video_url or ''
+        if '/live/' not in video_url:
+            return ''
+        return video_url.rsplit('/live/', 1)[1].split('?')[0].strip('/')
+
+    @staticmethod
+    def _is_past_video(video: VideoItem) -> bool:
+        """
+        動画情報が過去の配信(live_type=3)のものかを判定
+
+        Args:
+            video: VideoItem - 動画情報
+        Returns:
+            bool: 過去の配信の場合True
+        """
+        metadata: list = video.metadata or []
+        return "配信中" not in metadata and "配信予定" not in metadata
+
+    async def _fetch_all_items(self, is_known=None) -> list:
+        """
+        1つのコネクションプールを共有し、すべてのlive_typeの動画アイテムを並行して取得
+
+        Args:
+            is_known: callable - 過去の配信のアイテムが取得済みかを判定する関数(Noneの場合はすべて取得)
+        Returns:
+            list: live_typeごとの動画アイテムのリスト(FC_LIVE_TYPESの順)
+        """
+        self._page_size_lock = asyncio.Lock()
+        self.full_sweep_done = is_known is None
+        connector = aiohttp.TCPConnector(limit=FC_MAX_CONNECTIONS)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as http:
+            return await asyncio.gather(*(
+                self._fetch_new_items(http, live_type, is_known)
+                if live_type == FC_DELTA_LIVE_TYPE and is_known is not None
+                else self._fetch_live_type_items(http, live_type)
+                for live_type in FC_LIVE_TYPES
+            ))
+
+    async def _fetch_page(self, http: aiohttp.ClientSession, live_type: int, page: int, per_page: int) -> dict:
+        """
+        APIから1ページ分の動画情報を取得
+
+        Args:
+            http: aiohttp.ClientSession - HTTPセッション
+            live_type: int - live_type
+            page: int - ページ番号
+            per_page: int - 1ページあたりの件数
+        Returns:
+            dict: レスポンスのdata.video_pages
+        """
+        url = self.api_base_url.replace("$1", str(live_type)).replace("$2", str(page)).replace("$3", str(per_page))
+        print(f"取得中: {url}")
+        self.request_count += 1
+        async with http.get(url) as response:
+            response.raise_for_status()
+            res = await response.json(content_type=None)
+        return res.get('data', {}).get('video_pages', {})
+
+    async def _fetch_first_page(self, http: aiohttp.ClientSession, live_type: int) -> tuple:
+        """
+        APIが受け付ける最大のページサイズで1ページ目を取得
+        ページサイズの判定は最初の1回のみ行い、他のlive_typeは判定結果を待って使用する
+        前回受け付けられたページサイズ(preferred_page_size)がある場合はそれを最初に試し、受け付けられなかった場合のみ大きい順に試す
+
+        Args:
+            http: aiohttp.ClientSession - HTTPセッション
+            live_type: int - live_type
+        Returns:
+            tuple: (1ページ目のdata.video_pages, 使用したページサイズ)
+        """
+        async with self._page_size_lock:
+            if self.page_size is None:
+                candidates = list(FC_PAGE_SIZE_CANDIDATES)
+                if self.preferred_page_size:
+                    candidates = [self.preferred_page_size] + [c for c in candidates if c != self.preferred_page_size]
+                for per_page in candidates:
+                    try:
+                        video_pages = await self._fetch_page(http, live_type, 1, per_page)
+                    except aiohttp.ClientResponseError as e:
+                        # ページサイズが大きすぎる場合は4xxが返るため、次の候補で再試行
+                        if 400 <= e.status < 500:
+                            print(f"per_page={per_page} は受け付けられませんでした({e.status})")
+                            continue
+                        raise e
+                    self.page_size = per_page
+                    return video_pages, per_page
+                raise Exception("どのページサイズでも動画情報を取得できませんでした")
+        return await self._fetch_page(http, live_type, 1, self.page_size), self.page_size
+
+    @staticmethod
+    def _get_total_count(video_pages: dict):
+        """
+        レスポンスから総件数を取得
+
+        Args:
+            video_pages: dict - レスポンスのdata.video_pages
+        Returns:
+            int: 総件数、含まれていない場合はNone
+        """
+        for key in ('total', 'total_count', 'count'):
+            if isinstance(video_pages.get(key), int):
+                return video_pages[key]
+        return None
+
+    async def _fetch_live_type_items(self, http: aiohttp.ClientSession, live_type: int) -> list:
+        """
+        指定したlive_typeの動画アイテムをすべて取得
+        1ページ目の総件数から残りのページ数を求め、残りのページは並行して取得する
+
+        Args:
+            http: aiohttp.ClientSession - HTTPセッション
+            live_type: int - live_type
+        Returns:
+            list: 動画アイテムのリスト(ページ順)
+        """
+        video_pages, per_page = await self._fetch_first_page(http, live_type)
+        items: list = list(video_pages.get('list', []))
+        total = self._get_total_count(video_pages)
+
+        if total is None:
+            # 総件数が含まれていない場合は、空のページが返るまで順に取得
+            page = 1
+            while items and len(video_pages.get('list', [])) > 0:
+                page += 1
+                video_pages = await self._fetch_page(http, live_type, page, per_page)
+                items.extend(video_pages.get('list', []))
+        elif len(items) < total:
+            # APIが要求より少ない件数に制限している場合は、実際の件数をページサイズとする
+            if 0 < len(items) < per_page:
+                per_page = len(items)
+            last_page = math.ceil(total / per_page)
+            pages = await asyncio.gather(
+                *(self._fetch_page(http, live_type, page, per_page) for page in range(2, last_page + 1))
+            )
+            for page_video_pages in pages:
+                items.extend(page_video_pages.get('list', []))
+
+        print(f"live_type {live_type}: {len(items)} 件を取得（1ページあたり {per_page} 件）")
+        return items
+
+    async def _fetch_new_items(self, http: aiohttp.ClientSession, live_type: int, is_known) -> list:
+        """
+        指定したlive_typeの動画アイテムを新しい順に取得し、既知のアイテムに到達した時点で終了
+        既知のアイテムに到達せずに最後のページまで取得した場合は、full_sweep_done をTrueにする
+
+        Args:
+            http: aiohttp.ClientSession - HTTPセッション
+            live_type: int - live_type
+            is_known: callable - アイテムが取得済みかを判定する関数
+        Returns:
+            list: 未取得の動画アイテムのリスト(ページ順)
+        """
+        video_pages, per_page = await self._fetch_first_page(http, live_type)
+        total = self._get_total_count(video_pages)
+        new_items: list = []
+        fetched_count: int = 0
+        page = 1
+        while True:
+            page_items: list = video_pages.get('list', [])
+            if not page_items:
+                break
+            fetched_count += len(page_items)
+            for item in page_items:
+                if is_known(item):
+                    print(f"live_type {live_type}: {len(new_items)} 件の新しいアイテムを取得（ページ {page} で既知のアイテムに到達）")
+                    return new_items
+                new_items.append(item)
+            if total is not None and fetched_count >= total:
+                break
+            page += 1
+            video_pages = await self._fetch_page(http, live_type, page, per_page)
+
+        print(f"live_type {live_type}: 既知のアイテムに到達しなかったため {len(new_items)} 件をすべて取得")
+        self.full_sweep_done = True
+        return new_items
+
+    def _create_video_info(self, item: dict, live_type: int) -> VideoItem:
+        """
+        APIの動画アイテムから動画情報を作成
+
+        Args:
+            item: dict - APIの動画アイテム
+            live_type: int - live_type(1: 配信中, 2: 放送予定, 3: 過去の配信)
+        Returns:
+            VideoItem: 動画情報
+        """
+        # 動画情報を抽出
+        upload_date: str = ""
+        upload_time: str = ""
+        metadata:list = []
+        # 型付きフィールド用の値(配信日時はUTC)
+        start_at: str = ""
+        duration_seconds: int = None
+        view_count: int = None
+        # 配信日時情報取得
+        if live_type == 2: # 配信予定
+            start_at = item.get('live_scheduled_start_at', '')
+        else: # 配信中 or 過去の配信
+            start_at = item.get('live_started_at', '')
+        upload_date, upload_time = self._date_str_fmt(start_at)
+        metadata.append("配信日時: " + upload_date + " " + upload_time)
+        # 配信状態のメタデータを追加
+        if live_type == 1:
+            metadata.append("配信中")
+        elif live_type == 2:
+            metadata.append("配信予定")
+        else:
+            # 過去の配信の場合
+            # 再生時間を計算し、メタデータに追加
+            live_started_time_str:str = item.get('live_started_at')
+            live_started_time:datetime = datetime.strptime(live_started_time_str, "%Y-%m-%d %H:%M:%S")
+            live_finished_time_str:str = item.get('live_finished_at')
+            # 2025-08-10 16:00:00
+            live_finished_time:datetime = datetime.strptime(live_finished_time_str, "%Y-%m-%d %H:%M:%S")
+            duration:timedelta = live_finished_time - live_started_time
+            duration_seconds = int(duration.total_seconds())
+            metadata.append(f"再生時間: {duration}")
+            # 再生回数をメタデータに追加
+            view_count = item.get('video_aggregate_info', {"total_views": 0}).get('total_views', 0)
+            metadata.append(f"再生回数: {view_count}回")
+        # 視聴条件をメタデータに追加
+        pricing_info: int = item.get('video_delivery_target', {"id": 0}).get('id', 0)
+        if pricing_info == 1:
+            if live_type == 1 or live_type == 2: # 配信中 or 配信予定
+                # タイトルに「スマホ」が含まれている場合は、会員のみの視聴条件(たぶん)
+                if "スマホ" in item.get('title', ''):
+                    metadata.append("視聴条件: 会員のみ")
+                else:
+                    metadata.append("視聴条件: 一部無料")
+                # ↓あとで実装
+                # SeleniumのWebDriverで枠ページへブラウジングして視聴条件を取得
+                # options = Options()
+                # options.add_argument("--headless")  # ヘッドレスモード
+                # options.add_argument("--no-sandbox")
+                # options.add_argument("--disable-dev-shm-usage")
+                # driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+            else:  # 過去の配信の場合
+                video_free_periods = item.get('video_free_periods', [])
+                if video_free_periods:
+                    metadata.append("視聴条件: 一部無料")
+                    free_periods = []
+                    for period in video_free_periods:
+                        free_start:int = period.get('elapsed_started_time', 0)
+                        free_end:int = period.get('elapsed_ended_time', 0)
+                        # free_start, free_end が秒数なので、hh:mm:ss形式に変換(hhが0の場合はmm:ss形式)
+                        if free_start // 3600 == 0:
+                            free_start = f"{((free_start % 3600) // 60):02}:{free_start % 60:02}"
+                            free_end = f"{((free_end % 3600) // 60):02}:{free_end % 60:02}"
+                        else:
+                            free_start = f"{free_start // 3600}:{((free_start % 3600) // 60):02}:{free_start % 60:02}"
+                            free_end = f"{free_end // 3600}:{((free_end % 3600) // 60):02}:{free_end % 60:02}"
+                        free_periods.append(f"{free_start}~{free_end}")
+                    metadata.append("無料部分 " + ", ".join(free_periods))
+                else:
+                    metadata.append("視聴条件: 会員のみ")
+        elif pricing_info == 2:
+            metadata.append("視聴条件: 全編無料")
+        else:
+            metadata.append("視聴条件: 不明")
+
+        # 動画情報をまとめる
+        video_info = VideoItem(
+            title=item.get('title', ''),
+            video_url=f"https://uise-official.com/live/{item.get('content_code', '')}",
+            image=item.get('thumbnail_url', ''),
+            upload_date=upload_date,
+            metadata=metadata,
+            # 型付きフィールド（start_epoch, broadcast_day, duration_seconds, view_count）
+            **build_typed_fields(start_at, duration_seconds, view_count, naive_tz=timezone.utc),
+        )
+        return video_info
+
     def save_to_json(self, filename=OUTPUT_FILE):
         """
         動画情報をJSONファイルに保存（{"items": []} 形式）
@@ -192,17 +454,128 @@ class FCVideoInfoExtractor:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
             # {"items": []} 形式で保存
-            data = {"items": self.all_videos}
+            data = {"items": serialize_items(self.all_videos)}
             # JSONファイルに書き込み
             if not data['items']:
                 raise Exception("動画情報が空です。保存をスキップします。")  # 空のデータは保存しない
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 一時ファイルに書き込んでから置き換える（書き込みに失敗しても前回のファイルが残る）
+            write_json_atomic(filename, data)
                 
             print(f"動画情報を {filename} に保存しました")
+            return True
             
         except Exception as e:
             print(f"ファイル保存に失敗: {e}")
+            return False
+
+def load_previous_videos(filename: str = OUTPUT_FILE):
+    """
+    前回出力したJSONファイルから動画情報のリストを読み込む
+
+    Args:
+        filename: str - 前回の出力ファイルパス
+    Returns:
+        list: 動画情報(VideoItem)のリスト、読み込めない場合はNone
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            previous_data = json.load(f)
+    except FileNotFoundError:
+        print(f"前回の出力ファイル {filename} が見つかりません。過去の配信をすべて取得します。")
+        return None
+    except json.JSONDecodeError:
+        print(f"前回の出力ファイル {filename} の読み込みに失敗しました。過去の配信をすべて取得します。")
+        return None
+    previous_videos: list = []
+    for video in previous_data.get('items', []):
+        # 型付きフィールドがない前回のデータは表示用の文字列から作成（引き継いだ配信もフィールドを持つようにする）
+        if not has_typed_fields(video):
+            video.update(typed_fields_from_metadata(video.get('metadata', [])))
+        previous_videos.append(VideoItem.from_dict(video))
+    return previous_videos
+
+def typed_fields_from_metadata(metadata: list) -> dict:
+    """
+    表示用のメタデータから型付きフィールドを作成（型付きフィールドがない前回のデータの移行用）
+
+    Args:
+        metadata: list - ["配信日時: YYYY/MM/DD HH:MM:SS", "再生時間: H:MM:SS", "再生回数: N回", ...]
+    Returns:
+        dict: {"start_epoch", "broadcast_day", "duration_seconds", "view_count"}
+    """
+    start = None
+    date_time: str = find_metadata_value(metadata, "配信日時") or ""
+    if " " in date_time:
+        start = parse_broadcast_datetime(*date_time.split(" ", 1))
+    view_count = None
+    views: str = find_metadata_value(metadata, "再生回数") or ""
+    if views.rstrip("回").isdigit():
+        view_count = int(views.rstrip("回"))
+    return build_typed_fields(start, parse_clock_seconds(find_metadata_value(metadata, "再生時間")), view_count)
+
+def load_sync_state(filename: str = SYNC_STATE_FILE) -> dict:
+    """
+    差分同期の状態を読み込む
+
+    Args:
+        filename: str - 状態ファイルのパス
+    Returns:
+        dict: {"high_water_mark": {...}, "last_full_sweep": "ISO8601", "page_size": N}、存在しない場合は空の辞書
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_sync_state(state: dict, filename: str = SYNC_STATE_FILE):
+    """
+    差分同期の状態を保存
+
+    Args:
+        state: dict - 差分同期の状態
+        filename: str - 状態ファイルのパス
+    """
+    write_json_atomic(filename, state, compact=False)
+
+def needs_full_sweep(state: dict, interval_days: int = FULL_SWEEP_INTERVAL_DAYS) -> bool:
+    """
+    過去の配信をすべて取得し直す必要があるかを判定
+
+    Args:
+        state: dict - 差分同期の状態
+        interval_days: int - フルスイープの間隔(日)
+    Returns:
+        bool: 前回のフルスイープから interval_days 日以上経過している(または記録がない)場合True
+    """
+    last_full_sweep = state.get('last_full_sweep')
+    if not last_full_sweep or not state.get('high_water_mark'):
+        return True
+    try:
+        return datetime.now() - datetime.fromisoformat(last_full_sweep) >= timedelta(days=interval_days)
+    except ValueError:
+        return True
+
+def parse_args():
+    """
+    コマンドライン引数を解析
+
+    Returns:
+        argparse.Namespace: 解析結果
+    """
+    parser = argparse.ArgumentParser(description="ファンクラブ動画情報取得スクリプト")
+    parser.add_argument('--api-base-url', default=FC_API_BASE_URL,
+                        help='動画情報APIのURLテンプレート（$1: live_type, $2: ページ番号, $3: 1ページあたりの件数）')
+    parser.add_argument('--full', action='store_true',
+                        help='差分同期を行わず、過去の配信をすべて取得し直す（再生回数の更新）')
+    parser.add_argument('--sync-state', default=SYNC_STATE_FILE,
+                        help=f'差分同期の状態ファイル（デフォルト: {SYNC_STATE_FILE}）')
+    parser.add_argument('--sync-state-output', default=None,
+                        help='更新した差分同期の状態の保存先（デフォルト: --sync-state と同じ、'
+                             'run_all.py は出力と同じ一時ディレクトリを指定し、出力と一緒に公開する）')
+    parser.add_argument('--output', default=OUTPUT_FILE,
+                        help=f'出力ファイルのパス（デフォルト: {OUTPUT_FILE}、前回の出力は常に {OUTPUT_FILE} から読み込む）')
+    return parser.parse_args()
 
 def main():
     """
@@ -214,19 +587,40 @@ def main():
     3. 結果のJSONファイル保存
     4. 取得結果のサマリー表示
     """
+    args = parse_args()
+
     # スクリプトの開始時間を記録
     start_time = time.time()
 
     print("🎬 ファンクラブ動画情報取得スクリプト")
 
-    extractor = FCVideoInfoExtractor()
+    # 差分同期の状態を読み込み、前回APIが受け付けたページサイズから試す
+    sync_state = load_sync_state(args.sync_state)
+    extractor = FCVideoInfoExtractor(api_base_url=args.api_base_url, preferred_page_size=sync_state.get('page_size'))
     
     try:
+        # フルスイープが必要かを判定
+        previous_videos = None
+        if args.full:
+            print("🔁 --full が指定されたため、過去の配信をすべて取得します")
+        elif needs_full_sweep(sync_state):
+            print(f"🔁 前回のフルスイープから{FULL_SWEEP_INTERVAL_DAYS}日以上経過しているため、過去の配信をすべて取得します")
+        else:
+            previous_videos = load_previous_videos()
+
         # 全動画情報を取得
-        extractor.get_api_all_video_info()
+        extractor.get_api_all_video_info(previous_videos, sync_state.get('high_water_mark'))
         
-        # 結果をJSONファイルに保存
-        extractor.save_to_json()
+        # 結果をJSONファイルに保存し、保存できた場合のみ差分同期の状態を更新
+        # （run_all.py から実行した場合は出力と同じ一時ディレクトリに保存し、出力を公開したときにだけ一緒に公開される）
+        if extractor.save_to_json(args.output):
+            if extractor.high_water_mark:
+                sync_state['high_water_mark'] = extractor.high_water_mark
+            if extractor.full_sweep_done:
+                sync_state['last_full_sweep'] = datetime.now().isoformat(timespec='seconds')
+            if extractor.page_size:
+                sync_state['page_size'] = extractor.page_size
+            save_sync_state(sync_state, args.sync_state_output or args.sync_state)
         
         # 取得した情報の一部を表示
         _display_sample_results(extractor.all_videos)
@@ -243,18 +637,18 @@ def _display_sample_results(all_videos):
     取得した動画情報のサンプルを表示
     
     Args:
-        all_videos: list - 取得した動画情報のリスト
+        all_videos: list - 取得した動画情報(VideoItem)のリスト
     """
     if all_videos:
         print("\n取得した動画情報のサンプル:")
         for i, video in enumerate(all_videos[:3]):  # 最初の3件を表示
             print(f"\n--- 動画 {i+1} ---")
-            print(f"タイトル: {video.get('title', 'N/A')}")
-            print(f"動画URL: {video.get('video_url', 'N/A')}")
-            print(f"サムネイル: {video.get('image', 'N/A')}")
-            print(f"配信日: {video.get('upload_date', 'N/A')}")
-            if video.get('metadata'):
-                print(f"メタデータ: {video['metadata']}")
+            print(f"タイトル: {video.title or 'N/A'}")
+            print(f"動画URL: {video.video_url or 'N/A'}")
+            print(f"サムネイル: {video.image or 'N/A'}")
+            print(f"配信日: {video.upload_date or 'N/A'}")
+            if video.metadata:
+                print(f"メタデータ: {video.metadata}")
 
 def _display_execution_summary(start_time):
     """
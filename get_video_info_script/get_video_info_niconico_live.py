@@ -1,151 +1,216 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
 import requests
-import json
 import time
 import re
-from bs4 import BeautifulSoup
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin, urlparse, parse_qs
 from datetime import datetime, timedelta
 import sys
 
+from rate_limiter import TokenBucketRateLimiter
+from html_parsing import get_parser, available_backends, DEFAULT_BACKEND
+from json_writer import write_json_atomic
+from typed_fields import build_typed_fields
+from video_item import VideoItem, serialize_items
+from timeshift_cache import TimeshiftDeadlineCache, UNKNOWN_DEADLINE, DEFAULT_HORIZON_DAYS
+
 # 設定
 CHANNEL_URL = "https://ch.nicovideo.jp/uise-iu/live"
 OUTPUT_FILE = "../docs/niconico_l.json"
+# タイムシフト視聴期限を確認するページのURLテンプレート($1は番組ID)
+TIMESHIFT_PAGE_URL = "https://ch.nicovideo.jp/uise-iu/live/$1?ref=WatchPage-ProgramPaymentInformation-PaymentActionMenu-NetTicketPurchaseOrChannelJoiningAnchor"
+# 一覧ページ・番組ページを並行して取得するワーカー数
+MAX_WORKERS = 4
+# すべてのワーカーで共有するリクエストレートの上限(リクエスト/秒)
+REQUEST_RATE = 2.0
 
 class NiconicoLiveVideoInfoExtractor:
-    def __init__(self):
+    def __init__(self, max_workers=MAX_WORKERS, request_rate=REQUEST_RATE, timeshift_cache=None, parser_backend=None):
+        """
+        Args:
+            max_workers (int): 並行して取得するワーカー数
+            request_rate (float): すべてのワーカーで共有するリクエストレートの上限(リクエスト/秒)
+            timeshift_cache (TimeshiftDeadlineCache): タイムシフト視聴期限のキャッシュ(Noneの場合は毎回取得)
+            parser_backend (str): HTMLパーサーのバックエンド("lxml" / "bs4")、省略時はデフォルト
+        """
+        self.max_workers = max_workers
+        self.parser = get_parser(parser_backend)
+        self.timeshift_cache = timeshift_cache
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # すべてのワーカーでコネクションプールを共有(ワーカー数分の接続を保持)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.rate_limiter = TokenBucketRateLimiter(request_rate)
+        self.request_count = 0
+        self._lock = threading.Lock()
 
-    def get_total_pages(self, base_url):
+    def _get(self, url, headers=None):
         """
-        チャンネルページから総ページ数を取得
+        レート制限を守ってGETリクエストを送信
+
+        Args:
+            url (str): 取得するURL
+            headers (dict): 追加のリクエストヘッダー(条件付きGETなど)
+        Returns:
+            requests.Response: レスポンス
         """
-        try:
-            response = self.session.get(base_url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # ページネーションから最終ページ番号を取得
-            pagination = soup.find('ul', class_='pagination')
-            if pagination:
-                page_links = pagination.find_all('a')
-                page_numbers = []
-                for link in page_links:
-                    href = link.get('href', '')
-                    if 'page=' in href:
-                        match = re.search(r'page=(\d+)', href)
-                        if match:
-                            page_numbers.append(int(match.group(1)))
-                
-                if page_numbers:
-                    return max(page_numbers)
-            
-            # 代替方法: 最終ページのリンクを探す
-            last_page_link = soup.find('a', string=re.compile(r'最後'))
-            if last_page_link:
-                href = last_page_link.get('href', '')
-                match = re.search(r'page=(\d+)', href)
-                if match:
-                    return int(match.group(1))
-                    
-            return 1
-            
-        except Exception as e:
-            print(f"総ページ数の取得に失敗: {e}")
-            return 1
+        self.rate_limiter.acquire()
+        with self._lock:
+            self.request_count += 1
+        response = self.session.get(url, headers=headers)
+        response.raise_for_status()
+        return response
 
-    def extract_video_info_from_page(self, url):
+    @staticmethod
+    def get_page_url(base_url, page):
         """
-        指定されたページから動画情報を抽出
+        一覧ページのURLを作成
+
+        Args:
+            base_url (str): チャンネルの一覧ページのURL
+            page (int): ページ番号
+        Returns:
+            str: 指定したページのURL
         """
-        video_list = []
-        
-        try:
-            page = 0
-            video_items = []
-            while True:
-                page += 1
-                response = self.session.get(f'{url}?page={page}')
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 動画アイテムを探す（ニコニコ生放送のHTML構造に基づく）
-                # sectionタグのclassがsubかつpastの両方を持つものを探す
-                section_items = soup.find_all('section', class_=lambda x: x and 'sub' in x and 'past' in x)
-                if not section_items:
-                    print(f"ページ {page} で動画セクションが見つかりませんでした。終了します。")
-                    break
-                tmp_items = []
-                for section in section_items:
-                    tmp_items = section.find_all('div', class_='item')
-                    print(f"ページ {page} から {len(tmp_items)} 個の動画アイテムを検出")
-                    video_items.extend(tmp_items)
-                if len(tmp_items) == 0:
-                    print(f"ページ {page} で動画アイテムが見つかりませんでした。終了します。")
-                    break
-            for item in video_items:
-                try:
-                    video_info = self.extract_single_video_info(item)
-                    print(f"動画情報を抽出: {video_info}")
-                    if video_info:
-                        video_list.append(video_info)
-                except Exception as e:
-                    print(f"動画情報の抽出でエラー: {e}")
+        if page == 1:
+            return base_url
+        separator = '&' if '?' in base_url else '?'
+        return f"{base_url}{separator}page={page}"
+
+    @staticmethod
+    def get_program_id(item):
+        """
+        動画アイテムから番組ID(lv〜)を取得
+
+        Args:
+            item (dict): 動画アイテム(html_parsingの抽出結果)
+        Returns:
+            str: 番組ID、見つからない場合はNone
+        """
+        match = re.search(r'/watch/(lv\d+)', item.get('href') or '')
+        return match.group(1) if match else None
+
+    def fetch_list_page(self, base_url, page):
+        """
+        一覧ページを1ページ取得し、過去の放送の動画アイテムとリンクされているページ番号を抽出
+
+        Args:
+            base_url (str): チャンネルの一覧ページのURL
+            page (int): ページ番号
+        Returns:
+            tuple: (動画アイテムのリスト, リンクされているページ番号のset)
+        """
+        response = self._get(self.get_page_url(base_url, page))
+        # 動画アイテムを探す（ニコニコ生放送のHTML構造に基づく）
+        # sectionタグのclassがsubかつpastの両方を持つもの(section.sub.past div.item)を探す
+        page_items, page_numbers = self.parser.parse_list_page(response.text)
+        print(f"ページ {page} から {len(page_items)} 個の動画アイテムを検出")
+        return page_items, page_numbers
+
+    def crawl_list_pages(self, base_url, executor):
+        """
+        一覧ページを1回ずつだけ取得し、番組IDで重複を除いた動画アイテムを収集
+
+        ページのフロンティア(未取得のページ番号)から、ワーカー数ずつまとめて並行して取得します。
+        ページネーションのリンク先と、動画アイテムがあったページの次のページをフロンティアに追加します。
+
+        Args:
+            base_url (str): チャンネルの一覧ページのURL
+            executor (ThreadPoolExecutor): 一覧ページの取得に使用するスレッドプール
+        Returns:
+            list: 動画アイテムのリスト(ページ順・ページ内の順)
+        """
+        frontier = {1}
+        seen_pages = set()
+        items_by_page = {}
+        while frontier:
+            pages = sorted(frontier)[:self.max_workers]
+            frontier.difference_update(pages)
+            seen_pages.update(pages)
+            for page, (page_items, linked_pages) in zip(pages, executor.map(lambda p: self.fetch_list_page(base_url, p), pages)):
+                items_by_page[page] = page_items
+                # ページネーションに表示されていないページもあるため、動画アイテムがあった場合は次のページも確認
+                if page_items:
+                    linked_pages = linked_pages | {page + 1}
+                frontier.update(linked_pages - seen_pages)
+
+        print(f"一覧ページ {len(seen_pages)} ページを取得")
+        video_items = []
+        seen_program_ids = set()
+        duplicate_count = 0
+        for page in sorted(items_by_page):
+            for item in items_by_page[page]:
+                program_id = self.get_program_id(item)
+                if program_id is not None and program_id in seen_program_ids:
+                    duplicate_count += 1
                     continue
-                        
+                seen_program_ids.add(program_id)
+                video_items.append(item)
+        if duplicate_count:
+            print(f"重複した動画アイテム {duplicate_count} 個を除外")
+        return video_items
+
+    def _extract_single_video_info_safely(self, item):
+        """
+        extract_single_video_info をエラー時にNoneを返すようにしたもの(ワーカー用)
+        """
+        try:
+            return self.extract_single_video_info(item)
         except Exception as e:
-            print(f"ページの読み込みに失敗 ({url}): {e}")
-            
-        return video_list
+            print(f"動画情報の抽出でエラー: {e}")
+            return None
 
     def extract_single_video_info(self, item):
         """
         単一の動画アイテムから情報を抽出
+
+        Args:
+            item (dict): 動画アイテム(html_parsingの抽出結果)
+        Returns:
+            VideoItem: 動画情報、タイトルまたは動画URLがない場合はNone
         """
         video_info = {}
         
         # タイトルの取得
-        title_element = item.find('h3') or item.find('h2') or item.find('a', class_=re.compile(r'.*title.*'))
-        if title_element:
-            video_info['title'] = title_element.get_text(strip=True)
+        if item.get('title'):
+            video_info['title'] = item['title']
         
         # 動画リンクの取得
-        link_element = item.find('a', href=re.compile(r'/watch/'))
-        if link_element:
-            href = link_element.get('href')
+        href = item.get('href')
+        if href:
             if href.startswith('/'):
                 video_info['video_url'] = f"https://live.nicovideo.jp{href}"
             else:
                 video_info['video_url'] = href
         
         # サムネイルの取得
-        img_element = item.find('img')
-        if img_element:
-            src = img_element.get('src') or img_element.get('data-src')
-            if src:
-                if src.startswith('/'):
-                    video_info['image'] = f"https:{src}"
-                elif src.startswith('//'):
-                    video_info['image'] = f"https:{src}"
-                else:
-                    video_info['image'] = src
+        src = item.get('image_src')
+        if src:
+            if src.startswith('/'):
+                video_info['image'] = f"https:{src}"
+            elif src.startswith('//'):
+                video_info['image'] = f"https:{src}"
+            else:
+                video_info['image'] = src
 
         # metadateの定義
         video_info['metadata'] = []
         
         # 放送開始日時の取得
-        # pタグclass=dateの要素を探す
-        date_time_element = item.find('p', class_='date')
-        # ulタグからclass=itemsの要素を探す
-        if date_time_element:
+        # pタグclass=dateの要素のテキスト(空白は削除済み)
+        date_time_element = item.get('date_text')
+        start = None  # 放送開始日時(日本時間)
+        if date_time_element is not None:
             date_element = ""
-            # date_elementの空白を削除
-            date_time_element = date_time_element.get_text(strip=True)
             # 放送開始：2025/07/03 (木) 23:00:00 なら 2025/07/03 23:00 に変換 
             # 放送開始：2025/07/03 (木) 00:00:00 なら 2025/07/02 24:00 に変換
             date_time_match = re.search(r'放送開始：(\d{4}/\d{1,2}/\d{1,2} \(\w+\) \d{1,2}:\d{2})', date_time_element)
@@ -157,6 +222,7 @@ class NiconicoLiveVideoInfoExtractor:
                 year, month, day = map(int, date_str.split('/'))
                 # 時間を時、分に分割
                 hour, minute = map(int, time_str.split(':'))
+                start = datetime(year, month, day, hour, minute)
                 # 時間が00~03の場合は24を足し、日を1日引く
                 if hour < 4:
                     # 1日引く
@@ -181,56 +247,76 @@ class NiconicoLiveVideoInfoExtractor:
         # video_info['video_url']から動画IDの抽出
         # ~~/watch/lv348141543 の形式からlv348141543を抽出
         video_id = video_info['video_url'].split('/')[-1]
-        # https://ch.nicovideo.jp/uise-iu/live/{video_id}?ref=WatchPage-ProgramPaymentInformation-PaymentActionMenu-NetTicketPurchaseOrChannelJoiningAnchor でタイムシフト視聴期限の情報を確認可能
-        ts_check_url = f"https://ch.nicovideo.jp/uise-iu/live/{video_id}?ref=WatchPage-ProgramPaymentInformation-PaymentActionMenu-NetTicketPurchaseOrChannelJoiningAnchor"
-        try:
-            ts_response = self.session.get(ts_check_url)
-            ts_response.raise_for_status()
-            ts_soup = BeautifulSoup(ts_response.text, 'html.parser')
-            
-            # タイムシフト視聴期限の要素を探す
-            timeshift_limit_element_ = ts_soup.find_all('dt', text=re.compile(r'タイムシフト視聴期限：'))
-            # timeshift_limit_element_の親要素からdd要素を取得
-            timeshift_limit_element = timeshift_limit_element_[0].find_next('dd')
-            video_info['metadata'].append(f"タイムシフト視聴期限: {timeshift_limit_element.get_text(strip=True)}")
-        except Exception as e:
-            print(f"タイムシフト視聴期限の取得に失敗: {e}")
-            video_info['metadata'].append('タイムシフト視聴期限: 不明')
+        video_info['metadata'].append(f"タイムシフト視聴期限: {self.fetch_timeshift_limit(video_id)}")
+
+        # 型付きフィールド（start_epoch, broadcast_day, duration_seconds, view_count）
+        video_info.update(build_typed_fields(start))
         
         # 最低限必要な情報がある場合のみ返す
         if video_info.get('title') and video_info.get('video_url'):
-            return video_info
+            return VideoItem(**video_info)
         
         return None
 
+    def fetch_timeshift_limit(self, video_id):
+        """
+        番組ページからタイムシフト視聴期限を取得
+
+        Args:
+            video_id (str): 番組ID(lv〜)
+        Returns:
+            str: タイムシフト視聴期限、取得できない場合は"不明"
+        """
+        # キャッシュ済みで変化しない期限はそのまま使用し、それ以外は条件付きGETのヘッダーを付けて取得
+        conditional_headers = {}
+        if self.timeshift_cache is not None:
+            cached_deadline, conditional_headers = self.timeshift_cache.lookup(video_id)
+            if cached_deadline is not None:
+                return cached_deadline
+
+        # https://ch.nicovideo.jp/uise-iu/live/{video_id}?ref=WatchPage-ProgramPaymentInformation-PaymentActionMenu-NetTicketPurchaseOrChannelJoiningAnchor でタイムシフト視聴期限の情報を確認可能
+        ts_check_url = TIMESHIFT_PAGE_URL.replace("$1", video_id)
+        try:
+            ts_response = self._get(ts_check_url, headers=conditional_headers)
+            if ts_response.status_code == 304 and self.timeshift_cache is not None:
+                return self.timeshift_cache.get_cached(video_id)
+            # タイムシフト視聴期限のdt要素の次のdd要素を探す
+            deadline = self.parser.parse_timeshift_deadline(ts_response.text)
+            if deadline is None:
+                raise ValueError("タイムシフト視聴期限の要素が見つかりませんでした")
+            if self.timeshift_cache is not None:
+                self.timeshift_cache.put(
+                    video_id, deadline,
+                    etag=ts_response.headers.get('ETag'),
+                    last_modified=ts_response.headers.get('Last-Modified'),
+                )
+            return deadline
+        except Exception as e:
+            print(f"タイムシフト視聴期限の取得に失敗: {e}")
+            return UNKNOWN_DEADLINE
+
     def get_all_video_info(self, base_url):
         """
         全ページから動画情報を取得
+        一覧ページ・番組ページはそれぞれ1回ずつだけ取得するため、リクエスト数はアーカイブの件数に比例する
         """
         print(f"動画情報の取得を開始: {base_url}")
         
         all_videos = []
-        total_pages = self.get_total_pages(base_url)
-        
-        print(f"総ページ数: {total_pages}")
-        
-        for page in range(1, total_pages + 1):
-            if page == 1:
-                url = base_url
-            else:
-                separator = '&' if '?' in base_url else '?'
-                url = f"{base_url}{separator}page={page}"
-            
-            print(f"ページ {page}/{total_pages} を処理中: {url}")
-            
-            page_videos = self.extract_video_info_from_page(url)
-            all_videos.extend(page_videos)
-            
-            print(f"ページ {page} から {len(page_videos)} 個の動画情報を取得")
-            
-            # レート制限対策
-            time.sleep(1)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            video_items = self.crawl_list_pages(base_url, executor)
+            print(f"動画アイテム: {len(video_items)} 個")
+
+            # 動画アイテムの解析とタイムシフト視聴期限の取得を並行して行う(結果は元の順序)
+            for video_info in executor.map(self._extract_single_video_info_safely, video_items):
+                print(f"動画情報を抽出: {video_info}")
+                if video_info:
+                    all_videos.append(video_info)
         
+        print(f"リクエスト数: {self.request_count}（待機時間 合計 {self.rate_limiter.total_wait:.1f}秒）")
+        if self.timeshift_cache is not None:
+            stats = self.timeshift_cache.stats
+            print(f"タイムシフト視聴期限キャッシュ: ヒット {stats['hit']}件, 再検証(304) {stats['revalidated']}件, 取得 {stats['fetched']}件")
         return all_videos
 
     def save_to_json(self, video_list, filename=OUTPUT_FILE):
@@ -239,23 +325,49 @@ class NiconicoLiveVideoInfoExtractor:
         """
         try:
             # {"items": []} 形式で保存
-            data = {"items": video_list}
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            data = {"items": serialize_items(video_list)}
+            # 一時ファイルに書き込んでから置き換える（書き込みに失敗しても前回のファイルが残る）
+            write_json_atomic(filename, data)
             print(f"動画情報を {filename} に保存しました")
         except Exception as e:
             print(f"ファイル保存に失敗: {e}")
 
+def parse_args():
+    """
+    コマンドライン引数を解析
+
+    Returns:
+        argparse.Namespace: 解析結果
+    """
+    parser = argparse.ArgumentParser(description="ニコニコ動画ライブ情報取得スクリプト")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help=f'並行して取得するワーカー数（デフォルト: {MAX_WORKERS}）')
+    parser.add_argument('--rate', type=float, default=REQUEST_RATE,
+                        help=f'リクエストレートの上限 リクエスト/秒（デフォルト: {REQUEST_RATE}）')
+    parser.add_argument('--timeshift-horizon-days', type=int, default=DEFAULT_HORIZON_DAYS,
+                        help=f'タイムシフト視聴期限がこの日数より先の番組はキャッシュを再検証する（デフォルト: {DEFAULT_HORIZON_DAYS}）')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='タイムシフト視聴期限のキャッシュを使用しない')
+    parser.add_argument('--parser', choices=available_backends(), default=None,
+                        help=f'HTMLパーサーのバックエンド（デフォルト: {DEFAULT_BACKEND}）')
+    parser.add_argument('--output', default=OUTPUT_FILE,
+                        help=f'出力ファイルのパス（デフォルト: {OUTPUT_FILE}）')
+    return parser.parse_args()
+
 def main():
     """
     メイン実行関数
     """
+    args = parse_args()
+
     # スクリプトの開始時間を記録
     start_time = datetime.now()
 
     print("🎬 ニコニコ動画ライブ情報取得スクリプト")
     
-    extractor = NiconicoLiveVideoInfoExtractor()
+    timeshift_cache = None if args.no_cache else TimeshiftDeadlineCache(horizon_days=args.timeshift_horizon_days)
+    extractor = NiconicoLiveVideoInfoExtractor(max_workers=args.workers, request_rate=args.rate,
+                                               timeshift_cache=timeshift_cache, parser_backend=args.parser)
     
     try:
         # 全動画情報を取得
@@ -264,17 +376,19 @@ def main():
         print(f"\n合計 {len(all_videos)} 個の動画情報を取得しました")
         
         # 結果をJSONファイルに保存
-        extractor.save_to_json(all_videos)
+        extractor.save_to_json(all_videos, args.output)
+        if timeshift_cache is not None:
+            timeshift_cache.save()
         
         # 取得した情報の一部を表示
         if all_videos:
             print("\n取得した動画情報のサンプル:")
             for i, video in enumerate(all_videos[:3]):  # 最初の3件を表示
                 print(f"\n--- 動画 {i+1} ---")
-                print(f"タイトル: {video.get('title', 'N/A')}")
-                print(f"動画URL: {video.get('video_url', 'N/A')}")
-                print(f"サムネイル: {video.get('image', 'N/A')}")
-                print(f"放送開始: {video.get('upload_date', 'N/A')}")
+                print(f"タイトル: {video.title or 'N/A'}")
+                print(f"動画URL: {video.video_url or 'N/A'}")
+                print(f"サムネイル: {video.image or 'N/A'}")
+                print(f"放送開始: {video.upload_date or 'N/A'}")
         
     except Exception as e:
         print(f"エラーが発生しました: {e}")
@@ -18,27 +18,59 @@ Webページ「https://candfans.jp/iu_nyaa」を開き、一番下までスク
 docs/secret_ac.jsonファイルを更新します。
 """
 
-import json
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-import sys
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from json_writer import write_json_atomic
+from typed_fields import build_typed_fields
+from video_item import VideoItem, serialize_items
 
 # 設定
 SECRET_PAGE_URL = "https://candfans.jp/api/contents/get-timeline?user_id=1189871&sort_order=new&post_type[]=1&record=50&page="
 OUTPUT_FILE = "../docs/secret_ac.json"
+# 1ページあたりの件数(SECRET_PAGE_URLのrecord)
+RECORDS_PER_PAGE = int(parse_qs(urlparse(SECRET_PAGE_URL).query).get('record', ['50'])[0])
+# 処理中のページの先に、あらかじめ取得しておくページ数
+PREFETCH_PAGES = 2
+# 取得に失敗した場合のリトライ回数と、初回の待機時間(秒、リトライごとに2倍)
+MAX_RETRIES = 4
+RETRY_BACKOFF = 1.0
 
 class SecretVideoInfoExtractor:
-    def __init__(self):
+    def __init__(self, prefetch_pages=PREFETCH_PAGES, output_file=OUTPUT_FILE):
         """
         コンストラクタ
+
+        args:
+            prefetch_pages (int): 処理中のページの先に、あらかじめ取得しておくページ数
+            output_file (str): 出力ファイルのパス
         """
+        self.output_file = output_file
         self.post_list = []
         self.current_page = 1
+        self.prefetch_pages = prefetch_pages
+        self.request_count = 0
+        self._lock = threading.Lock()
+        # 先読みのリクエストとコネクションプールを共有するセッション
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=prefetch_pages + 1)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
     def get_video_info(self):
         """
         動画情報を取得するメソッド
         {SECRET_PAGE_URL}{ページ数}でリクエストして情報を取得
+        処理中のページの先の prefetch_pages ページをあらかじめ並行して取得し、
+        件数が1ページあたりの件数(record)に満たないページで終了する
 
         args:
             なし
@@ -46,57 +78,91 @@ class SecretVideoInfoExtractor:
             なし
         """
         try:
-            # ページを取得
-            while True:
-                url = f"{SECRET_PAGE_URL}{self.current_page}"
-                res = self.fetch_data(url)
-                data = res.get("data", [])
-                if len(data) == 0:
-                    break
-                for item in data:
-                    post_id = item.get("post_id")
-                    contents_type = item.get("contents_type")
-                    image = ""
-                    if contents_type == 1:  # 画像
-                        image = f'https://image.candfans.jp{item.get("secret_file", "")}'
-                    elif contents_type == 2:  # 動画
-                        image = f'https://video.candfans.jp{item.get("secret_file", "")}'
-                    self.post_list.append({
-                        "title": item.get("title", "タイトル情報なし"),
-                        "video_url": f'https://candfans.jp/posts/comment/show/{post_id}',
-                        "image": image,
-                        "alt": item.get("title", "タイトル情報なし"),
-                        "metadata": [
-                            f'投稿日時: {item.get("post_date", "不明")}',
-                            f'内容: {item.get("contents_text", "内容情報なし")}',
-                            f'閲覧回数: {item.get("attachment_play_count", 0)}',
-                            f'❤x{item.get("like_cnt", 0)}',
-                        ]
-                    })
-                self.current_page += 1
+            with ThreadPoolExecutor(max_workers=self.prefetch_pages + 1) as executor:
+                futures = {}
+                # ページを取得
+                while True:
+                    # 処理中のページと、その先のページの取得を開始
+                    for page in range(self.current_page, self.current_page + self.prefetch_pages + 1):
+                        if page not in futures:
+                            futures[page] = executor.submit(self.fetch_data, f"{SECRET_PAGE_URL}{page}")
+                    res = futures.pop(self.current_page).result()
+                    data = res.get("data", [])
+                    self.append_posts(data)
+                    if len(data) < RECORDS_PER_PAGE:
+                        break
+                    self.current_page += 1
+                # 最後のページより先の先読みは不要
+                for future in futures.values():
+                    future.cancel()
+            print(f"{self.current_page} ページから {len(self.post_list)} 件の投稿情報を取得（リクエスト数: {self.request_count}）")
         except Exception as e:
-            print(f"動画情報の取得に失敗: {e}")
+            # 途中までの投稿情報で前回の出力ファイルを上書きしない
+            print(f"動画情報の取得に失敗: {e}（{self.output_file} は更新しません）")
             raise e
-        finally:
-            self.save_to_json(self.post_list, OUTPUT_FILE)
+        else:
+            self.save_to_json(self.post_list, self.output_file)
+
+    def append_posts(self, data):
+        """
+        タイムラインの1ページ分の投稿を投稿情報のリストに追加するメソッド
+
+        args:
+            data (list): get-timelineのレスポンスのdata
+        returns:
+            なし
+        """
+        for item in data:
+            post_id = item.get("post_id")
+            contents_type = item.get("contents_type")
+            image = ""
+            if contents_type == 1:  # 画像
+                image = f'https://image.candfans.jp{item.get("secret_file", "")}'
+            elif contents_type == 2:  # 動画
+                image = f'https://video.candfans.jp{item.get("secret_file", "")}'
+            self.post_list.append(VideoItem(
+                title=item.get("title", "タイトル情報なし"),
+                video_url=f'https://candfans.jp/posts/comment/show/{post_id}',
+                image=image,
+                alt=item.get("title", "タイトル情報なし"),
+                metadata=[
+                    f'投稿日時: {item.get("post_date", "不明")}',
+                    f'内容: {item.get("contents_text", "内容情報なし")}',
+                    f'閲覧回数: {item.get("attachment_play_count", 0)}',
+                    f'❤x{item.get("like_cnt", 0)}',
+                ],
+                # 型付きフィールド（start_epoch, broadcast_day, duration_seconds, view_count）
+                # post_date は日本時間の "YYYY-MM-DD HH:MM:SS"
+                **build_typed_fields(item.get("post_date"), view_count=item.get("attachment_play_count")),
+            ))
 
     def fetch_data(self, url):
         """
         指定されたURLからデータを取得するメソッド
+        一時的なエラーの場合は待機時間を倍にしながら MAX_RETRIES 回までリトライする
 
         args:
             url (str): データを取得するURL
         returns:
             dict: 取得したデータ
         """
-        import requests
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # HTTPエラーが発生した場合は例外を投げる
-            return response.json()
-        except requests.RequestException as e:
-            print(f"データの取得に失敗: {e}")
-            sys.exit(1)
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                with self._lock:
+                    self.request_count += 1
+                response = self.session.get(url)
+                response.raise_for_status()  # HTTPエラーが発生した場合は例外を投げる
+                return response.json()
+            except (requests.RequestException, ValueError) as e:
+                # 429以外の4xxはリトライしても結果が変わらないため、そのまま失敗とする
+                status = getattr(getattr(e, 'response', None), 'status_code', None)
+                is_client_error = status is not None and 400 <= status < 500 and status != 429
+                if attempt == MAX_RETRIES or is_client_error:
+                    print(f"データの取得に失敗: {e}")
+                    raise e
+                wait = RETRY_BACKOFF * (2 ** attempt)
+                print(f"データの取得に失敗: {e}（{wait:.1f}秒後にリトライ {attempt + 1}/{MAX_RETRIES}）")
+                time.sleep(wait)
 
     def save_to_json(self, post_list, filename=OUTPUT_FILE):
         """
@@ -108,10 +174,10 @@ class SecretVideoInfoExtractor:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
             # {"items": []} 形式で保存
-            data = {"items": post_list}
+            data = {"items": serialize_items(post_list)}
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 一時ファイルに書き込んでから置き換える（書き込みに失敗しても前回のファイルが残る）
+            write_json_atomic(filename, data)
                 
             print(f"投稿情報を {filename} に保存しました")
             
@@ -119,16 +185,32 @@ class SecretVideoInfoExtractor:
             print(f"ファイル保存に失敗: {e}")
 
 
+def parse_args():
+    """
+    コマンドライン引数を解析
+
+    returns:
+        argparse.Namespace: 解析結果
+    """
+    parser = argparse.ArgumentParser(description="ファンサイト動画情報取得スクリプト")
+    parser.add_argument('--prefetch', type=int, default=PREFETCH_PAGES,
+                        help=f'先読みするページ数（デフォルト: {PREFETCH_PAGES}）')
+    parser.add_argument('--output', default=OUTPUT_FILE,
+                        help=f'出力ファイルのパス（デフォルト: {OUTPUT_FILE}）')
+    return parser.parse_args()
+
 def main():
     """
     メイン実行関数
     """
+    args = parse_args()
+
     # スクリプトの開始時間を記録
     start_time = datetime.now()
 
     print("🎬 ファンサイト動画情報取得スクリプト")
 
-    extractor = SecretVideoInfoExtractor()
+    extractor = SecretVideoInfoExtractor(prefetch_pages=args.prefetch, output_file=args.output)
     
     try:
         extractor.get_video_info()
@@ -5,23 +5,81 @@ yt-dlpを使用してuise_iu_asrのYouTubeチャンネルから動画情報を
 docs/youtube.jsonファイルを更新します。
 """
 
+import argparse
+import functools
 import json
 import sys
 import time
 from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
+import math
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree
 import yt_dlp
+from yt_dlp.extractor.youtube import YoutubeIE
+from yt_dlp.utils import NO_DEFAULT
 from pathlib import Path
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import traceback
+from rate_limiter import TokenBucketRateLimiter
+from info_cache import InfoDictCache
+from browser_pool import HeadlessBrowserPool
+from json_writer import write_json_atomic
+from typed_fields import JST, build_typed_fields, find_metadata_value, has_typed_fields, parse_clock_seconds
+from video_item import VideoItem, serialize_items
 
 # 設定
 CHANNEL_URL = "https://www.youtube.com/@uise_iuch"
 OUTPUT_FILE = "../docs/youtube.json"
+# 差分更新の設定
+# 投稿からこの日数以内の動画は再生回数が変動するため毎回詳細情報を再取得する
+RECENT_WINDOW_DAYS = 14
+# addAdditionalClassがこれらの状態の動画は状態が変わりうるため毎回詳細情報を再取得する
+REFRESH_STATES = ('schedule', 'subscriber_only', 'unavailable')
+# 並列取得の設定
+# 詳細情報を同時に取得するワーカー数
+MAX_WORKERS = 4
+# 全ワーカーで共有するHTTPリクエスト数の上限(回/秒)
+# 動画1件ごとではなく、yt-dlpのsleep_interval_requestsと同じくHTTPリクエスト（動画ページ・プレイヤーAPI・コメントページ）ごとに制限する
+# （従来のsleep_intervalはダウンロード時のみ有効で、download=Falseの抽出の間には待機していなかった）
+REQUEST_RATE = 4.0
+# メン限配信の開始日時取得に使用するヘッドレスブラウザの最大数（HTTPでの取得に失敗した場合のみ使用）
+BROWSER_POOL_SIZE = 2
+# 動画ページのHTMLを読み込む単位(バイト)
+WATCH_PAGE_CHUNK_SIZE = 64 * 1024
+# 動画ページ取得時のリクエストヘッダー・Cookie（同意画面を表示させない）
+WATCH_PAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Accept-Language': 'ja,en;q=0.8',
+}
+WATCH_PAGE_COOKIES = {'CONSENT': 'YES+cb', 'SOCS': 'CAI'}
+# ytInitialPlayerResponse内の配信開始日時
+LIVE_START_TIMESTAMP_PATTERN = re.compile(r'"liveBroadcastDetails":\{[^}]*?"startTimestamp":"([^"]+)"')
+# 生の情報辞書キャッシュの設定
+# 直近の動画・配信中/予定枠の情報は変動するため短い有効期限(秒)でキャッシュする
+CACHE_RECENT_TTL = 3600
+# タイムスタンプ収集の設定
+# タイムスタンプコメントの投稿者（この文字列で始まる投稿者のコメントのみ対象）
+TIMESTAMP_AUTHOR_PREFIX = '@あずにゃんch'
+# タイムスタンプ行の時刻部分（H:MM:SS / MM:SS、最初に現れたものを使用）
+TIMESTAMP_TIME_PATTERN = re.compile(r'([0-9]{1,2}):([0-9]{2})(?::([0-9]{2}))?')
+# タイムスタンプコメントの最初の時刻行（時刻の後に"START"を含む）
+TIMESTAMP_START_PATTERN = re.compile(r'[0-9]{1,2}:[0-9]{2}.*START')
+# タイムスタンプを探す際に取得するコメントページ数の上限
+MAX_COMMENT_PAGES = 5
+# YouTubeのコメントAPI 1ページあたりのトップレベルコメント数（削減ページ数の推定に使用）
+COMMENTS_PER_PAGE = 20
+# タイムスタンプ収集時のyt-dlpのエクストラクタ引数（上位順で取得し、返信は取得しない）
+HARVEST_EXTRACTOR_ARGS = {
+    'youtube': {
+        'comment_sort': ['top'],
+        'max_comments': ['all', str(MAX_COMMENT_PAGES * COMMENTS_PER_PAGE), '0'],
+    }
+}
 
 class CustomLogger:
     """カスタムロガークラス"""
@@ -76,15 +134,285 @@ def get_ydl_options():
         'no_warnings': True, # 警告を非表示
         'extract_flat': True,  # 詳細情報も取得
         'ignoreerrors': True,  # エラーが発生しても続行
-        'getcomments': True,  # コメントを取得
+        'getcomments': False,  # コメントはタイムスタンプ収集が必要な動画のみ取得する
         # ロガーを使用する
         'logger': custom_logger,  # カスタムロガーを設定
-        'sleep_interval': 5,  # リクエスト間隔を設定(秒)
-        'max_sleep_interval': 15,  # 最大スリープ間隔
+        # リクエスト間隔はsleep_intervalではなく、ワーカー間で共有するレートリミッターで制御する
         'retries': 3,  # リトライ回数
         'fragment_retries': 3,  # フラグメントリトライ回数
     }
 
+class YoutubeExtractionSession:
+    """
+    yt_dlp.YoutubeDLを使い回す抽出セッション
+    
+    YoutubeDLの生成（エクストラクタの初期化、Cookieの読み込み、プレイヤーJSの取得・解読）は
+    1セッションにつき1回だけ行い、以降の動画ではキャッシュされた状態を再利用する。
+    YoutubeDLはスレッドセーフではないため、ワーカー（スレッド）ごとに1つ作成すること。
+    """
+    def __init__(self, ydl_opts, extractors=None, rate_limiter=None):
+        """
+        Args:
+            ydl_opts (dict): yt-dlpの設定（loggerはセッションごとに新しく作成する）
+            extractors (list): 追加で登録するInfoExtractorのインスタンス（省略可）
+            rate_limiter (TokenBucketRateLimiter): HTTPリクエストごとに取得するレートリミッター（省略可）
+        """
+        self.logger = CustomLogger(verbose=False)
+        self.ydl_opts = {**ydl_opts, 'logger': self.logger}
+        self.ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+        for extractor in extractors or []:
+            self.ydl.add_info_extractor(extractor)
+        self.extract_count = 0
+        if rate_limiter is not None:
+            # エクストラクタのHTTPリクエストはすべてYoutubeDL.urlopenを通るため、ここでリクエスト間隔を制御する
+            urlopen = self.ydl.urlopen
+
+            def rate_limited_urlopen(req):
+                rate_limiter.acquire()
+                return urlopen(req)
+
+            self.ydl.urlopen = rate_limited_urlopen
+
+    def warm_up(self, ie_key='Youtube'):
+        """
+        エクストラクタを事前に初期化する
+        
+        Args:
+            ie_key (str): 初期化するエクストラクタのキー
+        """
+        self.ydl.get_info_extractor(ie_key).initialize()
+
+    def extract(self, url, ie_key=None, **overrides):
+        """
+        URLの情報を取得（ダウンロードはしない）
+        
+        Args:
+            url (str): 取得対象のURL
+            ie_key (str): 使用するエクストラクタのキー（省略時は自動判定）
+            **overrides: この呼び出しのみ上書きするyt-dlpの設定（extract_flat, getcommentsなど）
+        
+        Returns:
+            dict: 取得した情報、失敗時はNone（ignoreerrors有効時）
+        """
+        missing = object()
+        saved_params = {key: self.ydl.params.get(key, missing) for key in overrides}
+        self.ydl.params.update(overrides)
+        try:
+            self.extract_count += 1
+            return self.ydl.extract_info(url, download=False, ie_key=ie_key)
+        finally:
+            # 上書きした設定を元に戻す
+            for key, value in saved_params.items():
+                if value is missing:
+                    self.ydl.params.pop(key, None)
+                else:
+                    self.ydl.params[key] = value
+
+    def close(self):
+        """
+        セッションを終了する
+        """
+        self.ydl.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class WorkerSessionPool:
+    """
+    ワーカー（スレッド）ごとにYoutubeExtractionSessionを1つずつ作成して使い回すプール
+    """
+    def __init__(self, ydl_opts, extractors=None, rate_limiter=None):
+        """
+        Args:
+            ydl_opts (dict): 各セッションに渡すyt-dlpの設定
+            extractors (list): 各セッションに追加で登録するInfoExtractorを返す関数のリスト（省略可）
+            rate_limiter (TokenBucketRateLimiter): 全セッションで共有するレートリミッター（省略可）
+        """
+        self.ydl_opts = ydl_opts
+        self.extractors = extractors or []
+        self.rate_limiter = rate_limiter
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        呼び出し元のスレッド用のセッションを取得（初回のみ作成）
+        
+        Returns:
+            YoutubeExtractionSession: セッション
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            extractors = [factory() for factory in self.extractors]
+            session = YoutubeExtractionSession(self.ydl_opts, extractors, self.rate_limiter)
+            # 最初の動画の抽出前に、使用するエクストラクタを初期化しておく
+            for ie_key in ['Youtube'] + [extractor.ie_key() for extractor in extractors]:
+                try:
+                    session.warm_up(ie_key)
+                except Exception as e:
+                    # 初期化に失敗しても、最初の抽出時にもう一度初期化される
+                    print(f"⚠️ エクストラクタ {ie_key} の事前初期化に失敗しました: {e}", flush=True)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self):
+        """
+        作成したすべてのセッションを終了する
+        """
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+
+class TimestampHarvestYoutubeIE(YoutubeIE):
+    """
+    タイムスタンプ収集用のYouTubeエクストラクタ
+    
+    投稿者のSTARTコメントが見つかった時点、またはトップレベルコメントが
+    MAX_COMMENT_PAGES ページ分に達した時点で、以降のコメントページの取得を打ち切る。
+    """
+    def _configuration_arg(self, key, default=NO_DEFAULT, *, ie_key=None, casesense=False):
+        # エクストラクタ引数は通常のYouTubeエクストラクタと同じ'youtube'キーから読む
+        return super()._configuration_arg(key, default, ie_key=ie_key or 'youtube', casesense=casesense)
+
+    def _real_extract(self, url):
+        info = super()._real_extract(url)
+        # コメント取得後にcomment_countは取得件数で上書きされるため、動画ページ上の総コメント数を退避
+        if isinstance(info, dict):
+            info['total_comment_count'] = info.get('comment_count')
+        return info
+
+    def _get_comments(self, ytcfg, video_id, contents, webpage):
+        max_parent_comments = MAX_COMMENT_PAGES * COMMENTS_PER_PAGE
+        parent_comments = 0
+        for comment in super()._get_comments(ytcfg, video_id, contents, webpage):
+            yield comment
+            # STARTコメントが見つかったら以降のページは取得しない
+            if next(iter_timestamp_lines((comment,)), None) is not None:
+                return
+            if comment.get('parent') == 'root':
+                parent_comments += 1
+                if parent_comments >= max_parent_comments:
+                    return
+
+class CommentHarvestStats:
+    """
+    タイムスタンプ収集の集計（スレッドセーフ）
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.harvested = 0  # コメントを取得した動画数
+        self.found = 0  # タイムスタンプが見つかった動画数
+        self.skipped = 0  # 前回のタイムスタンプを引き継いだためコメントを取得しなかった動画数
+        self.pages_fetched = 0  # 取得したコメントページ数（推定）
+        self.pages_saved = 0  # 打ち切りにより取得しなかったコメントページ数（推定）
+
+    def record_harvest(self, video_info, found):
+        """
+        コメントを取得した動画の結果を記録
+        
+        Args:
+            video_info (dict): コメントを含む詳細な動画情報
+            found (bool): タイムスタンプが見つかった場合True
+        """
+        parent_comments = sum(1 for comment in video_info.get('comments') or [] if comment.get('parent') == 'root')
+        pages_fetched = max(1, math.ceil(parent_comments / COMMENTS_PER_PAGE))
+        pages_total = math.ceil((video_info.get('total_comment_count') or 0) / COMMENTS_PER_PAGE)
+        with self._lock:
+            self.harvested += 1
+            self.found += int(found)
+            self.pages_fetched += pages_fetched
+            self.pages_saved += max(0, pages_total - pages_fetched)
+
+    def record_skip(self):
+        """
+        コメントを取得しなかった動画を記録
+        """
+        with self._lock:
+            self.skipped += 1
+
+    def summary(self):
+        """
+        Returns:
+            str: 集計結果の表示用文字列
+        """
+        return (
+            f"コメント取得 {self.harvested} 件（タイムスタンプ発見 {self.found} 件）、"
+            f"引き継ぎ {self.skipped} 件、取得ページ数 約{self.pages_fetched}、削減ページ数 約{self.pages_saved}"
+        )
+
+def iter_timestamp_lines(comments):
+    """
+    コメントからタイムスタンプの行を順に取り出す
+    コメントは1件ずつ処理するため、イテレータ（yt-dlpのコメント取得中のジェネレータなど）もそのまま渡せる
+    
+    Args:
+        comments (iterable): コメント情報（{"author": str, "text": str, ...}）のイテラブル
+    
+    Yields:
+        tuple: (行の文字列, 行の時刻部分のre.Match)
+    """
+    for comment in comments:
+        # "author": "@あずにゃんch" のコメント以外は本文を見ずにスキップ
+        author = comment.get('author')
+        if not author or not author.startswith(TIMESTAMP_AUTHOR_PREFIX):
+            continue
+        is_first = True
+        # 本文を改行で分割し、時刻を含む行を抽出
+        for line in (comment.get('text') or '').splitlines():
+            match = TIMESTAMP_TIME_PATTERN.search(line)
+            if match is None:
+                continue
+            # 最初の時刻行が"START"を含まないコメントはスキップ
+            if is_first:
+                if not TIMESTAMP_START_PATTERN.search(line, match.start()):
+                    break
+                is_first = False
+            yield line, match
+
+def to_timestamp_entry(line, match=None):
+    """
+    タイムスタンプの行を構造化する
+    
+    Args:
+        line (str): タイムスタンプの行
+        match (re.Match): 行の時刻部分（省略時は検索する）
+    
+    Returns:
+        dict: {"seconds": int(動画の先頭からの秒数), "label": str(表示用の行)}、時刻がない場合はNone
+    """
+    if match is None:
+        match = TIMESTAMP_TIME_PATTERN.search(line)
+        if match is None:
+            return None
+    first, second, third = match.groups()
+    if third is None:
+        # MM:SS 形式
+        seconds = int(first) * 60 + int(second)
+    else:
+        # H:MM:SS 形式
+        seconds = int(first) * 3600 + int(second) * 60 + int(third)
+    return {'seconds': seconds, 'label': line.strip()}
+
+def parse_timestamp_entries(timestamps):
+    """
+    タイムスタンプの行のリストを構造化する（前回の出力から引き継いだタイムスタンプ用）
+    
+    Args:
+        timestamps (list): タイムスタンプの行のリスト
+    
+    Returns:
+        list: [{"seconds": int, "label": str}, ...]
+    """
+    entries = (to_timestamp_entry(line) for line in timestamps)
+    return [entry for entry in entries if entry is not None]
+
 def extract_timestamps_from_comments(video_info):
     """
     動画のコメントからタイムスタンプ情報を抽出
@@ -93,42 +421,35 @@ def extract_timestamps_from_comments(video_info):
         video_info (dict): 動画情報
     
     Returns:
-        list: タイムスタンプのリスト
+        tuple: (タイムスタンプの行のリスト, [{"seconds": int, "label": str}, ...])
     """
-    # コメント情報から"author": "@あずにゃんch"の"text"を取得
-    raw_az_texts = [
-        comment['text'] for comment in video_info.get('comments', [])
-        if 'author' in comment and comment['author'].startswith('@あずにゃんch')
-    ]
-    
     timestamps = []
-    # "text"を改行\n\rで配列化し、[0-9]{1,2}:[0-9]{2}.*と一致するものを抽出
-    for raw_az_text in raw_az_texts:
-        # 改行で分割
-        rn_az_texts = raw_az_text.splitlines()
-        # ".*[0-9]{1,2}:[0-9]{2}.*"と一致する行を抽出
-        rn_az_texts = [text for text in rn_az_texts if re.match(r'.*[0-9]{1,2}:[0-9]{2}.*', text)]
-        # 最初の行が"[0-9]{1,2}:[0-9]{2}.*START.*"と一致していなかったらスキップ
-        if not rn_az_texts or not re.match(r'.*[0-9]{1,2}:[0-9]{2}.*START.*', rn_az_texts[0]):
-            continue
-        timestamps.extend(rn_az_texts)
-    
-    return timestamps
+    entries = []
+    for line, match in iter_timestamp_lines(video_info.get('comments') or ()):
+        timestamps.append(line)
+        entries.append(to_timestamp_entry(line, match))
+    return timestamps, entries
 
-def get_detailed_video_info(video_id, ydl_opts):
+def get_detailed_video_info(video_id, session, harvest_comments=False):
     """
     個別動画の詳細情報を取得（リトライ機能付き）
     
     Args:
         video_id (str): 動画ID
-        ydl_opts (dict): yt-dlpの設定
+        session (YoutubeExtractionSession): 呼び出し元ワーカーの抽出セッション（HTTPリクエストはセッションのレートリミッターで制限）
+        harvest_comments (bool): タイムスタンプ収集のためにコメントも取得する場合True
     
     Returns:
         dict: 動画の詳細情報、失敗時はNone
     """
-    # 個別動画用のyt-dlp設定
-    video_ydl_opts = ydl_opts.copy()
-    video_ydl_opts['extract_flat'] = False  # 詳細情報を取得
+    # 前の動画のエラーメッセージが残らないようにクリア
+    session.logger.clear_messages()
+    
+    ie_key = None
+    overrides = {'extract_flat': False}  # 詳細情報を取得
+    if harvest_comments:
+        ie_key = TimestampHarvestYoutubeIE.ie_key()
+        overrides.update(getcomments=True, extractor_args=HARVEST_EXTRACTOR_ARGS)
     
     video_info = None
     for attempt in range(3):  # 3回まで再試行
@@ -136,11 +457,11 @@ def get_detailed_video_info(video_id, ydl_opts):
             if attempt > 0:
                 print(f"    リトライ中... 試行 {attempt + 1}/3")
 
-            with yt_dlp.YoutubeDL(video_ydl_opts) as video_ydl:
-                video_info = video_ydl.extract_info(
-                    f"https://www.youtube.com/watch?v={video_id}", 
-                    download=False
-                )
+            video_info = session.extract(
+                f"https://www.youtube.com/watch?v={video_id}",
+                ie_key=ie_key,
+                **overrides
+            )
             break  # 成功したらループを抜ける
         except Exception as retry_error:
             print(f"    試行 {attempt + 1}/3 失敗: {str(retry_error)}")
@@ -151,7 +472,7 @@ def get_detailed_video_info(video_id, ydl_opts):
     
     if video_info is None:
         # ロガーからの情報を取得
-        logger = video_ydl_opts['logger']
+        logger = session.logger
         # 最新のエラーログメッセージを取得
         latest_error = logger.get_latest_error()
         if latest_error:
@@ -171,10 +492,10 @@ def create_video_data_from_detailed_info(video_info, video_id):
         video_id (str): 動画ID
     
     Returns:
-        dict: 整形された動画データ
+        VideoItem: 整形された動画データ
     """
     # コメントからタイムスタンプ情報を抽出
-    timestamps = extract_timestamps_from_comments(video_info)
+    timestamps, timestamp_entries = extract_timestamps_from_comments(video_info)
     # タイトルからタグ情報を抽出
     title = video_info.get('title', '')
     # upload_dateの取得
@@ -184,24 +505,28 @@ def create_video_data_from_detailed_info(video_info, video_id):
     # タグを重複なく保持
     tags = list(set(tags))
     
-    return {
-        "title": title,
-        "image": f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
-        "alt": video_info.get('title', 'タイトル不明'),
-        "description": video_info.get('description', '')[:100] + "..." if video_info.get('description') else "説明なし",
-        "videoId": video_id,
-        "video_url": f"https://www.youtube.com/watch?v={video_id}",
-        "tags": tags,
-        "view_count": video_info.get('view_count', 0),
-        "upload_date": upload_date,
-        "timestamps": timestamps,
-        "metadata": [
+    return VideoItem(
+        title=title,
+        image=f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
+        alt=video_info.get('title', 'タイトル不明'),
+        description=video_info.get('description', '')[:100] + "..." if video_info.get('description') else "説明なし",
+        video_id=video_id,
+        video_url=f"https://www.youtube.com/watch?v={video_id}",
+        tags=tags,
+        upload_date=upload_date,
+        timestamps=timestamps,
+        timestamp_entries=timestamp_entries,
+        metadata=[
             f"再生時間: {format_duration(video_info.get('duration', 0))}",
             f"視聴回数: {format_view_count(video_info.get('view_count', 0))}",
             f"投稿日: {upload_date}"
         ],
-        "addAdditionalClass": [video_info.get('availability', '')],  # "availability": "subscriber_only"なら"subscriber_only", それ以外は"-"
-    }
+        add_additional_class=[video_info.get('availability', '')],  # "availability": "subscriber_only"なら"subscriber_only", それ以外は"-"
+        # 型付きフィールド（start_epoch, broadcast_day, duration_seconds, view_count）
+        **build_typed_fields(
+            video_info.get('release_timestamp'), video_info.get('duration'), video_info.get('view_count', 0)
+        ),
+    )
 
 def to_update_timestamp(timestamp):
     """
@@ -232,18 +557,124 @@ def to_update_timestamp(timestamp):
         return ""
 
 
-def get_live_date_info(video_url: str) -> str:
+@functools.lru_cache(maxsize=None)
+def get_watch_page_session():
+    """
+    動画ページ取得用のHTTPセッションを取得（1回の実行で共有し、接続を使い回す）
+    
+    Returns:
+        requests.Session: HTTPセッション
+    """
+    session = requests.Session()
+    session.headers.update(WATCH_PAGE_HEADERS)
+    session.cookies.update(WATCH_PAGE_COOKIES)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+    session.mount('https://', adapter)
+    return session
+
+def parse_live_date_from_watch_page(chunks):
+    """
+    動画ページのHTMLを先頭から順に解析し、配信開始日時を取得
+    #watch7-content のmetaタグ(startDate)が見つかった時点で以降の読み込みを打ち切る
+    startDateがない場合は ytInitialPlayerResponse の liveBroadcastDetails.startTimestamp、
+    それもない場合はmetaタグの uploadDate を使用する
+    
+    Args:
+        chunks (iterable): HTMLのバイト列を順に返すイテラブル
+    
+    Returns:
+        str: 配信開始日時(UTCのISO形式)、取得できない場合はNone
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    start_timestamp = None
+    upload_date = None
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == 'start' and element.tag == 'meta':
+                itemprop = element.get('itemprop')
+                if itemprop == 'startDate' and element.get('content'):
+                    return to_utc_isoformat(element.get('content'))
+                if itemprop == 'uploadDate' and element.get('content'):
+                    upload_date = element.get('content')
+            elif event == 'end' and element.tag == 'script' and start_timestamp is None:
+                match = LIVE_START_TIMESTAMP_PATTERN.search(element.text or '')
+                if match:
+                    start_timestamp = match.group(1)
+    if start_timestamp:
+        return to_utc_isoformat(start_timestamp)
+    if upload_date:
+        return to_utc_isoformat(upload_date)
+    return None
+
+def to_utc_isoformat(date_str):
+    """
+    タイムゾーン付きの日時文字列をUTCのISO形式に変換（to_update_timestampで日本時間に変換するため）
+    
+    Args:
+        date_str (str): 日時文字列
+    
+    Returns:
+        str: UTCのISO形式の日時文字列
+    """
+    dt = datetime.fromisoformat(date_str)
+    if dt.tzinfo is None:
+        return dt.isoformat()
+    return dt.astimezone(timezone.utc).isoformat()
+
+def fetch_live_date_from_watch_page(video_url):
+    """
+    ブラウザを使わずに、動画ページのHTMLから配信開始日時を取得
+    
+    Args:
+        video_url (str): YouTube動画のURL
+    
+    Returns:
+        str: 配信開始日時(UTCのISO形式)、取得できない場合はNone
+    """
+    try:
+        with get_watch_page_session().get(video_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            return parse_live_date_from_watch_page(response.iter_content(WATCH_PAGE_CHUNK_SIZE))
+    except (requests.RequestException, ValueError) as e:
+        print(f"   → △ HTTPでの配信開始日時の取得に失敗: {e}", flush=True)
+        return None
+
+def get_live_date_info(video_url: str, browser_pool: HeadlessBrowserPool = None) -> str:
     """
     メンバー限定配信の開始日時はyt-dlpでは取得できないため、
+    youtube動画ページのHTMLから配信開始日時を取得
+    HTTPでの取得に失敗した場合のみ、ブラウジングして取得する
+    
+    Args:
+        video_url (str): YouTube動画のURL
+        browser_pool (HeadlessBrowserPool): ブラウジング時に使い回すブラウザのプール（省略時はこの呼び出し用に1つ起動）
+    Returns:
+        str: 配信開始日時(UTCのISO形式)
+    """
+    start_time = fetch_live_date_from_watch_page(video_url)
+    if start_time:
+        print(f"   → ✓ 動画ページのHTMLから配信開始日時を取得しました: {video_url}", flush=True)
+        return start_time
+
+    if browser_pool is None:
+        with HeadlessBrowserPool(size=1) as temporary_pool:
+            return get_live_date_info_by_browser(video_url, temporary_pool)
+    return get_live_date_info_by_browser(video_url, browser_pool)
+
+def get_live_date_info_by_browser(video_url: str, browser_pool: HeadlessBrowserPool) -> str:
+    """
     youtube動画サイトにブラウジングして、配信開始日時を取得
     どちらかのセレクタから取得
     #watch7-content > span:nth-child(22) > meta:nth-child(2)
     #watch7-content > meta:nth-child(19)
     Args:
         video_url (str): YouTube動画のURL
+        browser_pool (HeadlessBrowserPool): 使い回すブラウザのプール
     Returns:
-        str: 配信開始日時
+        str: 配信開始日時(UTCのISO形式)
     """
+
     # youtube動画サイト(video_url)にブラウジングアクセス
 
     # 想定されるセレクタリストを定義
@@ -256,33 +687,28 @@ def get_live_date_info(video_url: str) -> str:
     ]
 
     print(f"   → ✓ ブラウジングで開始日時を取得中: {video_url}", flush=True)
-    # SeleniumのWebDriverを使用してブラウジング
-    options = Options()
-    options.add_argument("--headless")  # ヘッドレスモードを使用
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
+    # プールのヘッドレスブラウザを使用してブラウジング
     for attempt in range(3):
         try:
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-            driver.get(video_url)
+            with browser_pool.acquire() as driver:
+                driver.get(video_url)
 
-            # セレクタを順に試して配信開始日時を取得
-            for sel in selectors:
-                try:
-                    start_time_element = driver.find_element("css selector", sel)
-                    start_time = start_time_element.get_attribute("content")
+                # セレクタを順に試して配信開始日時を取得
+                for sel in selectors:
+                    try:
+                        start_time_element = driver.find_element("css selector", sel)
+                        start_time = start_time_element.get_attribute("content")
 
-                    driver.quit()
-                    if not start_time:
-                        print(f"     ┣ セレクタ '{sel}' で配信開始日時が取得できませんでした。", flush=True)
-                        continue
-                    print(f"    → ✓ セレクタ '{sel}' で配信開始日時を取得しました。", flush=True)
-                    return start_time
+                        if not start_time:
+                            print(f"     ┣ セレクタ '{sel}' で配信開始日時が取得できませんでした。", flush=True)
+                            continue
+                        # HTTPでの取得と同じくUTCに変換（metaのcontentはチャンネルのタイムゾーンのオフセット付き）
+                        start_time = to_utc_isoformat(start_time)
+                        print(f"    → ✓ セレクタ '{sel}' で配信開始日時を取得しました。", flush=True)
+                        return start_time
 
-                except Exception as e:
-                    print(f"     ┣ セレクタ '{sel}' での取得に失敗しました。", flush=True)
-            driver.quit()
+                    except Exception as e:
+                        print(f"     ┣ セレクタ '{sel}' での取得に失敗しました。", flush=True)
             print(f"     ┗ ✗ すべてのセレクタで配信開始日時の取得に失敗しました。", flush=True)
         except Exception as e:
             print(f"   → △ ブラウジング試行 {attempt+1}/3 でエラー: {e}", flush=True)
@@ -292,15 +718,16 @@ def get_live_date_info(video_url: str) -> str:
     print("❌ 3回試行しても配信開始日時の取得に失敗しました。", flush=True)
     raise Exception("failed get_live_date_info")
 
-def create_video_data_from_basic_info(entry):
+def create_video_data_from_basic_info(entry, browser_pool=None):
     """
     基本的な動画情報から動画データを作成（詳細取得失敗時用）
     
     Args:
         entry (dict): 基本的な動画情報
+        browser_pool (HeadlessBrowserPool): メン限配信の開始日時取得に使うブラウザのプール（省略可）
     
     Returns:
-        dict: 整形された動画データ
+        VideoItem: 整形された動画データ
     """
     video_id = entry['id']
     
@@ -310,7 +737,9 @@ def create_video_data_from_basic_info(entry):
 
     title = entry.get('title', 'タイトル不明')
     video_url = entry.get('url', f"https://www.youtube.com/watch?v={video_id}")
-    upload_date = to_update_timestamp(entry.get('release_timestamp', ''))
+    start = entry.get('release_timestamp')
+    start_tz = JST
+    upload_date = to_update_timestamp(start or '')
 
     # 「#」で始まるタグを抽出
     tags = re.findall(r'#(\w+) ', title)
@@ -318,49 +747,99 @@ def create_video_data_from_basic_info(entry):
     if availability == 'subscriber_only':
         add_class = ['subscriber_only']
         tags.append('#メン限')
-        upload_date = to_update_timestamp(get_live_date_info(video_url))
+        start = get_live_date_info(video_url, browser_pool)
+        # get_live_date_infoはUTCの日時を返す（タイムゾーンがない場合もUTC）
+        start_tz = timezone.utc
+        upload_date = to_update_timestamp(start)
     elif entry.get('live_status') == 'is_upcoming':
         add_class = ['schedule']
     else:
         add_class = ['unavailable']
     
-    return {
-        "title": title,
-        "image": f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
-        "alt": entry.get('title', 'タイトル不明'),
-        "description": entry.get('description')[:100] + "..." if entry.get('description') else "説明なし",
-        "videoId": video_id,
-        "video_url": video_url,
-        "upload_date": upload_date,
-        "addAdditionalClass": add_class,
-        "metadata": [
+    return VideoItem(
+        title=title,
+        image=f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg",
+        alt=entry.get('title', 'タイトル不明'),
+        description=entry.get('description')[:100] + "..." if entry.get('description') else "説明なし",
+        video_id=video_id,
+        video_url=video_url,
+        upload_date=upload_date,
+        add_additional_class=add_class,
+        metadata=[
             f"投稿日: {upload_date}",
-        ]
-    }
+        ],
+        # 型付きフィールド（start_epoch, broadcast_day, duration_seconds, view_count）
+        **build_typed_fields(start, entry.get('duration'), entry.get('view_count'), naive_tz=start_tz),
+    )
+
+def get_cache_ttl(video_info):
+    """
+    生の情報辞書をキャッシュする際の有効期限を決定
+    配信中・配信予定の枠は0秒（再生成用に保存のみ）、直近の動画は短い有効期限とする
+    
+    Args:
+        video_info (dict): 詳細な動画情報
+    
+    Returns:
+        int: 有効期限(秒)、Noneの場合はキャッシュのデフォルト値
+    """
+    if video_info.get('live_status') in ('is_live', 'is_upcoming', 'post_live'):
+        return 0
+    released_at = video_info.get('release_timestamp') or video_info.get('timestamp')
+    if not released_at or time.time() - released_at <= RECENT_WINDOW_DAYS * 24 * 3600:
+        return CACHE_RECENT_TTL
+    return None
 
-def process_video_entry(entry, ydl_opts):
+def process_video_entry(entry, session, info_cache=None, previous_item=None, harvest_stats=None,
+                        browser_pool=None):
     """
     個別の動画エントリを処理
+    前回の出力にタイムスタンプがない動画のみ、コメントを取得してタイムスタンプを収集する
     
     Args:
         entry (dict): 動画エントリ情報
-        ydl_opts (dict): yt-dlpの設定
+        session (YoutubeExtractionSession): 呼び出し元ワーカーの抽出セッション
+        info_cache (InfoDictCache): 生の情報辞書のキャッシュ（省略可）
+        previous_item (VideoItem): 前回の動画データ（省略可）
+        harvest_stats (CommentHarvestStats): タイムスタンプ収集の集計（省略可）
+        browser_pool (HeadlessBrowserPool): メン限配信の開始日時取得に使うブラウザのプール（省略可）
     
     Returns:
-        dict: 処理された動画データ
+        VideoItem: 処理された動画データ
     """
     video_id = entry['id']
+    previous_timestamps = (previous_item.timestamps if previous_item is not None else None) or []
+    harvest_comments = not previous_timestamps
     
     try:
-        # 個別の動画情報を取得（エラーハンドリング強化）
-        print(f"動画ID {video_id} の詳細情報を取得中...")
-        
-        video_info = get_detailed_video_info(video_id, ydl_opts)
+        # 有効期限内のキャッシュがあればネットワークに接続せずに使用
+        video_info = info_cache.get(video_id) if info_cache is not None else None
+        if video_info is not None and harvest_comments and 'comments' not in video_info:
+            # タイムスタンプ収集が必要だがキャッシュにコメントが含まれていない
+            video_info = None
+        if video_info is not None:
+            print(f"動画ID {video_id} の詳細情報をキャッシュから取得しました")
+        else:
+            # 個別の動画情報を取得（エラーハンドリング強化）
+            print(f"動画ID {video_id} の詳細情報を取得中...")
+            
+            video_info = get_detailed_video_info(video_id, session, harvest_comments)
+            if info_cache is not None:
+                info_cache.put(video_id, yt_dlp.YoutubeDL.sanitize_info(video_info), get_cache_ttl(video_info))
 
         # 動画情報を整形
         video_data = create_video_data_from_detailed_info(video_info, video_id)
+        if harvest_comments:
+            if harvest_stats is not None:
+                harvest_stats.record_harvest(video_info, bool(video_data.timestamps))
+        else:
+            # コメントを取得していないため前回のタイムスタンプを引き継ぐ
+            video_data.timestamps = previous_timestamps
+            video_data.timestamp_entries = parse_timestamp_entries(previous_timestamps)
+            if harvest_stats is not None:
+                harvest_stats.record_skip()
         
-        print(f"  → ✓ 取得完了: {video_data.get('title', 'タイトル不明')} (ID: {video_id})")
+        print(f"  → ✓ 取得完了: {video_data.title or 'タイトル不明'} (ID: {video_id})")
         return video_data
         
     except Exception as e: 
@@ -376,22 +855,186 @@ def process_video_entry(entry, ydl_opts):
             print(f"  → ✗ 詳細情報取得失敗: ID: {video_id} - {error_message}")
         print(f"    → 基本情報のみで処理を続行します")
         
-        return create_video_data_from_basic_info(entry)
+        return create_video_data_from_basic_info(entry, browser_pool)
 
-def get_video_info(channel_url):
+def load_previous_videos(output_file, info_cache=None):
+    """
+    前回出力したJSONファイルを読み込み、videoIdをキーにした辞書を作成
+    
+    Args:
+        output_file (str): 前回の出力ファイルパス
+        info_cache (InfoDictCache): 型付きフィールドの移行に使う生の情報辞書のキャッシュ（省略可）
+    
+    Returns:
+        dict: {videoId: VideoItem}、読み込めない場合は空の辞書
+    """
+    try:
+        with open(output_file, 'r', encoding='utf-8') as f:
+            previous_data = json.load(f)
+    except FileNotFoundError:
+        print(f"前回の出力ファイル {output_file} が見つかりません。すべての動画の詳細情報を取得します。")
+        return {}
+    except json.JSONDecodeError:
+        print(f"前回の出力ファイル {output_file} の読み込みに失敗しました。すべての動画の詳細情報を取得します。")
+        return {}
+
+    previous_videos = {}
+    migrate_count = 0
+    for item in previous_data.get('items', []):
+        if not item.get('videoId'):
+            continue
+        # 型付きフィールドがない前回のデータは、キャッシュの情報辞書のUNIX時間から作成する
+        # （upload_date は実行環境のタイムゾーンで書かれているため使わない。キャッシュがない動画はフィールドなしのまま詳細情報を再取得する）
+        if not has_typed_fields(item):
+            video_info = info_cache.get(item['videoId'], allow_expired=True) if info_cache is not None else None
+            start = (video_info.get('release_timestamp') or video_info.get('timestamp')) if video_info else None
+            if start:
+                duration = video_info.get('duration')
+                if duration is None:
+                    duration = parse_clock_seconds(find_metadata_value(item.get('metadata'), '再生時間'))
+                item.update(build_typed_fields(start, duration, item.get('view_count')))
+            else:
+                migrate_count += 1
+        previous_videos[item['videoId']] = VideoItem.from_dict(item)
+    if migrate_count:
+        print(f"型付きフィールドがなく、キャッシュからも作成できない前回の動画 {migrate_count} 件は詳細情報を再取得します。")
+    return previous_videos
+
+def needs_detailed_refresh(previous_item, recent_window_days):
+    """
+    前回の動画データから詳細情報の再取得が必要かを判定
+    
+    Args:
+        previous_item (VideoItem): 前回の動画データ（存在しない場合はNone）
+        recent_window_days (int): 再生回数が変動するとみなす投稿からの日数
+    
+    Returns:
+        bool: 再取得が必要な場合True
+    """
+    # 新しい動画
+    if previous_item is None:
+        return True
+    # 放送予定枠・メン限・取得失敗など、状態が変わりうる動画
+    if any(state in REFRESH_STATES for state in previous_item.add_additional_class or []):
+        return True
+    # 投稿日時が不明な動画（型付きフィールドを移行できなかった前回のデータを含む）
+    upload_date = previous_item.upload_date or ''
+    if not upload_date or previous_item.start_epoch is None:
+        return True
+    try:
+        uploaded_at = datetime.fromisoformat(upload_date).replace(tzinfo=None)
+    except ValueError:
+        return True
+    # 直近に投稿された動画
+    return datetime.now() - uploaded_at <= timedelta(days=recent_window_days)
+
+def process_entries(entries, session_pool, executor, previous_videos=None, recent_window_days=RECENT_WINDOW_DAYS,
+                    max_workers=MAX_WORKERS, info_cache=None, harvest_stats=None,
+                    browser_pool=None, full_refresh=False):
+    """
+    チャンネル一覧のエントリをワーカープールで並列に処理
+    previous_videosが指定された場合は、再取得が不要な動画の前回データを引き継ぐ
+    （full_refreshの場合はすべて再取得し、前回データはタイムスタンプの引き継ぎにのみ使用する）
+    結果はチャンネル一覧の順序を保持する
+    
+    Args:
+        entries (list): チャンネル一覧のエントリ
+        session_pool (WorkerSessionPool): ワーカーごとの抽出セッションのプール
+        executor (ThreadPoolExecutor): ワーカープール（配信一覧・動画一覧で共有し、ワーカーのセッションを使い回す）
+        previous_videos (dict): 前回の動画データ {videoId: VideoItem}、Noneの場合はすべて取得
+        recent_window_days (int): 再生回数が変動するとみなす投稿からの日数
+        max_workers (int): executor のワーカー数（表示用）
+        info_cache (InfoDictCache): 生の情報辞書のキャッシュ（省略可）
+        harvest_stats (CommentHarvestStats): タイムスタンプ収集の集計（省略可）
+        browser_pool (HeadlessBrowserPool): メン限配信の開始日時取得に使うブラウザのプール（省略可）
+        full_refresh (bool): 前回データを引き継がず、すべての動画の詳細情報を再取得する場合True
+    
+    Returns:
+        tuple: (動画情報のリスト（処理に失敗し、前回データもない動画は含まない）, 前回データを引き継いだ件数)
+    """
+    entries = [entry for entry in entries if entry and 'id' in entry]
+    results = [None] * len(entries)
+    carried_count = 0
+    
+    # 再取得が必要な動画を振り分け
+    targets = []
+    for index, entry in enumerate(entries):
+        previous_item = None
+        if previous_videos is not None:
+            previous_item = previous_videos.get(entry['id'])
+            if not full_refresh and not needs_detailed_refresh(previous_item, recent_window_days):
+                results[index] = previous_item
+                carried_count += 1
+                continue
+        targets.append((index, entry, previous_item))
+    
+    print(f"詳細情報を取得する動画数: {len(targets)}（同時実行数: {max_workers}）")
+    
+    def process_in_worker(entry, previous_item):
+        # ワーカーのスレッド上でセッションを取得し、以降の動画でも使い回す
+        return process_video_entry(
+            entry, session_pool.get(), info_cache, previous_item, harvest_stats, browser_pool
+        )
+    
+    futures = {
+        executor.submit(process_in_worker, entry, previous_item): index
+        for index, entry, previous_item in targets
+    }
+    previous_items = {index: previous_item for index, _, previous_item in targets}
+    done = 0
+    failed = 0
+    for future in as_completed(futures):
+        index = futures[future]
+        try:
+            results[index] = future.result()
+        except Exception as e:
+            # 基本情報での整形（メン限配信の開始日時の取得など）にも失敗した動画は、
+            # 一覧全体を失わないように前回のデータを引き継ぐか、今回の出力から除外する
+            failed += 1
+            results[index] = previous_items[index]
+            fallback = "前回の情報を引き継ぎます" if results[index] is not None else "今回の出力から除外します"
+            print(f"  → ✗ 動画の処理に失敗: ID {entries[index]['id']} - {e}（{fallback}）", flush=True)
+        done += 1
+        print(f"  [{done}/{len(targets)}] 処理完了: ID {entries[index]['id']}", flush=True)
+    if failed:
+        print(f"⚠️ 処理に失敗した動画: {failed} 件")
+    
+    return [result for result in results if result is not None], carried_count
+
+def get_video_info(channel_url, previous_videos=None, recent_window_days=RECENT_WINDOW_DAYS,
+                   max_workers=MAX_WORKERS, request_rate=REQUEST_RATE, info_cache=None,
+                   browser_pool_size=BROWSER_POOL_SIZE, full_refresh=False):
     """
     YouTubeチャンネルから動画情報を取得
     
     Args:
         channel_url (str): YouTubeチャンネルのURL
+        previous_videos (dict): 前回の動画データ {videoId: VideoItem}、Noneの場合は差分更新しない
+        recent_window_days (int): 再生回数が変動するとみなす投稿からの日数
+        max_workers (int): 同時に詳細情報を取得するワーカー数
+        request_rate (float): 全ワーカーで共有するリクエスト数の上限(回/秒)
+        info_cache (InfoDictCache): 生の情報辞書のキャッシュ（省略可）
+        browser_pool_size (int): メン限配信の開始日時取得に使うヘッドレスブラウザの最大数
+        full_refresh (bool): すべての動画の詳細情報を再取得する場合True（previous_videosのタイムスタンプは引き継ぐ）
     
     Returns:
         list: 動画情報のリスト
     """
     
     ydl_opts = get_ydl_options()
+    # 配信一覧・動画一覧の両方で共有するレートリミッター（各セッションのHTTPリクエストごとに取得）
+    rate_limiter = TokenBucketRateLimiter(request_rate)
+    # ワーカーごとの抽出セッション（配信一覧・動画一覧の両方で同じワーカーが使い回す）
+    session_pool = WorkerSessionPool(ydl_opts, [TimestampHarvestYoutubeIE], rate_limiter)
+    # 配信一覧・動画一覧の両方で共有するワーカープール（セッションはワーカーのスレッドごとに1つ）
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    harvest_stats = CommentHarvestStats()
+    # メン限配信の開始日時取得用のブラウザ（必要になった時点で起動し、実行中は使い回す）
+    browser_pool = HeadlessBrowserPool(browser_pool_size)
     
     videos = []
+    carried_total = 0
+    completed = False
     
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
@@ -402,16 +1045,13 @@ def get_video_info(channel_url):
             info = ydl.extract_info(f'{channel_url}/streams', download=False)
             
             if 'entries' in info:
-                len_entries = len(info['entries'])
-                print(f"発見された動画数: {len_entries}")
-                
-                cnt = 0
-                for entry in info['entries']:
-                    cnt += 1
-                    print(f"{cnt}/{len_entries}", end="", flush=True)
-                    if entry and 'id' in entry:
-                        video_data = process_video_entry(entry, ydl_opts)
-                        videos.append(video_data)
+                print(f"発見された動画数: {len(info['entries'])}")
+                stream_videos, carried_count = process_entries(
+                    info['entries'], session_pool, executor, previous_videos, recent_window_days,
+                    max_workers, info_cache, harvest_stats, browser_pool, full_refresh
+                )
+                videos.extend(stream_videos)
+                carried_total += carried_count
             else:
                 print("チャンネルに配信が見つかりませんでした。")
 
@@ -423,24 +1063,69 @@ def get_video_info(channel_url):
                 print(f"動画一覧の取得に失敗しました: {str(e)}")
 
             if info is not None and 'entries' in info.keys():
-                len_entries = len(info['entries'])
-                print(f"発見された動画数: {len_entries}")
-                
-                cnt = 0
-                for entry in info['entries']:
-                    cnt += 1
-                    print(f"{cnt}/{len_entries}", end="", flush=True)
-                    if entry and 'id' in entry:
-                        video_data = process_video_entry(entry, ydl_opts)
-                        videos.append(video_data)
+                print(f"発見された動画数: {len(info['entries'])}")
+                upload_videos, carried_count = process_entries(
+                    info['entries'], session_pool, executor, previous_videos, recent_window_days,
+                    max_workers, info_cache, harvest_stats, browser_pool, full_refresh
+                )
+                videos.extend(upload_videos)
+                carried_total += carried_count
 
             else:
                 print("チャンネルに動画が見つかりませんでした。")
+        completed = True
                 
     except Exception as e:
         print(f"エラーが発生しました: {str(e)}")
         traceback.print_exc()
+    finally:
+        # エラーで中断した場合は、レートリミッターで待機中の残りの取得を待たずに終了する
+        executor.shutdown(cancel_futures=not completed)
+        session_pool.close()
+        print(f"\n🌐 起動したヘッドレスブラウザ数: {browser_pool.started_count}")
+        browser_pool.close()
+        if info_cache is not None:
+            evicted = info_cache.evict()
+            print(f"\n🗃 キャッシュ: {info_cache.stats['hit']} 件ヒット、{info_cache.stats['put']} 件保存、{evicted} 件削除")
+    
+    print(f"💬 タイムスタンプ収集: {harvest_stats.summary()}")
+    
+    if previous_videos is not None and not full_refresh:
+        print(f"\n♻ 差分更新: {carried_total} 件を前回の情報から引き継ぎ、{len(videos) - carried_total} 件を再取得しました")
+    
+    return videos
+
+def rebuild_videos_from_cache(info_cache, previous_videos):
+    """
+    キャッシュ済みの生の情報辞書のみから動画情報を再生成（ネットワーク接続なし）
+    対象は前回の出力にある動画のみで、順序も前回の出力のまま
+    （キャッシュには削除・非公開になった動画も残るため、前回の一覧にない動画は復活させない）
+    キャッシュにない動画（メン限・放送予定枠など）は前回の出力から引き継ぐ
     
+    Args:
+        info_cache (InfoDictCache): 生の情報辞書のキャッシュ
+        previous_videos (dict): 前回の動画データ {videoId: VideoItem}
+    
+    Returns:
+        list: 動画情報のリスト
+    """
+    cached_infos = {
+        video_id: video_info for video_id, video_info in info_cache.iter_entries()
+        if video_id in previous_videos
+    }
+    videos = []
+    for video_id, previous_item in previous_videos.items():
+        video_info = cached_infos.get(video_id)
+        if video_info is None:
+            videos.append(previous_item)
+            continue
+        video_data = create_video_data_from_detailed_info(video_info, video_id)
+        # コメントを含まないキャッシュからはタイムスタンプを作成できないため前回の出力から引き継ぐ
+        if not video_data.timestamps:
+            video_data.timestamps = previous_item.timestamps or []
+            video_data.timestamp_entries = parse_timestamp_entries(video_data.timestamps)
+        videos.append(video_data)
+    print(f"🗃 キャッシュから {len(cached_infos)} 件を再生成し、{len(videos) - len(cached_infos)} 件を前回の出力から引き継ぎました")
     return videos
 
 def format_duration(seconds):
@@ -491,7 +1176,7 @@ def save_to_json(videos, output_file):
     動画情報をJSONファイルに保存
     
     Args:
-        videos (list): 動画情報のリスト
+        videos (list): 動画情報(VideoItem)のリスト
         output_file (str): 出力ファイルパス
     """
     
@@ -503,7 +1188,7 @@ def save_to_json(videos, output_file):
     # 頻度の高さでソート
     tags = {}
     for video in videos:
-        for tag in video.get('tags', []):
+        for tag in video.tags or []:
             if tag not in tags:
                 tags[tag] = 0
             tags[tag] += 1
@@ -515,10 +1200,14 @@ def save_to_json(videos, output_file):
             tmp_data = json.load(f)
             # tagsを辞書形式に戻す（追加処理のため）
             tags_dict = {tag[0]: tag[1] for tag in tags}
-            for video in tmp_data.get('items', []):
-                if video not in videos:
+            # 取得済みの動画は追加しない（一時ファイルのアイテムは型付きフィールドなどを持たないため、動画IDで比較する）
+            known_ids = {video.video_id or video.video_url for video in videos}
+            for video in map(VideoItem.from_dict, tmp_data.get('items', [])):
+                video_key = video.video_id or video.video_url
+                if video_key not in known_ids:
+                    known_ids.add(video_key)
                     videos.append(video)
-                    for tag in video.get('tags', []):
+                    for tag in video.tags or []:
                         if tag not in tags_dict:
                             tags_dict[tag] = 0
                         tags_dict[tag] += 1
@@ -532,20 +1221,20 @@ def save_to_json(videos, output_file):
         raise e
     
     # 動画をupload_dateの降順でソート
-    videos.sort(key=lambda x: x.get('upload_date', ''), reverse=True)
+    videos.sort(key=lambda x: x.upload_date or '', reverse=True)
 
 
     # JSON形式でデータを構築
     json_data = {
-        "items": videos,
+        "items": serialize_items(videos),
         "tags": [tag[0] for tag in tags],  # タグのリスト
         "last_updated": datetime.now().isoformat(),
         "total_videos": len(videos)
     }
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        # 一時ファイルに書き込んでから置き換える（書き込みに失敗しても前回のファイルが残る）
+        write_json_atomic(output_file, json_data)
         
         print(f"\n✅ 動画情報を {output_file} に保存しました")
         print(f"📊 総動画数: {len(videos)}")
@@ -584,25 +1273,69 @@ def display_video_samples(videos, sample_count=3):
     取得した動画のサンプルを表示
     
     Args:
-        videos (list): 動画情報のリスト
+        videos (list): 動画情報(VideoItem)のリスト
         sample_count (int): 表示するサンプル数
     """
     print("\n📝 取得した動画の例:")
     for i, video in enumerate(videos[:sample_count]):
-        print(f"\n{i+1}. {video['title']}")
-        print(f"   ID: {video['videoId']}")
-        print(f"   説明: {video['description']}")
-        if 'metadata' in video:
-            print(f"   メタデータ: {', '.join(video['metadata'])}")
-        print(f"   クラス: {video.get('addAdditionalClass', [])}")
+        print(f"\n{i+1}. {video.title}")
+        print(f"   ID: {video.video_id}")
+        print(f"   説明: {video.description}")
+        if video.metadata:
+            print(f"   メタデータ: {', '.join(video.metadata)}")
+        print(f"   クラス: {video.add_additional_class or []}")
     
     if len(videos) > sample_count:
         print(f"\n... 他 {len(videos) - sample_count} 個の動画")
 
+def parse_args():
+    """
+    コマンドライン引数を解析
+    
+    Returns:
+        argparse.Namespace: 解析結果
+    """
+    parser = argparse.ArgumentParser(description="YouTube動画情報取得スクリプト")
+    parser.add_argument(
+        '--full', action='store_true',
+        help='すべての動画の詳細情報を再取得する（タイムスタンプは前回の出力から引き継ぐ）'
+    )
+    parser.add_argument(
+        '--recent-days', type=int, default=RECENT_WINDOW_DAYS,
+        help=f'投稿からこの日数以内の動画は毎回再取得する（デフォルト: {RECENT_WINDOW_DAYS}）'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=MAX_WORKERS,
+        help=f'詳細情報を同時に取得するワーカー数（デフォルト: {MAX_WORKERS}）'
+    )
+    parser.add_argument(
+        '--rate', type=float, default=REQUEST_RATE,
+        help=f'全ワーカーで共有するHTTPリクエスト数の上限 回/秒（デフォルト: {REQUEST_RATE}）'
+    )
+    parser.add_argument(
+        '--browsers', type=int, default=BROWSER_POOL_SIZE,
+        help=f'メン限配信の開始日時取得に使うヘッドレスブラウザの最大数（デフォルト: {BROWSER_POOL_SIZE}）'
+    )
+    parser.add_argument(
+        '--rebuild-from-cache', action='store_true',
+        help='ネットワークに接続せず、キャッシュ済みの生の情報辞書のみから出力を再生成する'
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='生の情報辞書のキャッシュを使用しない'
+    )
+    parser.add_argument(
+        '--output', default=OUTPUT_FILE,
+        help=f'出力ファイルのパス（デフォルト: {OUTPUT_FILE}、前回の出力は常に {OUTPUT_FILE} から読み込む）'
+    )
+    return parser.parse_args()
+
 def main():
     """
     メイン実行関数
     """
+    args = parse_args()
+
     # スクリプトの開始時間を記録
     start_time = datetime.now()
 
@@ -616,13 +1349,34 @@ def main():
         print("❌ 必要な依存関係が満たされていません。スクリプトを終了します。")
         sys.exit(1)
     
+    info_cache = None if args.no_cache else InfoDictCache()
+
     # 動画情報を取得
-    print(f"🔍 チャンネル '{CHANNEL_URL}' から動画情報を取得します...")
-    videos = get_video_info(f'{CHANNEL_URL}')
+    if args.rebuild_from_cache:
+        if info_cache is None:
+            print("❌ --rebuild-from-cache と --no-cache は同時に指定できません。")
+            sys.exit(1)
+        # 再生成の対象は前回の出力にある動画のみ
+        previous_videos = load_previous_videos(OUTPUT_FILE, info_cache)
+        if not previous_videos:
+            print("❌ --rebuild-from-cache には前回の出力ファイルが必要です。")
+            sys.exit(1)
+        videos = rebuild_videos_from_cache(info_cache, previous_videos)
+    else:
+        # 前回の出力を読み込む（--full でもタイムスタンプのある動画のコメントを取得し直さないように使用する）
+        previous_videos = load_previous_videos(OUTPUT_FILE, info_cache)
+        if args.full:
+            print(f"🔄 全件更新モード: すべての動画を再取得します（前回の動画 {len(previous_videos)} 件のタイムスタンプは引き継ぎ）")
+        else:
+            print(f"♻ 差分更新モード: 前回の動画 {len(previous_videos)} 件を読み込みました（直近 {args.recent_days} 日は再取得）")
+
+        print(f"🔍 チャンネル '{CHANNEL_URL}' から動画情報を取得します...")
+        videos = get_video_info(f'{CHANNEL_URL}', previous_videos, args.recent_days, args.workers, args.rate, info_cache,
+                                args.browsers, full_refresh=args.full)
     
     if videos:
         # JSONファイルに保存
-        save_to_json(videos, OUTPUT_FILE)
+        save_to_json(videos, args.output)
         
         # 取得した動画の最初の3つを表示
         display_video_samples(videos)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+ニコニコ生放送のチャンネルページ用のHTMLパーサー
+同じ抽出結果を返す複数のバックエンドを切り替えて使用できます。
+
+    - lxml: libxml2でパースし、事前にコンパイルしたXPathで必要な要素だけを抽出（高速・デフォルト）
+    - bs4:  BeautifulSoup(html.parser)で、SoupStrainerにより必要なタグの部分木だけをパース（lxmlがない場合の代替）
+
+どちらのバックエンドも、抽出結果はBeautifulSoupの要素ではなく文字列の辞書で返します。
+"""
+
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxmlがインストールされていない場合はbs4のみ使用
+    lxml = None
+
+# 設定
+# デフォルトのバックエンド(利用できない場合はbs4)
+DEFAULT_BACKEND = "lxml"
+
+# ページ番号を含むリンクのパターン
+PAGE_NUMBER_PATTERN = re.compile(r'page=(\d+)')
+# タイムシフト視聴期限の見出し
+TIMESHIFT_LABEL = 'タイムシフト視聴期限：'
+
+
+def _has_class(class_name):
+    """
+    class属性に指定したクラスを含む要素を選択するXPathの条件式(CSSの .class 相当)
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def _empty_item():
+    """
+    動画アイテムの抽出結果の初期値
+
+    Returns:
+        dict: {"title", "href", "image_src", "date_text"}
+    """
+    return {'title': None, 'href': None, 'image_src': None, 'date_text': None}
+
+
+class LxmlNiconicoParser:
+    """
+    lxmlと事前にコンパイルしたXPathによるパーサー
+    """
+    name = "lxml"
+
+    if lxml is not None:
+        # section.sub.past div.item
+        _ITEMS = etree.XPath(f"//section[{_has_class('sub')} and {_has_class('past')}]//div[{_has_class('item')}]")
+        # ul.pagination a[href], a:contains('最後')
+        _PAGE_LINKS = etree.XPath(f"//ul[{_has_class('pagination')}]//a/@href | //a[contains(text(), '最後')]/@href")
+        # h3, h2, a[class*=title] の順で最初に見つかったもの
+        _TITLE = etree.XPath("(.//h3)[1] | (.//h2)[1] | (.//a[contains(@class, 'title')])[1]")
+        # a[href*='/watch/']
+        _WATCH_LINK = etree.XPath("(.//a[contains(@href, '/watch/')])[1]/@href")
+        _IMAGE = etree.XPath("(.//img)[1]")
+        # p.date
+        _DATE = etree.XPath(f"(.//p[{_has_class('date')}])[1]")
+        # dt:contains('タイムシフト視聴期限：') の次の dd
+        _TIMESHIFT = etree.XPath(f"(//dt[contains(text(), '{TIMESHIFT_LABEL}')])[1]/following::dd[1]")
+
+    @staticmethod
+    def _text(element):
+        """
+        BeautifulSoupの get_text(strip=True) と同じ規則で要素のテキストを取得
+        """
+        return ''.join(text.strip() for text in element.itertext())
+
+    def parse_list_page(self, html):
+        """
+        一覧ページから過去の放送の動画アイテムと、リンクされているページ番号を抽出
+
+        Args:
+            html (str): 一覧ページのHTML
+        Returns:
+            tuple: (動画アイテムの辞書のリスト, ページ番号のset)
+        """
+        root = lxml.html.fromstring(html)
+        items = []
+        for element in self._ITEMS(root):
+            item = _empty_item()
+            title_elements = self._TITLE(element)
+            if title_elements:
+                # h3 > h2 > a.title の優先順位で選択
+                priority = {'h3': 0, 'h2': 1}
+                title_element = min(title_elements, key=lambda e: priority.get(e.tag, 2))
+                item['title'] = self._text(title_element)
+            hrefs = self._WATCH_LINK(element)
+            if hrefs:
+                item['href'] = hrefs[0]
+            images = self._IMAGE(element)
+            if images:
+                item['image_src'] = images[0].get('src') or images[0].get('data-src')
+            dates = self._DATE(element)
+            if dates:
+                item['date_text'] = self._text(dates[0])
+            items.append(item)
+        page_numbers = set()
+        for href in self._PAGE_LINKS(root):
+            match = PAGE_NUMBER_PATTERN.search(href)
+            if match:
+                page_numbers.add(int(match.group(1)))
+        return items, page_numbers
+
+    def parse_timeshift_deadline(self, html):
+        """
+        番組ページからタイムシフト視聴期限を抽出
+
+        Args:
+            html (str): 番組ページのHTML
+        Returns:
+            str: タイムシフト視聴期限、見つからない場合はNone
+        """
+        elements = self._TIMESHIFT(lxml.html.fromstring(html))
+        return self._text(elements[0]) if elements else None
+
+
+class SoupNiconicoParser:
+    """
+    BeautifulSoup(html.parser)とSoupStrainerによるパーサー
+    """
+    name = "bs4"
+
+    # 一覧ページは動画セクションとページネーション(ul)の部分木だけをパース
+    _LIST_STRAINER = SoupStrainer(['section', 'ul'])
+    # 番組ページは dt/dd だけをパース
+    _TIMESHIFT_STRAINER = SoupStrainer(['dt', 'dd'])
+
+    def parse_list_page(self, html):
+        """
+        一覧ページから過去の放送の動画アイテムと、リンクされているページ番号を抽出
+
+        Args:
+            html (str): 一覧ページのHTML
+        Returns:
+            tuple: (動画アイテムの辞書のリスト, ページ番号のset)
+        """
+        soup = BeautifulSoup(html, 'html.parser', parse_only=self._LIST_STRAINER)
+        items = []
+        for section in soup.find_all('section', class_=['sub']):
+            if 'past' not in section.get('class', []):
+                continue
+            for element in section.find_all('div', class_='item'):
+                item = _empty_item()
+                title_element = element.find('h3') or element.find('h2') or element.find('a', class_=re.compile(r'.*title.*'))
+                if title_element:
+                    item['title'] = title_element.get_text(strip=True)
+                link_element = element.find('a', href=re.compile(r'/watch/'))
+                if link_element:
+                    item['href'] = link_element.get('href')
+                img_element = element.find('img')
+                if img_element:
+                    item['image_src'] = img_element.get('src') or img_element.get('data-src')
+                date_element = element.find('p', class_='date')
+                if date_element:
+                    item['date_text'] = date_element.get_text(strip=True)
+                items.append(item)
+
+        page_links = []
+        pagination = soup.find('ul', class_='pagination')
+        if pagination:
+            page_links.extend(pagination.find_all('a'))
+        page_links.extend(soup.find_all('a', string=re.compile(r'最後')))
+        page_numbers = set()
+        for link in page_links:
+            match = PAGE_NUMBER_PATTERN.search(link.get('href', ''))
+            if match:
+                page_numbers.add(int(match.group(1)))
+        return items, page_numbers
+
+    def parse_timeshift_deadline(self, html):
+        """
+        番組ページからタイムシフト視聴期限を抽出
+
+        Args:
+            html (str): 番組ページのHTML
+        Returns:
+            str: タイムシフト視聴期限、見つからない場合はNone
+        """
+        soup = BeautifulSoup(html, 'html.parser', parse_only=self._TIMESHIFT_STRAINER)
+        label = soup.find('dt', string=re.compile(TIMESHIFT_LABEL))
+        if label is None:
+            return None
+        deadline = label.find_next('dd')
+        return deadline.get_text(strip=True) if deadline else None
+
+
+PARSER_BACKENDS = {
+    LxmlNiconicoParser.name: LxmlNiconicoParser,
+    SoupNiconicoParser.name: SoupNiconicoParser,
+}
+
+
+def available_backends():
+    """
+    利用できるバックエンド名の一覧
+
+    Returns:
+        list: バックエンド名のリスト
+    """
+    return [name for name in PARSER_BACKENDS if name != LxmlNiconicoParser.name or lxml is not None]
+
+
+def get_parser(backend=None):
+    """
+    パーサーを作成
+
+    Args:
+        backend (str): バックエンド名("lxml" / "bs4")、省略時はDEFAULT_BACKEND
+    Returns:
+        LxmlNiconicoParser | SoupNiconicoParser: パーサー
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"不明なパーサーのバックエンドです: {backend}")
+    if backend not in available_backends():
+        print(f"⚠️ {backend} が利用できないため、{SoupNiconicoParser.name} を使用します")
+        backend = SoupNiconicoParser.name
+    return PARSER_BACKENDS[backend]()
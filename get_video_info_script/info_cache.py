@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+yt-dlpの生の情報辞書(info dict)をディスクに保存するキャッシュ
+動画IDのハッシュをキーにしたディレクトリに、gzip圧縮したJSONとして保存します。
+
+    - エントリごとにTTL(有効期限)を持ち、期限内であればネットワークに接続せずに再利用できる
+    - 期限切れのエントリも削除せずに残し、キャッシュからの再生成(--rebuild-from-cache)に使用する
+    - 合計サイズが上限を超えた場合は、最終アクセスが古いものから削除する(LRU)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 設定
+# キャッシュの保存先ディレクトリ
+CACHE_DIR = "./cache/youtube_info"
+# エントリのデフォルトの有効期限(秒)
+DEFAULT_TTL = 7 * 24 * 3600
+# キャッシュ全体の最大サイズ(バイト)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class InfoDictCache:
+    """
+    動画IDをキーにした情報辞書のディスクキャッシュ（スレッドセーフ）
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, default_ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): キャッシュの保存先ディレクトリ
+            default_ttl (int): エントリのデフォルトの有効期限(秒)
+            max_bytes (int): キャッシュ全体の最大サイズ(バイト)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {'hit': 0, 'miss': 0, 'expired': 0, 'put': 0, 'evicted': 0}
+
+    def _path(self, video_id):
+        """
+        動画IDからエントリの保存先パスを作成
+
+        Args:
+            video_id (str): 動画ID
+        Returns:
+            Path: 保存先パス
+        """
+        digest = hashlib.sha256(video_id.encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json.gz"
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _read_entry(path):
+        """
+        エントリを読み込む
+
+        Args:
+            path (Path): エントリのパス
+        Returns:
+            dict: {"video_id", "cached_at", "ttl", "info"}、読み込めない場合はNone
+        """
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, EOFError, json.JSONDecodeError):
+            return None
+
+    def get(self, video_id, allow_expired=False):
+        """
+        キャッシュから情報辞書を取得
+
+        Args:
+            video_id (str): 動画ID
+            allow_expired (bool): 有効期限切れのエントリも返す場合True
+        Returns:
+            dict: 情報辞書、存在しない(または期限切れの)場合はNone
+        """
+        path = self._path(video_id)
+        entry = self._read_entry(path)
+        if entry is None or entry.get('video_id') != video_id:
+            self._count('miss')
+            return None
+        if not allow_expired and time.time() > entry['cached_at'] + entry['ttl']:
+            self._count('expired')
+            return None
+        # LRUのため最終アクセス日時を更新
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count('hit')
+        return entry['info']
+
+    def put(self, video_id, info, ttl=None):
+        """
+        情報辞書をキャッシュに保存（一時ファイルに書き込んでから置き換える）
+
+        Args:
+            video_id (str): 動画ID
+            info (dict): JSONに変換可能な情報辞書
+            ttl (int): このエントリの有効期限(秒)、省略時はデフォルト値
+        """
+        path = self._path(video_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'video_id': video_id,
+            'cached_at': time.time(),
+            'ttl': self.default_ttl if ttl is None else ttl,
+            'info': info,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str).encode('utf-8'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._count('put')
+
+    def iter_entries(self):
+        """
+        キャッシュ内のすべてのエントリを列挙（有効期限切れも含む）
+
+        Yields:
+            tuple: (動画ID, 情報辞書)
+        """
+        for path in sorted(self.cache_dir.glob('*/*.json.gz')):
+            entry = self._read_entry(path)
+            if entry is not None:
+                yield entry['video_id'], entry['info']
+
+    def evict(self):
+        """
+        合計サイズが上限を超えている場合、最終アクセスが古いエントリから削除する
+
+        Returns:
+            int: 削除したエントリ数
+        """
+        with self._lock:
+            files = []
+            total_size = 0
+            for path in self.cache_dir.glob('*/*.json.gz'):
+                stat = path.stat()
+                files.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+            evicted = 0
+            for _, size, path in sorted(files):
+                if total_size <= self.max_bytes:
+                    break
+                path.unlink()
+                total_size -= size
+                evicted += 1
+            self.stats['evicted'] += evicted
+        return evicted
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+docs/*.json などの出力ファイルをアトミックに書き込むためのJSONライター
+
+    - 同じディレクトリの一時ファイルに json.JSONEncoder.iterencode でチャンクごとに書き込む
+      （出力全体の文字列をメモリ上に作らない）
+    - 書き込み後に fsync してから os.replace で置き換えるため、途中で失敗・中断しても
+      出力ファイルは前回の内容のまま残る（書きかけのファイルが公開されない）
+    - compact=True の場合は改行・インデントなしで出力する（公開サイト向けにサイズを削減）
+
+compact を省略した場合は、環境変数 UIU_COMPACT_JSON が "1" / "true" / "yes" のときに compact になります。
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# 設定
+# compact 出力を有効にする環境変数（run_all.py --compact で設定される）
+COMPACT_ENV = "UIU_COMPACT_JSON"
+# compact でない場合のインデント
+DEFAULT_INDENT = 2
+# 一時ファイルへの書き込みバッファのサイズ(バイト)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def is_compact_default():
+    """
+    環境変数から compact 出力のデフォルト値を取得
+
+    Returns:
+        bool: compact で出力する場合True
+    """
+    return os.environ.get(COMPACT_ENV, '').strip().lower() in ('1', 'true', 'yes')
+
+
+def _fsync_directory(directory):
+    """
+    置き換え後のディレクトリエントリをディスクに反映（対応していないOSでは何もしない）
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_json_atomic(path, data, compact=None, indent=DEFAULT_INDENT, default=None, sort_keys=False):
+    """
+    JSONファイルをアトミックに書き込む
+
+    Args:
+        path (str | Path): 出力ファイルのパス
+        data: 書き込むデータ（json.dump と同じ）
+        compact (bool): 改行・インデントなしで出力する場合True、省略時は環境変数 UIU_COMPACT_JSON に従う
+        indent (int): compact でない場合のインデント
+        default (callable): JSONに変換できないオブジェクトの変換関数（json.dump の default と同じ）
+        sort_keys (bool): キーをソートして出力する場合True
+    Returns:
+        int: 書き込んだバイト数
+    """
+    if compact is None:
+        compact = is_compact_default()
+    if compact:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=default, sort_keys=sort_keys)
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=indent, default=default, sort_keys=sort_keys)
+
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, prefix=f".{output_path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            for chunk in encoder.iterencode(data):
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        size = os.path.getsize(tmp_path)
+        # mkstemp は 0600 で作成するため、通常のファイルと同じパーミッションにする
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(output_path.parent)
+    return size
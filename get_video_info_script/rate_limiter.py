@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+レート制限ユーティリティ
+複数のワーカーで共有できるトークンバケット方式のレートリミッターを提供します。
+"""
+
+import threading
+import time
+
+
+class TokenBucketRateLimiter:
+    """
+    トークンバケット方式のレートリミッター（スレッドセーフ）
+
+    rate 個/秒の速度でトークンが補充され、最大 burst 個まで貯まります。
+    acquire() はトークンが1つ取得できるまでブロックします。
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        Args:
+            rate (float): 1秒あたりに補充されるトークン数（リクエスト数）
+            burst (int): バケットに貯められる最大トークン数
+        """
+        if rate <= 0:
+            raise ValueError("rate は正の値を指定してください")
+        if burst < 1:
+            raise ValueError("burst は1以上を指定してください")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+
+    def _refill(self):
+        """
+        経過時間に応じてトークンを補充（ロック取得済みで呼び出すこと）
+        """
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """
+        トークンを1つ取得する（取得できるまで待機）
+
+        Returns:
+            float: 待機した秒数
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.total_wait += waited
+                    return waited
+                # 次のトークンが補充されるまでの時間
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+            waited += wait_time
@@ -37,52 +37,7 @@ check_package "bs4" "beautifulsoup4"
 check_package "lxml" "lxml"
 check_package "selenium" "selenium"
 check_package "webdriver_manager" "webdriver-manager"
-
-echo ""
-echo "🚀 すべてのスクリプトを順次実行します..."
-echo "⏱️  予想実行時間: 約25-50分"
-echo ""
-
-# カウンター
-script_count=0
-success_count=0
-failed_scripts=()
-
-# スクリプト実行関数
-run_script() {
-    local script_name=$1
-    local description=$2
-    script_count=$((script_count + 1))
-    
-    echo "=================================================================================="
-    echo "📺 [$script_count/5] $description"
-    echo "🎯 実行スクリプト: $script_name"
-    echo "⏰ 開始時刻: $(date)"
-    echo "=================================================================================="
-    
-    # GitHub Actions環境では追加の待機時間を設ける
-    if [ "$GITHUB_ACTIONS" = "true" ]; then
-        echo "🤖 CI環境での実行 - レート制限回避のため少し待機します..."
-        sleep 3
-    fi
-    
-    if python "$script_name"; then
-        echo "✅ $description - 完了"
-        success_count=$((success_count + 1))
-    else
-        echo "❌ $description - 失敗"
-        failed_scripts+=("$script_name")
-    fi
-    
-    echo "📊 完了時刻: $(date)"
-    echo ""
-    
-    # GitHub Actions環境では次のスクリプト実行前に少し待機
-    if [ "$GITHUB_ACTIONS" = "true" ] && [ $script_count -lt 5 ]; then
-        echo "⏳ 次のスクリプト実行まで少し待機します..."
-        sleep 5
-    fi
-}
+check_package "aiohttp" "aiohttp"
 
 # yt-dlpのアップデート
 echo "🔄 yt-dlpのアップデートを確認しています..."
@@ -100,35 +55,27 @@ else
     exit 1
 fi
 
-# 各スクリプトを順次実行
-run_script "get_video_info_youtube.py" "YouTube動画情報取得"
-# run_script "analyzer_youtube.py" "YouTube動画情報分析"
-run_script "get_video_info_niconico_live.py" "ニコニコ動画ライブ情報取得"
-run_script "get_video_info_secret.py" "ファンサイト投稿情報取得"
-run_script "get_video_info_fc.py" "ファンクラブ動画情報取得"
+# 各スクリプトを並行して実行し、成功したものだけを ../docs/ に公開
+echo ""
+echo "🚀 すべてのスクリプトを並行して実行します..."
+echo "⏱️  予想実行時間: 最も時間のかかるスクリプトの実行時間（YouTube: 約25分）"
+echo ""
 
-# 実行結果サマリー
-echo "=================================================================================="
-echo "🎉 すべてのスクリプトの実行が完了しました！"
-echo "📅 実行完了時刻: $(date)"
-echo "📊 実行結果: $success_count/5 スクリプトが成功"
+# GitHub Actions環境ではレート制限回避のため少し待機
+if [ "$GITHUB_ACTIONS" = "true" ]; then
+    echo "🤖 CI環境での実行 - レート制限回避のため少し待機します..."
+    sleep 3
+fi
 
-if [ ${#failed_scripts[@]} -eq 0 ]; then
+# run_all.py は成功したソースの出力のみ公開し、失敗したソースは前回のファイルを残す
+# python analyzer_youtube.py  # YouTube動画情報分析
+if python run_all.py; then
     echo "✨ すべてのスクリプトが正常に完了しました！"
-    echo ""
-    echo "📁 出力ファイル:"
-    echo "   - ../docs/youtube.json"
-    echo "   - ../docs/niconico_l.json" 
-    echo "   - ../docs/secret_ac.json"
-    echo "   - ../docs/fciu.json"
 else
-    echo "⚠️  以下のスクリプトが失敗しました:"
-    for script in "${failed_scripts[@]}"; do
-        echo "   - $script"
-    done
-    echo ""
+    echo "⚠️  一部のスクリプトが失敗しました（失敗したソースの出力は前回のままです）"
     echo "💡 失敗したスクリプトは個別に実行して詳細を確認してください。"
 fi
+echo "📅 実行完了時刻: $(date)"
 
 echo "=================================================================================="
 
@@ -153,8 +100,12 @@ else
         
         # JSON ファイルのみをステージングに追加
         echo "📦 JSON ファイルをステージングに追加します..."
-        # git add docs/youtube.json docs/niconico_l.json docs/secret_ac.json docs/fciu.json docs/youtube_analyzed.json
-        git add docs/youtube.json docs/niconico_l.json docs/secret_ac.json docs/fciu.json
+        # git add docs/youtube.json docs/niconico_l.json docs/secret_ac.json docs/fciu.json docs/calendar_index.json docs/youtube_analyzed.json docs/youtube_analyzed_downsampled.json docs/youtube_rollups.json docs/youtube_history
+        git add docs/youtube.json docs/niconico_l.json docs/secret_ac.json docs/fciu.json docs/calendar_index.json
+        # 月ごとに分けた索引（build_calendar_index.py --split-months）。削除された月のファイルも反映する
+        if [ -d docs/calendar_index ] || git ls-files --error-unmatch docs/calendar_index > /dev/null 2>&1; then
+            git add -A docs/calendar_index
+        fi
 
         # コミット
         commit_message="Update video info data - $(date '+%Y-%m-%d %H:%M:%S')"
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+python run_all.py [--only youtube fc] [--timeout 3600] [--no-calendar-index]
+動画情報取得スクリプトの一括実行（並行実行）
+01. 4つの取得スクリプトをそれぞれ別プロセスで同時に実行（レート制限は各スクリプトが個別に持つ）
+02. 各スクリプトは一時ディレクトリ(STAGING_DIR)に出力
+03. 成功したスクリプトの出力のみ ../docs/*.json に置き換えて公開（失敗した場合は前回のファイルをそのまま残す）
+04. ソースごとの実行時間と結果を表示
+05. 1つ以上のソースを公開した場合、カレンダーの索引(../docs/calendar_index.json)を作成し直す（build_calendar_index.py）
+
+すべてのソースの取得にかかる時間は、各ソースの実行時間の合計ではなく最大値になります。
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from build_calendar_index import write_calendar_index
+from json_writer import COMPACT_ENV
+
+# 設定
+# 取得スクリプトの一覧（name: 識別名, script: スクリプト, output: 公開先, description: 説明,
+#   state: 出力と一緒に公開する状態ファイル（省略可、--sync-state-output で一時ディレクトリに書き出させる））
+SOURCES = [
+    {'name': 'youtube', 'script': 'get_video_info_youtube.py', 'output': '../docs/youtube.json', 'description': 'YouTube動画情報取得'},
+    {'name': 'niconico', 'script': 'get_video_info_niconico_live.py', 'output': '../docs/niconico_l.json', 'description': 'ニコニコ動画ライブ情報取得'},
+    {'name': 'secret', 'script': 'get_video_info_secret.py', 'output': '../docs/secret_ac.json', 'description': 'ファンサイト投稿情報取得'},
+    {'name': 'fc', 'script': 'get_video_info_fc.py', 'output': '../docs/fciu.json', 'description': 'ファンクラブ動画情報取得',
+     'state': './fc_sync_state.json'},
+]
+# 各スクリプトの出力先の一時ディレクトリ
+STAGING_DIR = "./cache/staging"
+# 1つのスクリプトの実行時間の上限(秒)
+DEFAULT_TIMEOUT = 3 * 3600
+
+# 複数スクリプトの出力が混ざらないように1行ずつ表示するためのロック
+_print_lock = threading.Lock()
+
+
+def log(name, message):
+    """
+    ソース名を付けて1行表示
+
+    Args:
+        name (str): ソース名
+        message (str): 表示する内容
+    """
+    with _print_lock:
+        print(f"[{name}] {message}", flush=True)
+
+
+def validate_output(path):
+    """
+    スクリプトの出力が公開できる内容かを確認
+
+    Args:
+        path (Path): 出力ファイルのパス
+    Returns:
+        str: 問題がある場合はその理由、問題がない場合はNone
+    """
+    if not path.exists():
+        return "出力ファイルが作成されていません"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return f"出力ファイルを読み込めません: {e}"
+    if not isinstance(data, dict) or not isinstance(data.get('items'), list):
+        return "出力ファイルに items がありません"
+    if not data['items']:
+        return "items が空です"
+    return None
+
+
+def publish(staging_path, output_path):
+    """
+    一時ディレクトリの出力を公開先にアトミックに置き換える
+
+    Args:
+        staging_path (Path): 一時ディレクトリの出力ファイル
+        output_path (Path): 公開先のファイル
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(staging_path, output_path)
+    except OSError:
+        # 別のファイルシステムの場合は、公開先と同じディレクトリにコピーしてから置き換える
+        fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(staging_path, tmp_path)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.remove(staging_path)
+
+
+def kill_process_tree(process):
+    """
+    取得スクリプトのプロセスを、起動した子プロセス（Chrome・ChromeDriverなど）ごと終了する
+
+    Args:
+        process (subprocess.Popen): start_new_session=True で起動したプロセス
+    """
+    if os.name == 'posix':
+        # 孫プロセスが標準出力のパイプを開いたままだと読み込みが終わらないため、プロセスグループごと終了する
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        process.kill()
+
+
+def run_source(source, staging_dir, timeout, compact=False):
+    """
+    取得スクリプトを別プロセスで実行し、出力を一時ディレクトリに保存
+
+    Args:
+        source (dict): SOURCES の要素
+        staging_dir (Path): 一時ディレクトリ
+        timeout (float): 実行時間の上限(秒)
+        compact (bool): 改行・インデントなしのJSONを出力させる場合True
+    Returns:
+        dict: {"source", "staging_path", "state_staging_path", "returncode", "elapsed", "error"}
+    """
+    name = source['name']
+    staging_path = staging_dir / Path(source['output']).name
+    state_staging_path = staging_dir / Path(source['state']).name if source.get('state') else None
+    for path in (staging_path, state_staging_path):
+        if path is not None and path.exists():
+            path.unlink()
+    command = [sys.executable, source['script'], '--output', str(staging_path)]
+    if state_staging_path is not None:
+        command += ['--sync-state-output', str(state_staging_path)]
+    env = {**os.environ, 'PYTHONUNBUFFERED': '1'}
+    if compact:
+        env[COMPACT_ENV] = '1'
+    log(name, f"🚀 {source['description']} を開始: {' '.join(command[1:])}")
+
+    start = time.monotonic()
+    result = {'source': source, 'staging_path': staging_path, 'state_staging_path': state_staging_path,
+              'returncode': None, 'elapsed': 0.0, 'error': None}
+    try:
+        # 子プロセスごと終了できるように、取得スクリプトは新しいプロセスグループで起動する
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, encoding='utf-8', errors='replace', env=env,
+                                   start_new_session=(os.name == 'posix'))
+        timed_out = threading.Event()
+
+        def on_timeout():
+            timed_out.set()
+            kill_process_tree(process)
+
+        # タイムアウトした場合はプロセスを終了する
+        timer = threading.Timer(timeout, on_timeout)
+        timer.start()
+        try:
+            for line in process.stdout:
+                log(name, line.rstrip('\n'))
+            result['returncode'] = process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+        if timed_out.is_set():
+            result['error'] = f"タイムアウト（{timeout:g}秒）"
+        elif result['returncode'] != 0:
+            result['error'] = f"終了コード {result['returncode']}"
+        else:
+            result['error'] = validate_output(staging_path)
+    except OSError as e:
+        result['error'] = f"スクリプトを起動できません: {e}"
+    result['elapsed'] = time.monotonic() - start
+    return result
+
+
+def parse_args():
+    """
+    コマンドライン引数を解析
+
+    Returns:
+        argparse.Namespace: 解析結果
+    """
+    names = [source['name'] for source in SOURCES]
+    parser = argparse.ArgumentParser(description="動画情報取得スクリプトを並行して実行し、成功したものだけを公開")
+    parser.add_argument('--only', nargs='+', choices=names, default=names,
+                        help='実行するソース（デフォルト: すべて）')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'1つのスクリプトの実行時間の上限 秒（デフォルト: {DEFAULT_TIMEOUT}）')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='取得のみ行い、../docs/ への公開を行わない')
+    parser.add_argument('--compact', action='store_true',
+                        help='改行・インデントなしのJSONを出力する（ファイルサイズを削減）')
+    parser.add_argument('--no-calendar-index', action='store_true',
+                        help='カレンダーの索引（../docs/calendar_index.json）を作成し直さない')
+    return parser.parse_args()
+
+
+def main():
+    """
+    メイン実行関数
+    """
+    args = parse_args()
+
+    # スクリプトの開始時間を記録
+    start_time = datetime.now()
+    print("🎬 動画情報取得スクリプト一括実行（並行実行）")
+
+    staging_dir = Path(STAGING_DIR)
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    sources = [source for source in SOURCES if source['name'] in args.only]
+
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        results = list(executor.map(lambda source: run_source(source, staging_dir, args.timeout, args.compact), sources))
+
+    # 成功したソースの出力のみ公開
+    print("\n" + "=" * 80)
+    print("📊 実行結果")
+    published = 0
+    for result in results:
+        source = result['source']
+        if result['error'] is None:
+            if args.dry_run:
+                status = f"✅ 成功（--dry-run のため公開しません: {result['staging_path']}）"
+            else:
+                try:
+                    publish(result['staging_path'], Path(source['output']))
+                    status = f"✅ 成功 → {source['output']} を更新"
+                    published += 1
+                    # 状態ファイルは出力を公開した場合のみ公開する（出力より先に進まないように出力の後に置き換える）
+                    state_staging_path = result['state_staging_path']
+                    if state_staging_path is not None and state_staging_path.exists():
+                        try:
+                            publish(state_staging_path, Path(source['state']))
+                        except OSError as e:
+                            # 状態が古いままでも、次回は公開済みの出力と照合してから使うため出力は有効
+                            status += f"（{source['state']} の更新に失敗: {e}）"
+                except OSError as e:
+                    result['error'] = f"公開に失敗: {e}"
+        if result['error'] is not None:
+            status = f"❌ 失敗（{result['error']}）→ {source['output']} は前回のまま"
+        print(f"  {source['name']:9s} {result['elapsed']:8.1f}秒  {status}")
+
+    # 公開したファイルからカレンダーの索引を作成し直す（失敗したソースは前回のファイルを使用）
+    if published and not args.no_calendar_index:
+        try:
+            index_result = write_calendar_index()
+            print(f"📅 カレンダーの索引を更新: {index_result['days']} 日・{index_result['events']} 件")
+        except OSError as e:
+            print(f"⚠️  カレンダーの索引の更新に失敗しました: {e}")
+
+    total_elapsed = (datetime.now() - start_time).total_seconds()
+    sum_elapsed = sum(result['elapsed'] for result in results)
+    print(f"\n⏱ 実行時間: {total_elapsed:.1f}秒（各ソースの合計 {sum_elapsed:.1f}秒）")
+    failed = [result['source']['name'] for result in results if result['error'] is not None]
+    if failed:
+        print(f"⚠️  失敗したソース: {', '.join(failed)}")
+        sys.exit(1)
+    print("🎉 すべてのソースの取得が完了しました！")
+
+
+if __name__ == "__main__":
+    main()
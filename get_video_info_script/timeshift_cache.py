@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+ニコニコ生放送のタイムシフト視聴期限のキャッシュ
+番組ID(lv〜)をキーに、番組ページから取得したタイムシフト視聴期限と
+条件付きGET用のETag/Last-Modifiedを1つのJSONファイルに保存します。
+
+    - 期限が「不明」のエントリは、条件付きGETを使わずに取得し直す
+    - 期限が「現在 + horizon_days」より後のエントリ(放送から日が浅い番組)は、条件付きGETで再検証する
+    - それ以外のエントリは公開後に変化しないため、ネットワークに接続せずに再利用する
+"""
+
+import json
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from json_writer import write_json_atomic
+
+# 設定
+# キャッシュファイルのパス
+CACHE_FILE = "./cache/niconico_timeshift.json"
+# 期限がこの日数より先の番組は再検証する(タイムシフト視聴期限は放送から約180日後)
+DEFAULT_HORIZON_DAYS = 150
+# 期限が取得できなかった場合の値
+UNKNOWN_DEADLINE = "不明"
+
+
+def parse_deadline(deadline):
+    """
+    タイムシフト視聴期限の文字列を日時に変換
+
+    Args:
+        deadline (str): タイムシフト視聴期限 例: "2027/02/08(月) 23:59"
+    Returns:
+        datetime: 期限の日時、変換できない場合はNone
+    """
+    match = re.search(r'(\d{4})/(\d{1,2})/(\d{1,2}).*?(\d{1,2}):(\d{2})', deadline or '')
+    if not match:
+        return None
+    year, month, day, hour, minute = map(int, match.groups())
+    try:
+        # 24:00以降の表記にも対応
+        return datetime(year, month, day) + timedelta(hours=hour, minutes=minute)
+    except ValueError:
+        return None
+
+
+class TimeshiftDeadlineCache:
+    """
+    番組IDをキーにしたタイムシフト視聴期限のキャッシュ（スレッドセーフ）
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, horizon_days=DEFAULT_HORIZON_DAYS):
+        """
+        Args:
+            cache_file (str): キャッシュファイルのパス
+            horizon_days (int): 期限がこの日数より先のエントリは条件付きGETで再検証する
+        """
+        self.cache_file = Path(cache_file)
+        self.horizon = timedelta(days=horizon_days)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+        self.stats = {'hit': 0, 'revalidated': 0, 'fetched': 0}
+
+    def _load(self):
+        """
+        キャッシュファイルを読み込む
+
+        Returns:
+            dict: {番組ID: {"deadline", "etag", "last_modified", "checked_at"}}
+        """
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def lookup(self, program_id, now=None):
+        """
+        キャッシュを参照し、ネットワークへの問い合わせが必要かを判定
+
+        Args:
+            program_id (str): 番組ID(lv〜)
+            now (datetime): 判定に使う現在日時(省略時は現在日時)
+        Returns:
+            tuple: (キャッシュ済みの期限, 条件付きGETのヘッダー)
+                   期限がNoneでない場合はそのまま使用できる(問い合わせ不要)
+                   期限がNoneの場合は、ヘッダー(空の場合あり)を付けて取得する
+        """
+        with self._lock:
+            entry = self._entries.get(program_id)
+        if not entry or entry.get('deadline', UNKNOWN_DEADLINE) == UNKNOWN_DEADLINE:
+            return None, {}
+        deadline = parse_deadline(entry['deadline'])
+        if deadline is None:
+            return None, {}
+        now = now or datetime.now()
+        if deadline <= now + self.horizon:
+            self._count('hit')
+            return entry['deadline'], {}
+        # 放送から日が浅い番組は条件付きGETで再検証
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return None, headers
+
+    def get_cached(self, program_id):
+        """
+        304(Not Modified)を受け取った場合に、キャッシュ済みの期限を返して確認日時を更新
+
+        Args:
+            program_id (str): 番組ID(lv〜)
+        Returns:
+            str: キャッシュ済みの期限
+        """
+        with self._lock:
+            entry = self._entries[program_id]
+            entry['checked_at'] = datetime.now().isoformat(timespec='seconds')
+            self.stats['revalidated'] += 1
+            return entry['deadline']
+
+    def put(self, program_id, deadline, etag=None, last_modified=None):
+        """
+        取得した期限を保存
+
+        Args:
+            program_id (str): 番組ID(lv〜)
+            deadline (str): タイムシフト視聴期限
+            etag (str): レスポンスのETag
+            last_modified (str): レスポンスのLast-Modified
+        """
+        with self._lock:
+            self._entries[program_id] = {
+                'deadline': deadline,
+                'etag': etag,
+                'last_modified': last_modified,
+                'checked_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self.stats['fetched'] += 1
+
+    def save(self):
+        """
+        キャッシュファイルに保存（一時ファイルに書き込んでから置き換える）
+        """
+        with self._lock:
+            entries = {program_id: dict(entry) for program_id, entry in self._entries.items()}
+        write_json_atomic(self.cache_file, entries, compact=False, sort_keys=True)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+出力ファイルの各アイテムに付与する型付きフィールドの作成
+metadata の表示用文字列（"再生時間: 1:07:32" など）とは別に、取得時に一度だけ計算した値を持たせ、
+フロントエンドや createDlCmd が文字列を分割・パースせずに並べ替え・絞り込み・日付ごとの集計をできるようにします。
+
+    - start_epoch:      配信・投稿の開始日時（UNIX時間・秒）
+    - broadcast_day:    配信日（日本時間、BROADCAST_DAY_START_HOUR 時より前は前日扱い・YYYY-MM-DD）
+    - duration_seconds: 再生時間（秒）
+    - view_count:       再生回数・閲覧回数
+
+値が取得できないフィールドは None（JSONでは null）になります。
+ただし view_count は従来から YouTube の出力にあるキー（読み込み側は整数を前提とする）のため、取得できない場合は出力しません。
+"""
+
+from datetime import datetime, timedelta, timezone
+
+# 設定
+# 日本時間
+JST = timezone(timedelta(hours=9), 'JST')
+# この時刻より前に始まった配信は前日の配信として扱う（24:00〜27:59 表記）
+BROADCAST_DAY_START_HOUR = 4
+
+TYPED_FIELD_NAMES = ('start_epoch', 'broadcast_day', 'duration_seconds', 'view_count')
+# 値が取得できない場合も null として出力する型付きフィールド
+NULLABLE_TYPED_FIELD_NAMES = ('start_epoch', 'broadcast_day', 'duration_seconds')
+
+
+def to_datetime(value, naive_tz=JST):
+    """
+    日時をタイムゾーン付きのdatetimeに変換
+
+    Args:
+        value (int, float, str, datetime): UNIX時間(秒)、ISO形式の文字列（"YYYY-MM-DD HH:MM:SS" も可）、datetime
+        naive_tz (timezone): タイムゾーンがない場合に使用するタイムゾーン
+    Returns:
+        datetime: タイムゾーン付きのdatetime、変換できない場合はNone
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=naive_tz)
+    return value
+
+
+def broadcast_day(dt):
+    """
+    配信日（日本時間、BROADCAST_DAY_START_HOUR 時より前は前日扱い）
+
+    Args:
+        dt (datetime): タイムゾーン付きのdatetime
+    Returns:
+        str: YYYY-MM-DD
+    """
+    return (dt.astimezone(JST) - timedelta(hours=BROADCAST_DAY_START_HOUR)).date().isoformat()
+
+
+def parse_broadcast_datetime(date_str, time_str):
+    """
+    24:00〜27:59 表記を含む日本時間の日付・時刻をdatetimeに変換
+
+    Args:
+        date_str (str): YYYY/MM/DD
+        time_str (str): HH:MM または HH:MM:SS（24以上の時は翌日）
+    Returns:
+        datetime: 日本時間のdatetime、変換できない場合はNone
+    """
+    try:
+        day = datetime.strptime(date_str, '%Y/%m/%d')
+        parts = [int(part) for part in time_str.split(':')]
+    except (ValueError, AttributeError):
+        return None
+    if len(parts) not in (2, 3):
+        return None
+    hours, minutes, seconds = (parts + [0])[:3]
+    return (day + timedelta(hours=hours, minutes=minutes, seconds=seconds)).replace(tzinfo=JST)
+
+
+def parse_clock_seconds(text):
+    """
+    "H:MM:SS" / "MM:SS" 形式の時間を秒数に変換（str(timedelta) の "N day(s), H:MM:SS" も可）
+
+    Args:
+        text (str): 時間の文字列
+    Returns:
+        int: 秒数、変換できない場合はNone
+    """
+    if not text:
+        return None
+    days = 0
+    if ',' in text:
+        day_part, text = text.split(',', 1)
+        try:
+            days = int(day_part.split()[0])
+        except (ValueError, IndexError):
+            return None
+    try:
+        parts = [int(float(part)) for part in text.strip().split(':')]
+    except ValueError:
+        return None
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return days * 86400 + seconds
+
+
+def build_typed_fields(start=None, duration_seconds=None, view_count=None, naive_tz=JST):
+    """
+    型付きフィールドを作成
+
+    Args:
+        start (int, float, str, datetime): 開始日時（to_datetime() で変換できる値）
+        duration_seconds (int, float): 再生時間（秒）
+        view_count (int): 再生回数
+        naive_tz (timezone): start にタイムゾーンがない場合に使用するタイムゾーン
+    Returns:
+        dict: {"start_epoch", "broadcast_day", "duration_seconds", "view_count"}
+    """
+    dt = to_datetime(start, naive_tz)
+    return {
+        'start_epoch': int(dt.timestamp()) if dt is not None else None,
+        'broadcast_day': broadcast_day(dt) if dt is not None else None,
+        'duration_seconds': int(duration_seconds) if duration_seconds is not None else None,
+        'view_count': int(view_count) if view_count is not None else None,
+    }
+
+
+def has_typed_fields(item):
+    """
+    アイテムに型付きフィールドがすべてある場合True（前回の出力の移行判定用）
+    """
+    return all(name in item for name in NULLABLE_TYPED_FIELD_NAMES)
+
+
+def find_metadata_value(metadata, label):
+    """
+    metadata から "ラベル: 値" の値を取得（前回の出力の移行用）
+
+    Args:
+        metadata (list): 表示用文字列のリスト
+        label (str): ラベル（"再生時間" など）
+    Returns:
+        str: 値、ない場合はNone
+    """
+    prefix = f"{label}: "
+    for meta in metadata or []:
+        if isinstance(meta, str) and meta.startswith(prefix):
+            return meta[len(prefix):].strip()
+    return None
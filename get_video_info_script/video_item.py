@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+すべての取得スクリプトで共通の動画・投稿情報のレコード
+各スクリプトは VideoItem を作成し、JSONファイルへの書き込みは serialize_items() で行います。
+
+    - キー名は出力ファイル（docs/*.json）の形式に合わせて変換する（video_id → videoId など）
+    - 値がNoneの任意フィールド（YouTubeのみのフィールド・description など）は出力しない
+    - alt がない場合は title を使用する
+    - 型付きフィールド（typed_fields.py）は常に出力する（取得できない場合は null。view_count のみ取得できない場合は出力しない）
+    - 前回の出力の未知のキーは extra に保持し、そのまま出力する
+"""
+
+import re
+from dataclasses import dataclass, field, fields
+
+from typed_fields import NULLABLE_TYPED_FIELD_NAMES
+
+# 設定
+# 検証で警告を表示する最大件数（超えた分は件数のみ表示）
+MAX_VALIDATION_WARNINGS = 10
+
+BROADCAST_DAY_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+@dataclass(slots=True)
+class VideoItem:
+    """
+    動画・投稿情報
+    """
+    title: str
+    video_url: str
+    image: str = None
+    alt: str = None
+    description: str = None
+    # YouTubeのみ
+    video_id: str = None
+    tags: list = None
+    # 表示用の日付・日時（形式は取得元ごとに異なる。並べ替え・集計には start_epoch / broadcast_day を使用する）
+    upload_date: str = None
+    # YouTubeのみ
+    timestamps: list = None
+    timestamp_entries: list = None
+    # 表示用の文字列
+    metadata: list = field(default_factory=list)
+    # YouTubeのみ
+    add_additional_class: list = None
+    # 型付きフィールド
+    start_epoch: int = None
+    broadcast_day: str = None
+    duration_seconds: int = None
+    view_count: int = None
+    # 前回の出力に含まれていた未知のキー
+    extra: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        """
+        出力ファイルの形式の辞書に変換
+
+        Returns:
+            dict: 出力ファイルの1アイテム
+        """
+        data = {}
+        for name, key in _OUTPUT_KEYS:
+            value = getattr(self, name)
+            if name == 'alt' and value is None:
+                value = self.title
+            if value is None and name not in NULLABLE_TYPED_FIELD_NAMES:
+                continue
+            data[key] = value
+        data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        出力ファイルの1アイテム（前回の出力・youtube_tmp.json）から作成
+
+        Args:
+            data (dict): 出力ファイルの1アイテム
+        Returns:
+            VideoItem: 動画・投稿情報
+        """
+        values = {}
+        extra = {}
+        for key, value in data.items():
+            name = _NAMES_BY_KEY.get(key)
+            if name is None:
+                extra[key] = value
+            else:
+                values[name] = value
+        values.setdefault('title', '')
+        values.setdefault('video_url', '')
+        return cls(**values, extra=extra)
+
+
+# (属性名, 出力ファイルのキー) の出力順
+_OUTPUT_KEYS = tuple(
+    (f.name, {'video_id': 'videoId', 'add_additional_class': 'addAdditionalClass'}.get(f.name, f.name))
+    for f in fields(VideoItem) if f.name != 'extra'
+)
+_NAMES_BY_KEY = {key: name for name, key in _OUTPUT_KEYS}
+
+
+def validate_item(item):
+    """
+    動画・投稿情報を検証
+
+    Args:
+        item (VideoItem): 動画・投稿情報
+    Returns:
+        list: 問題点のリスト（問題がない場合は空）
+    """
+    problems = []
+    if not isinstance(item.title, str) or not item.title:
+        problems.append("title が空です")
+    if not isinstance(item.video_url, str) or not item.video_url.startswith(('http://', 'https://')):
+        problems.append(f"video_url が不正です: {item.video_url!r}")
+    if not isinstance(item.metadata, list) or not all(isinstance(meta, str) for meta in item.metadata):
+        problems.append("metadata が文字列のリストではありません")
+    for name in ('tags', 'timestamps', 'timestamp_entries', 'add_additional_class'):
+        value = getattr(item, name)
+        if value is not None and not isinstance(value, list):
+            problems.append(f"{name} がリストではありません")
+    for name in ('start_epoch', 'duration_seconds', 'view_count'):
+        value = getattr(item, name)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+            problems.append(f"{name} が0以上の整数ではありません: {value!r}")
+    if item.broadcast_day is not None and not (
+        isinstance(item.broadcast_day, str) and BROADCAST_DAY_PATTERN.fullmatch(item.broadcast_day)
+    ):
+        problems.append(f"broadcast_day が YYYY-MM-DD 形式ではありません: {item.broadcast_day!r}")
+    if (item.start_epoch is None) != (item.broadcast_day is None):
+        problems.append("start_epoch と broadcast_day の一方のみが設定されています")
+    return problems
+
+
+def serialize_items(items):
+    """
+    動画・投稿情報のリストを出力ファイルの形式に変換（検証して問題があれば警告を表示する）
+
+    Args:
+        items (list): VideoItem のリスト
+    Returns:
+        list: 出力ファイルの items
+    """
+    invalid_count = 0
+    serialized = []
+    for item in items:
+        problems = validate_item(item)
+        if problems:
+            invalid_count += 1
+            if invalid_count <= MAX_VALIDATION_WARNINGS:
+                print(f"⚠️ {item.title or item.video_url or '(不明)'}: {'、'.join(problems)}")
+        serialized.append(item.to_dict())
+    if invalid_count > MAX_VALIDATION_WARNINGS:
+        print(f"⚠️ 他 {invalid_count - MAX_VALIDATION_WARNINGS} 件のアイテムに問題があります")
+    return serialized
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+YouTube動画の再生回数の推移を保存する追記型のストア
+1回の分析(スキャン)を1行のNDJSONとしてセグメントファイルに追記し、
+定期的にコンパクションして動画ごとの列形式(タイムスタンプ・再生回数の配列)のベースファイルにまとめます。
+
+    STORE_DIR/
+        base.json              コンパクション済みの履歴（列形式・compact JSON）
+        segment-000001.ndjson  ベース以降のスキャン（1行 = 1スキャン）
+        manifest.json          最後のスキャン日時・書き込み中のセグメント・既知の動画ID
+
+    - 追記のコストは新しいスキャンの点数にのみ比例する（履歴全体を読み書きしない）
+    - 同じ動画・同じv_datetimeの記録は、読み込み時に最初のものだけを使用する
+    - export_analyzed() で docs/analytics/index.js が読み込む youtube_analyzed.json と同じ形式に変換する
+"""
+
+import bisect
+import json
+import os
+from pathlib import Path
+
+from json_writer import write_json_atomic
+
+# 設定
+# ストアの保存先ディレクトリ
+STORE_DIR = "../docs/youtube_history"
+# 1つのセグメントファイルの最大サイズ(バイト)、超えた場合は次のセグメントに追記する
+SEGMENT_MAX_BYTES = 1024 * 1024
+# セグメントファイルがこの数を超えたらコンパクションする
+COMPACT_SEGMENT_COUNT = 8
+
+BASE_FILE = "base.json"
+MANIFEST_FILE = "manifest.json"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".ndjson"
+STORE_VERSION = 1
+
+
+class ViewHistory:
+    """
+    メモリ上の再生回数の履歴
+    動画IDごとの記録と、記録済みのv_datetimeのsetを持ち、1件あたりO(1)で重複をチェックする
+    """
+
+    def __init__(self):
+        # {動画ID: {"title": str, "views": [(v_datetime, view_count), ...]}}（動画の順序は最初に記録した順）
+        self.videos = {}
+        # {動画ID: 記録済みのv_datetimeのset}
+        self.seen_datetimes = {}
+        # 総再生回数 [(v_datetime, view_count), ...]
+        self.total = []
+        self.total_seen_datetimes = set()
+        self.last_updated = None
+
+    @staticmethod
+    def _insert(points, seen, v_datetime, view_count):
+        """
+        記録を追加（同じv_datetimeが記録済みの場合は追加しない）
+        v_datetimeの昇順を保つため、最新より古い記録は挿入位置を探して追加する
+
+        Returns:
+            bool: 追加した場合True
+        """
+        if v_datetime in seen:
+            return False
+        seen.add(v_datetime)
+        if not points or points[-1][0] <= v_datetime:
+            points.append((v_datetime, view_count))
+        else:
+            index = bisect.bisect_right([point[0] for point in points], v_datetime)
+            points.insert(index, (v_datetime, view_count))
+        return True
+
+    def add_view(self, video_id, title, v_datetime, view_count):
+        """
+        動画の再生回数の記録を追加
+
+        Args:
+            video_id (str): 動画ID
+            title (str): 動画タイトル（最初に記録したタイトルを使用）
+            v_datetime (str): 情報取得日時(ISO 8601)
+            view_count (int): 再生回数
+        """
+        video = self.videos.get(video_id)
+        if video is None:
+            video = self.videos[video_id] = {'title': title, 'views': []}
+            self.seen_datetimes[video_id] = set()
+        self._insert(video['views'], self.seen_datetimes[video_id], v_datetime, view_count)
+
+    def add_total(self, v_datetime, view_count):
+        """
+        総再生回数の記録を追加
+        """
+        self._insert(self.total, self.total_seen_datetimes, v_datetime, view_count)
+
+    def update_last_updated(self, v_datetime):
+        if v_datetime and (self.last_updated is None or v_datetime > self.last_updated):
+            self.last_updated = v_datetime
+
+
+class ViewHistoryStore:
+    """
+    再生回数の推移の追記型ストア
+    """
+
+    def __init__(self, store_dir=STORE_DIR, segment_max_bytes=SEGMENT_MAX_BYTES,
+                 compact_segment_count=COMPACT_SEGMENT_COUNT):
+        """
+        Args:
+            store_dir (str): ストアの保存先ディレクトリ
+            segment_max_bytes (int): 1つのセグメントファイルの最大サイズ(バイト)
+            compact_segment_count (int): セグメントファイルがこの数を超えたらコンパクションする
+        """
+        self.store_dir = Path(store_dir)
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_segment_count = compact_segment_count
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        """
+        マニフェストを読み込む
+
+        Returns:
+            dict: {"last_scan": str, "segment": int, "known_ids": [str]}
+        """
+        try:
+            with open(self.store_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        manifest.setdefault('last_scan', None)
+        manifest.setdefault('segment', 1)
+        manifest.setdefault('known_ids', [])
+        return manifest
+
+    def _save_manifest(self):
+        write_json_atomic(self.store_dir / MANIFEST_FILE, self.manifest, compact=True)
+
+    def _segment_path(self, number):
+        return self.store_dir / f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+
+    def segment_paths(self):
+        """
+        セグメントファイルの一覧（番号順）
+
+        Returns:
+            list: Pathのリスト
+        """
+        if not self.store_dir.exists():
+            return []
+        return sorted(path for path in self.store_dir.iterdir()
+                      if path.name.startswith(SEGMENT_PREFIX) and path.name.endswith(SEGMENT_SUFFIX))
+
+    def is_empty(self):
+        """
+        ストアにデータがない場合True
+        """
+        return not (self.store_dir / BASE_FILE).exists() and not self.segment_paths()
+
+    def append_scan(self, v_datetime, views_data, total_view_count):
+        """
+        1回のスキャンの結果をセグメントファイルに1行追記
+
+        Args:
+            v_datetime (str): 情報取得日時(ISO 8601)
+            views_data (list): [{"id": str, "title": str, "views": int}, ...]（再生回数が0の動画は記録しない）
+            total_view_count (int): 総再生回数
+        Returns:
+            bool: 追記した場合True（直前と同じスキャンの場合はFalse）
+        """
+        if v_datetime == self.manifest['last_scan']:
+            return False
+        known_ids = set(self.manifest['known_ids'])
+        views = []
+        titles = {}
+        for view_data in views_data:
+            if view_data['views'] == 0:
+                continue
+            views.append([view_data['id'], view_data['views']])
+            # タイトルは初めて記録する動画のみ保存
+            if view_data['id'] not in known_ids and view_data['id'] not in titles:
+                titles[view_data['id']] = view_data['title']
+        record = {'t': v_datetime, 'views': views, 'titles': titles, 'total': total_view_count}
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        segment_path = self._segment_path(self.manifest['segment'])
+        if segment_path.exists() and segment_path.stat().st_size + len(line.encode('utf-8')) > self.segment_max_bytes:
+            self.manifest['segment'] += 1
+            segment_path = self._segment_path(self.manifest['segment'])
+        with open(segment_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.manifest['last_scan'] = v_datetime
+        self.manifest['known_ids'].extend(titles)
+        self._save_manifest()
+        return True
+
+    def _read_base(self, history):
+        """
+        ベースファイルを読み込んで履歴に追加
+        """
+        try:
+            with open(self.store_dir / BASE_FILE, 'r', encoding='utf-8') as f:
+                base = json.load(f)
+        except FileNotFoundError:
+            return
+        times = base['times']
+        for video in base['videos']:
+            for time_index, view_count in zip(video['t'], video['v']):
+                history.add_view(video['id'], video['title'], times[time_index], view_count)
+        for time_index, view_count in zip(base['total']['t'], base['total']['v']):
+            history.add_total(times[time_index], view_count)
+        history.update_last_updated(base.get('last_updated'))
+
+    def _read_segment(self, path, history):
+        """
+        セグメントファイルを読み込んで履歴に追加（書き込み途中で切れた最後の行は無視する）
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"⚠️ {path.name} の壊れた行をスキップしました")
+                    continue
+                v_datetime = record['t']
+                titles = record.get('titles', {})
+                for video_id, view_count in record['views']:
+                    # タイトルは初めて記録した動画の行にのみ保存されている
+                    history.add_view(video_id, titles.get(video_id, ''), v_datetime, view_count)
+                history.add_total(v_datetime, record['total'])
+                history.update_last_updated(v_datetime)
+
+    def load(self):
+        """
+        ベースファイルとすべてのセグメントファイルを読み込む
+
+        Returns:
+            ViewHistory: 再生回数の履歴
+        """
+        history = ViewHistory()
+        self._read_base(history)
+        for path in self.segment_paths():
+            self._read_segment(path, history)
+        return history
+
+    def _write_base(self, history):
+        """
+        履歴を列形式でベースファイルに書き込む
+        v_datetimeの文字列は times に1回だけ保存し、各動画はそのインデックスを持つ
+        """
+        times = sorted({v_datetime for video in history.videos.values() for v_datetime, _ in video['views']}
+                       | {v_datetime for v_datetime, _ in history.total})
+        time_index = {v_datetime: index for index, v_datetime in enumerate(times)}
+        base = {
+            'version': STORE_VERSION,
+            'times': times,
+            'videos': [
+                {
+                    'id': video_id,
+                    'title': video['title'],
+                    't': [time_index[v_datetime] for v_datetime, _ in video['views']],
+                    'v': [view_count for _, view_count in video['views']],
+                }
+                for video_id, video in history.videos.items()
+            ],
+            'total': {
+                't': [time_index[v_datetime] for v_datetime, _ in history.total],
+                'v': [view_count for _, view_count in history.total],
+            },
+            'last_updated': history.last_updated,
+        }
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.store_dir / BASE_FILE, base, compact=True)
+
+    def needs_compaction(self):
+        """
+        コンパクションが必要な場合True
+        """
+        return len(self.segment_paths()) > self.compact_segment_count
+
+    def compact(self, history=None):
+        """
+        ベースファイルとセグメントファイルを1つのベースファイルにまとめる
+        ベースファイルを置き換えてからセグメントファイルを削除するため、途中で中断しても記録は失われない
+
+        Args:
+            history (ViewHistory): 読み込み済みの履歴（省略時は読み込む）
+        Returns:
+            ViewHistory: 再生回数の履歴
+        """
+        segment_paths = self.segment_paths()
+        if history is None:
+            history = self.load()
+        self._write_base(history)
+        for path in segment_paths:
+            path.unlink()
+        self.manifest['segment'] = 1
+        self.manifest['known_ids'] = list(history.videos)
+        self._save_manifest()
+        return history
+
+    def import_analyzed(self, analyzed_data):
+        """
+        従来の youtube_analyzed.json の内容をストアに取り込む（移行用）
+
+        Args:
+            analyzed_data (dict): youtube_analyzed.json の内容
+        Returns:
+            ViewHistory: 取り込み後の履歴
+        """
+        history = self.load()
+        for video in analyzed_data.get('each_video', []):
+            for view in video.get('views', []):
+                history.add_view(video.get('id'), video.get('title', ''), view['v_datetime'], view['view_count'])
+        for view in analyzed_data.get('total_videos', []):
+            history.add_total(view['v_datetime'], view['view_count'])
+        history.update_last_updated(analyzed_data.get('last_updated'))
+        self.manifest['last_scan'] = history.last_updated
+        return self.compact(history)
+
+
+def export_analyzed(history):
+    """
+    履歴を youtube_analyzed.json の形式に変換
+
+    Args:
+        history (ViewHistory): 再生回数の履歴
+    Returns:
+        dict: {"each_video": [...], "total_videos": [...], "last_updated": str}
+    """
+    data = {
+        'each_video': [
+            {
+                'id': video_id,
+                'title': video['title'],
+                'views': [{'v_datetime': v_datetime, 'view_count': view_count}
+                          for v_datetime, view_count in video['views']],
+            }
+            for video_id, video in history.videos.items()
+        ],
+        'total_videos': [{'v_datetime': v_datetime, 'view_count': view_count}
+                         for v_datetime, view_count in history.total],
+    }
+    if history.last_updated:
+        data['last_updated'] = history.last_updated
+    return data
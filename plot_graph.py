@@ -1,53 +1,315 @@
+"""
+python plot_graph.py [--input docs/youtube_analyzed.json] [--growth-input docs/youtube_analyzed.json] [--output-dir .] [--workers 4] [--no-small-multiples]
+YouTube動画の再生回数の推移をグラフにする（必要なパッケージ: pip install -r requirements.txt）
+
+01. 分析結果(each_video / total_videos)を1回の走査で (動画 × 取得日時) の行列に変換
+02. 増加分・1時間あたりの増加数・増加率をNumPyでまとめて計算し、CSVに保存
+    （間引き版では集計期間の起点の記録が残っているとは限らないため、全履歴から計算）
+03. 総再生回数のグラフ、全動画をまとめたグラフ(LineCollectionで一括描画)と凡例を保存
+04. 動画ごとの小さなグラフ(small multiples)を、ページごとに複数プロセスで並行して保存
+各処理の実行時間を表示します。
+"""
+
+import argparse
 import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
-from datetime import datetime
-
-# JSONファイルを読み込む
-with open('docs/youtube_analyzed.json', 'r', encoding='utf-8') as file:
-    data = json.load(file)
-
-# 総再生回数のグラフを作成・保存
-total_videos = data['total_videos']
-dates = [datetime.fromisoformat(item['v_datetime']) for item in total_videos]
-view_counts = [item['view_count'] for item in total_videos]
-
-plt.figure(figsize=(12, 8))
-plt.plot(dates, view_counts, marker='o', linestyle='-', color='b', label='Total Views')
-plt.title('Total Video Views Over Time', fontsize=16)
-plt.xlabel('Date', fontsize=12)
-plt.ylabel('View Count', fontsize=12)
-plt.grid(True, linestyle='--', alpha=0.6)
-plt.legend()
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig('output_total_views.png')  # 総再生回数グラフを保存
-print("総再生回数グラフを 'output_total_views.png' に保存しました。")
-
-# 動画ごとの再生回数をまとめたグラフを作成
-fig, ax = plt.subplots(figsize=(12, 8))
-for video in data['each_video']:
-    if 'id' in video and 'views' in video and video['views']:
-        video_title = video['title']
-        video_views = [view['view_count'] for view in video['views']]
-        video_dates = [datetime.fromisoformat(view['v_datetime']) for view in video['views']]
-        ax.plot(video_dates, video_views, marker='o', linestyle='-', label=video_title[:30])  # タイトルを短縮
-
-ax.set_title('Individual Video Views Over Time', fontsize=16)
-ax.set_xlabel('Date', fontsize=12)
-ax.set_ylabel('View Count', fontsize=12)
-ax.grid(True, linestyle='--', alpha=0.6)
-ax.set_xticks(ax.get_xticks())
-plt.xticks(rotation=45)
-plt.tight_layout()
-
-# グラフ本体を保存
-fig.savefig('output_combined_views.png')
-print("全動画の再生回数をまとめたグラフを 'output_combined_views.png' に保存しました。")
-
-# 凡例を別ファイルに保存
-fig_legend = plt.figure(figsize=(8, 12))  # 縦長の画像サイズに調整
-handles, labels = ax.get_legend_handles_labels()  # 凡例情報を取得
-fig_legend.legend(handles, labels, loc='center', fontsize=8, ncol=1)  # 1列で縦方向に配置
-fig_legend.tight_layout()
-fig_legend.savefig('output_combined_views_legend.png')
-print("凡例を 'output_combined_views_legend.png' に保存しました。")
\ No newline at end of file
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+
+# 設定
+# グラフ用に読み込むファイル（間引き版があればそちらを使用）
+DATA_FILES = ['docs/youtube_analyzed_downsampled.json', 'docs/youtube_analyzed.json']
+# 増加分の計算に読み込むファイル（全履歴）
+GROWTH_DATA_FILE = 'docs/youtube_analyzed.json'
+# 動画ごとのグラフの1ページあたりの行数・列数
+SMALL_MULTIPLES_ROWS = 5
+SMALL_MULTIPLES_COLS = 4
+# 動画ごとのグラフの保存先ディレクトリ（--output-dir からの相対パス）
+SMALL_MULTIPLES_DIR = 'output_small_multiples'
+# 増加率の集計期間(時間)
+GROWTH_WINDOW_HOURS = 24
+
+
+@contextmanager
+def timer(label, timings):
+    """
+    処理の実行時間を計測して表示
+    """
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    timings[label] = elapsed
+    print(f"⏱ {label}: {elapsed:.2f}秒")
+
+
+def load_history(data):
+    """
+    分析結果を (動画 × 取得日時) の行列に変換
+
+    Args:
+        data (dict): youtube_analyzed.json の内容
+    Returns:
+        tuple: (再生回数のDataFrame(行: 動画ID, 列: 取得日時, 記録がない場合はNaN),
+                タイトルのSeries(index: 動画ID), 総再生回数のSeries(index: 取得日時))
+    """
+    videos = [video for video in data.get('each_video', []) if video.get('id') and video.get('views')]
+    ids = [video['id'] for video in videos]
+    lengths = np.fromiter((len(video['views']) for video in videos), dtype=np.int64, count=len(videos))
+    # 1回の走査で全動画の (取得日時, 再生回数) を平坦な配列にする
+    v_datetimes = [view['v_datetime'] for video in videos for view in video['views']]
+    view_counts = np.fromiter((view['view_count'] for video in videos for view in video['views']),
+                              dtype=np.float64, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(len(videos)), lengths)
+
+    # 取得日時の文字列は種類が少ないため、重複を除いてから日時に変換する
+    unique_datetimes, columns = np.unique(np.array(v_datetimes, dtype=str), return_inverse=True)
+    matrix = np.full((len(videos), len(unique_datetimes)), np.nan)
+    matrix[rows, columns] = view_counts
+    time_index = pd.to_datetime(unique_datetimes, format='ISO8601')
+    views = pd.DataFrame(matrix, index=pd.Index(ids, name='id'), columns=time_index).sort_index(axis=1)
+    titles = pd.Series([video.get('title', '') for video in videos], index=views.index, name='title')
+
+    total_videos = data.get('total_videos', [])
+    total = pd.Series([item['view_count'] for item in total_videos],
+                      index=pd.to_datetime([item['v_datetime'] for item in total_videos], format='ISO8601'),
+                      name='view_count', dtype=np.float64).sort_index()
+    return views, titles, total
+
+
+def compute_growth(views, window_hours=GROWTH_WINDOW_HOURS):
+    """
+    動画ごとの増加分・1時間あたりの増加数・増加率を計算
+
+    Args:
+        views (DataFrame): load_history() の再生回数の行列
+        window_hours (int): 増加率の集計期間(時間)
+    Returns:
+        DataFrame: 動画ごとの 最新の再生回数, 直近 window_hours 時間の増加分, 1時間あたりの増加数, 増加率(%)
+    """
+    values = views.to_numpy()
+    times = views.columns.to_numpy().astype('datetime64[s]').astype(np.float64) / 3600.0
+    observed = ~np.isnan(values)
+    # 記録がない取得日時は直前の値で埋める（記録前はNaNのまま）
+    filled = views.ffill(axis=1).to_numpy()
+    last = filled[:, -1] if filled.shape[1] else np.full(len(views), np.nan)
+
+    # 各動画の最後の記録時刻と、そこから window_hours 時間前の値
+    last_time = np.where(observed, times, -np.inf).max(axis=1, initial=-np.inf)
+    start_time = last_time - window_hours
+    before_window = observed & (times[np.newaxis, :] <= start_time[:, np.newaxis])
+    has_start = before_window.any(axis=1)
+    start_column = np.where(has_start, before_window.shape[1] - 1 - np.argmax(before_window[:, ::-1], axis=1), 0)
+    # 期間より前の記録がない動画は、最初の記録を起点にする
+    first_column = np.argmax(observed, axis=1)
+    start_column = np.where(has_start, start_column, first_column)
+    row_index = np.arange(len(values))
+    start_value = values[row_index, start_column]
+    elapsed_hours = last_time - times[start_column] if len(times) else np.zeros(len(values))
+
+    delta = last - start_value
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hourly = np.where(elapsed_hours > 0, delta / elapsed_hours, np.nan)
+        growth_rate = np.where(start_value > 0, delta / start_value * 100.0, np.nan)
+    return pd.DataFrame({
+        'last_view_count': last,
+        f'delta_{window_hours}h': delta,
+        'views_per_hour': hourly,
+        'growth_rate_percent': growth_rate,
+    }, index=views.index)
+
+
+def build_segments(views):
+    """
+    動画ごとの折れ線をLineCollection用の頂点配列に変換
+
+    Returns:
+        list: 動画ごとの (N, 2) 配列 [x(matplotlibの日付数値), 再生回数]
+    """
+    x = mdates.date2num(views.columns.to_pydatetime()) if len(views.columns) else np.array([])
+    values = views.to_numpy()
+    observed = ~np.isnan(values)
+    return [np.column_stack((x[mask], row[mask])) for row, mask in zip(values, observed)]
+
+
+def plot_total(total, output_path):
+    """
+    総再生回数のグラフを保存
+    """
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.plot(total.index, total.to_numpy(), marker='o', linestyle='-', color='b', label='Total Views')
+    ax.set_title('Total Video Views Over Time', fontsize=16)
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('View Count', fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.6)
+    ax.legend()
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
+
+
+def plot_combined(segments, titles, output_path, legend_path):
+    """
+    全動画の再生回数を1つのLineCollectionとして描画し、グラフと凡例を保存
+    """
+    colors = plt.get_cmap('tab20')(np.arange(len(segments)) % 20)
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=1.0))
+    points = [segment for segment in segments if len(segment)]
+    if points:
+        stacked = np.concatenate(points)
+        # マーカーもまとめて1回で描画
+        ax.scatter(stacked[:, 0], stacked[:, 1], s=6, c=np.repeat(colors, [len(s) for s in segments], axis=0))
+    ax.autoscale_view()
+    ax.xaxis_date()
+    ax.set_title('Individual Video Views Over Time', fontsize=16)
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('View Count', fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.6)
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
+
+    # 凡例を別ファイルに保存
+    handles = [Line2D([], [], color=color) for color in colors]
+    labels = [title[:30] for title in titles]  # タイトルを短縮
+    fig_legend = plt.figure(figsize=(8, 12))  # 縦長の画像サイズに調整
+    fig_legend.legend(handles, labels, loc='center', fontsize=8, ncol=1)  # 1列で縦方向に配置
+    fig_legend.savefig(legend_path)
+    plt.close(fig_legend)
+
+
+def plot_small_multiples_page(args):
+    """
+    動画ごとの小さなグラフを1ページ分保存（別プロセスで実行）
+
+    Args:
+        args (tuple): (ページ番号, [(タイトル, (N, 2)配列), ...], 保存先ディレクトリ)
+    Returns:
+        str: 保存したファイルのパス
+    """
+    page, videos, output_dir = args
+    fig, axes = plt.subplots(SMALL_MULTIPLES_ROWS, SMALL_MULTIPLES_COLS, figsize=(16, 14), squeeze=False)
+    for ax, (title, segment) in zip(axes.flat, videos):
+        ax.plot(segment[:, 0], segment[:, 1], linewidth=1.0)
+        # 目盛りの計算が描画時間の大半を占めるため、目盛りの数を抑えて簡潔な日付表記にする
+        locator = mdates.AutoDateLocator(maxticks=4)
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        ax.set_title(title[:30], fontsize=8)
+        ax.tick_params(labelsize=6)
+        ax.grid(True, linestyle='--', alpha=0.4)
+    for ax in list(axes.flat)[len(videos):]:
+        ax.set_visible(False)
+    # tight_layout は各軸の目盛りを何度も計算し直すため、余白は固定で指定する
+    fig.subplots_adjust(left=0.05, right=0.98, bottom=0.04, top=0.96, hspace=0.45, wspace=0.3)
+    output_path = os.path.join(output_dir, f'page_{page:03d}.png')
+    fig.savefig(output_path)
+    plt.close(fig)
+    return output_path
+
+
+def plot_small_multiples(segments, titles, output_dir, workers):
+    """
+    動画ごとの小さなグラフをページに分けて、複数プロセスで並行して保存
+
+    Returns:
+        list: 保存したファイルのパス
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    per_page = SMALL_MULTIPLES_ROWS * SMALL_MULTIPLES_COLS
+    videos = [(title, segment) for title, segment in zip(titles, segments) if len(segment)]
+    pages = [(page + 1, videos[start:start + per_page], output_dir)
+             for page, start in enumerate(range(0, len(videos), per_page))]
+    if workers <= 1 or len(pages) <= 1:
+        return [plot_small_multiples_page(page) for page in pages]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(plot_small_multiples_page, pages))
+
+
+def parse_args():
+    """
+    コマンドライン引数を解析
+
+    Returns:
+        argparse.Namespace: 解析結果
+    """
+    parser = argparse.ArgumentParser(description="YouTube動画の再生回数の推移をグラフにする")
+    parser.add_argument('--input', default=None,
+                        help=f"読み込むファイル（デフォルト: {' → '.join(DATA_FILES)} の順で存在するもの）")
+    parser.add_argument('--growth-input', default=GROWTH_DATA_FILE,
+                        help=f"増加分の計算に読み込む全履歴のファイル（デフォルト: {GROWTH_DATA_FILE}）")
+    parser.add_argument('--output-dir', default='.', help='グラフの保存先ディレクトリ（デフォルト: .）')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='動画ごとのグラフを保存するプロセス数（デフォルト: CPU数）')
+    parser.add_argument('--no-small-multiples', action='store_true', help='動画ごとのグラフを保存しない')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    timings = {}
+    data_file = args.input or next((path for path in DATA_FILES if os.path.exists(path)), DATA_FILES[-1])
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # JSONファイルを読み込む
+    with timer('読み込み', timings):
+        with open(data_file, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        views, titles, total = load_history(data)
+    print(f"📊 {data_file}: 動画 {views.shape[0]}件 × 取得日時 {views.shape[1]}件")
+
+    # 増加分は全履歴から計算する（グラフと同じファイルの場合は読み込み直さない）
+    with timer('増加分の計算', timings):
+        if os.path.abspath(args.growth_input) == os.path.abspath(data_file):
+            growth_views, growth_titles = views, titles
+        elif os.path.exists(args.growth_input):
+            with open(args.growth_input, 'r', encoding='utf-8') as file:
+                growth_views, growth_titles, _ = load_history(json.load(file))
+        else:
+            print(f"⚠️ {args.growth_input} が見つかりません。{data_file} から計算します（間引き版の場合は概算です）")
+            growth_views, growth_titles = views, titles
+        growth = compute_growth(growth_views)
+        growth.insert(0, 'title', growth_titles)
+        growth_path = os.path.join(args.output_dir, 'output_growth.csv')
+        growth.sort_values('views_per_hour', ascending=False).to_csv(growth_path, encoding='utf-8')
+    print(f"増加分を '{growth_path}' に保存しました。")
+
+    # 総再生回数のグラフを作成・保存
+    with timer('総再生回数のグラフ', timings):
+        total_path = os.path.join(args.output_dir, 'output_total_views.png')
+        plot_total(total, total_path)
+    print(f"総再生回数グラフを '{total_path}' に保存しました。")
+
+    # 動画ごとの再生回数をまとめたグラフを作成
+    with timer('全動画のグラフ', timings):
+        segments = build_segments(views)
+        combined_path = os.path.join(args.output_dir, 'output_combined_views.png')
+        legend_path = os.path.join(args.output_dir, 'output_combined_views_legend.png')
+        plot_combined(segments, titles.tolist(), combined_path, legend_path)
+    print(f"全動画の再生回数をまとめたグラフを '{combined_path}' に、凡例を '{legend_path}' に保存しました。")
+
+    if args.no_small_multiples:
+        print(f"⏱ 合計: {sum(timings.values()):.2f}秒")
+        return
+    with timer('動画ごとのグラフ', timings):
+        small_multiples_dir = os.path.join(args.output_dir, SMALL_MULTIPLES_DIR)
+        pages = plot_small_multiples(segments, titles.tolist(), small_multiples_dir, args.workers)
+    print(f"動画ごとのグラフを '{small_multiples_dir}' に {len(pages)}ページ保存しました（{args.workers}プロセス）。")
+
+    print(f"⏱ 合計: {sum(timings.values()):.2f}秒")
+
+
+if __name__ == "__main__":
+    main()
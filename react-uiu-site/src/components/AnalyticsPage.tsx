@@ -24,6 +24,23 @@ ChartJS.register(
   Legend
 );
 
+// 間引き版（各系列を最大200点程度に間引いたもの）を優先し、ない場合は全履歴を読み込む
+const DATA_URLS = ['/youtube_analyzed_downsampled.json', '/youtube_analyzed.json'];
+
+const fetchAnalyticsData = async (): Promise<AnalyticsData> => {
+  for (const url of DATA_URLS) {
+    try {
+      const response = await fetch(`${url}?v=${Date.now()}`);
+      if (response.ok) {
+        return await response.json();
+      }
+    } catch (error) {
+      console.warn(`Failed to load ${url}`, error);
+    }
+  }
+  throw new Error('No analytics data available');
+};
+
 const AnalyticsPage: React.FC = () => {
   const [globalData, setGlobalData] = useState<AnalyticsData | null>(null);
   const [startDate, setStartDate] = useState<string>('');
@@ -33,8 +50,7 @@ const AnalyticsPage: React.FC = () => {
   useEffect(() => {
     const loadDataAsync = async () => {
       try {
-        const response = await fetch(`/youtube_analyzed.json?v=${Date.now()}`);
-        const data: AnalyticsData = await response.json();
+        const data = await fetchAnalyticsData();
         setGlobalData(data);
         setInitialDateRange(data);
         renderChart(data);
@@ -48,8 +64,7 @@ const AnalyticsPage: React.FC = () => {
 
   const loadData = async () => {
     try {
-      const response = await fetch(`/youtube_analyzed.json?v=${Date.now()}`);
-      const data: AnalyticsData = await response.json();
+      const data = await fetchAnalyticsData();
       setGlobalData(data);
       setInitialDateRange(data);
       renderChart(data);
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import { VideoData, VideoItem, FilterState } from '../types';
+import { VideoData, VideoItem, FilterState, TimestampEntry } from '../types';
 import VideoModal from './VideoModal';
 import AgeVerificationModal from './AgeVerificationModal';
 import FilterControls from './FilterControls';
@@ -18,6 +18,7 @@ const HomePage: React.FC = () => {
     videoId: string;
     title: string;
     timestamps: string[];
+    timestampEntries?: TimestampEntry[];
   } | null>(null);
   const [ageVerified, setAgeVerified] = useState<boolean>(false);
   const [showAgeModal, setShowAgeModal] = useState<boolean>(false);
@@ -198,6 +199,7 @@ const HomePage: React.FC = () => {
           videoId={selectedVideo.videoId}
           title={selectedVideo.title}
           timestamps={selectedVideo.timestamps}
+          timestampEntries={selectedVideo.timestampEntries}
           onClose={() => setSelectedVideo(null)}
         />
       )}
@@ -1,10 +1,10 @@
 import React from 'react';
-import { VideoItem } from '../types';
+import { VideoItem, TimestampEntry } from '../types';
 
 interface ThumbnailGridProps {
   items: VideoItem[];
   tabType: string;
-  onVideoSelect: (video: { videoId: string; title: string; timestamps: string[] }) => void;
+  onVideoSelect: (video: { videoId: string; title: string; timestamps: string[]; timestampEntries?: TimestampEntry[] }) => void;
 }
 
 const ThumbnailGrid: React.FC<ThumbnailGridProps> = ({ items, tabType, onVideoSelect }) => {
@@ -61,7 +61,8 @@ const ThumbnailGrid: React.FC<ThumbnailGridProps> = ({ items, tabType, onVideoSe
       onVideoSelect({
         videoId: item.videoId,
         title: item.title,
-        timestamps: item.timestamps || []
+        timestamps: item.timestamps || [],
+        timestampEntries: item.timestamp_entries
       });
     }
   };
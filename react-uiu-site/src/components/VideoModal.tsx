@@ -1,13 +1,40 @@
 import React, { useEffect, useRef } from 'react';
+import { TimestampEntry } from '../types';
 
 interface VideoModalProps {
   videoId: string;
   title: string;
   timestamps: string[];
+  timestampEntries?: TimestampEntry[];
   onClose: () => void;
 }
 
-const VideoModal: React.FC<VideoModalProps> = ({ videoId, title, timestamps, onClose }) => {
+// タイムスタンプ文字列から秒数を求める（timestamp_entries がない古いデータ用）
+const parseTimestampEntry = (timestamp: string): TimestampEntry => {
+  const match = timestamp.match(/([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?)/);
+  const timeStr = match ? match[1] : timestamp.trim();
+  const timeParts = timeStr.split(':').map(part => parseInt(part, 10));
+  let seconds = 0;
+
+  if (timeParts.length === 3) {
+    // HH:MM:SS 形式
+    seconds = timeParts[0] * 3600 + timeParts[1] * 60 + timeParts[2];
+  } else if (timeParts.length === 2) {
+    // MM:SS 形式
+    seconds = timeParts[0] * 60 + timeParts[1];
+  } else if (timeParts.length === 1) {
+    // SS 形式
+    seconds = timeParts[0];
+  }
+
+  return { seconds, label: timestamp };
+};
+
+const VideoModal: React.FC<VideoModalProps> = ({ videoId, title, timestamps, timestampEntries, onClose }) => {
+  // 構造化済みのタイムスタンプ（{seconds, label}）があれば使用
+  const entries = timestampEntries && timestampEntries.length > 0
+    ? timestampEntries
+    : timestamps.map(parseTimestampEntry);
   const iframeRef = useRef<HTMLIFrameElement>(null);
 
   useEffect(() => {
@@ -33,26 +60,6 @@ const VideoModal: React.FC<VideoModalProps> = ({ videoId, title, timestamps, onC
     }
   };
 
-  const handleTimestampClick = (timestamp: string) => {
-    const match = timestamp.match(/([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?)/);
-    const timeStr = match ? match[1] : timestamp.trim();
-    const timeParts = timeStr.split(':').map(part => parseInt(part, 10));
-    let seconds = 0;
-    
-    if (timeParts.length === 3) {
-      // HH:MM:SS 形式
-      seconds = timeParts[0] * 3600 + timeParts[1] * 60 + timeParts[2];
-    } else if (timeParts.length === 2) {
-      // MM:SS 形式
-      seconds = timeParts[0] * 60 + timeParts[1];
-    } else if (timeParts.length === 1) {
-      // SS 形式
-      seconds = timeParts[0];
-    }
-
-    jumpToTime(seconds);
-  };
-
   const jumpToTime = (seconds: number) => {
     // postMessage APIを使用
     try {
@@ -98,13 +105,13 @@ const VideoModal: React.FC<VideoModalProps> = ({ videoId, title, timestamps, onC
         <div className="timestamp-section">
           <h4>タイムスタンプ</h4>
           <ul className="video-timestamps">
-            {timestamps.length > 0 ? (
-              timestamps.map((timestamp, index) => (
+            {entries.length > 0 ? (
+              entries.map((entry, index) => (
                 <li 
                   key={index}
-                  onClick={() => handleTimestampClick(timestamp)}
+                  onClick={() => jumpToTime(entry.seconds)}
                 >
-                  {timestamp}
+                  {entry.label}
                 </li>
               ))
             ) : (
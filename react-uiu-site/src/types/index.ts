@@ -1,3 +1,8 @@
+export interface TimestampEntry {
+  seconds: number;
+  label: string;
+}
+
 export interface VideoItem {
   title: string;
   image: string;
@@ -8,7 +13,12 @@ export interface VideoItem {
   video_url?: string;
   videoId?: string;
   timestamps?: string[];
+  timestamp_entries?: TimestampEntry[];
   addAdditionalClass?: string[];
+  start_epoch?: number | null;
+  broadcast_day?: string | null;
+  duration_seconds?: number | null;
+  view_count?: number;
 }
 
 export interface VideoData {